@@ -0,0 +1,75 @@
+"""Compares serial and process-pool workflow executors on a CPU-bound fan-out.
+
+Workflow: one input_url tool reading a wide numeric CSV, feeding BRANCHES
+describe_data tools. Plan is built in memory, so no database is needed.
+"""
+
+import argparse
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.utils import report, setup_django, timer
+
+setup_django()
+
+from panderyx.workflows.executors import (  # noqa: E402
+    ProcessPoolWorkflowExecutor,
+    SerialExecutor,
+)
+from panderyx.workflows.planner import ExecutionPlan  # noqa: E402
+from panderyx.workflows.services import WorkflowService  # noqa: E402
+from panderyx.workflows.tools.dtos.input_tools import InputUrlConfig  # noqa: E402
+from panderyx.workflows.tools.dtos.preview_tools import DescribeDataConfig  # noqa: E402
+from panderyx.workflows.tools.models import Tool  # noqa: E402
+
+
+def build_plan(path: Path, branches: int) -> ExecutionPlan:
+    tools = [Tool(id=0, config=asdict(InputUrlConfig(url=str(path))))]
+    tools += [
+        Tool(id=branch, config=asdict(DescribeDataConfig()))
+        for branch in range(1, branches + 1)
+    ]
+    edges = [(0, tool.id) for tool in tools[1:]]
+    return ExecutionPlan.from_edges(tools, edges)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--branches", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "data.csv"
+        rng = np.random.default_rng(0)
+        pd.DataFrame(
+            rng.random((args.rows, args.columns)),
+            columns=[f"column_{i}" for i in range(args.columns)],
+        ).to_csv(path, index=False)
+        plan = build_plan(path, args.branches)
+
+        results = {}
+        executors = {
+            "serial": SerialExecutor(),
+            "process": ProcessPoolWorkflowExecutor(max_workers=args.workers),
+        }
+        # forks the process pool, so its start-up is not part of the measurement
+        WorkflowService(None, executor=executors["process"]).execute_plan(
+            build_plan(path, 1)
+        )
+        for label, executor in executors.items():
+            with timer(label, results):
+                WorkflowService(None, executor=executor).execute_plan(plan)
+
+    print(f"{args.rows} rows x {args.columns} columns, {args.branches} branches")
+    report(results, baseline="serial")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Compares peak memory of a deep chain run with and without releasing intermediates.
+
+Workflow: a chain of DEPTH tools, each producing a numeric DataFrame of the
+given size, with only the last tool requested. Tools are replaced with a stub
+that allocates the result, so only the memory held by the service is measured.
+The result cache is disabled, since it would keep references to every result.
+"""
+
+import argparse
+import tracemalloc
+import typing
+from dataclasses import asdict
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from django.test import override_settings
+
+from benchmarks.utils import setup_django
+
+setup_django()
+
+from panderyx.workflows.executors import SerialExecutor  # noqa: E402
+from panderyx.workflows.planner import ExecutionPlan  # noqa: E402
+from panderyx.workflows.services import WorkflowService  # noqa: E402
+from panderyx.workflows.tools.dtos.preview_tools import (  # noqa: E402
+    DescribeDataConfig,
+)
+from panderyx.workflows.tools.models import Tool  # noqa: E402
+
+
+def build_plan(depth: int) -> ExecutionPlan:
+    tools = [
+        Tool(id=tool_id, config=asdict(DescribeDataConfig()))
+        for tool_id in range(depth)
+    ]
+    edges = [(tool_id, tool_id + 1) for tool_id in range(depth - 1)]
+    return ExecutionPlan.from_edges(tools, edges)
+
+
+def measure_peak(plan: ExecutionPlan, rows: int, release_results: bool) -> int:
+    def run_tool(tool: Tool, inputs: typing.Dict[int, pd.DataFrame]) -> pd.DataFrame:
+        return pd.DataFrame(np.ones((rows, 10)))
+
+    with override_settings(WORKFLOW_RESULT_CACHE=""):
+        service = WorkflowService(
+            None, executor=SerialExecutor(), release_results=release_results
+        )
+    service.target_ids = {plan.order[-1].id}
+
+    tracemalloc.start()
+    with mock.patch("panderyx.workflows.executors.run_tool", run_tool):
+        service.execute_plan(plan)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--depth", type=int, default=20)
+    args = parser.parse_args()
+
+    plan = build_plan(args.depth)
+    size = args.rows * 10 * 8 / 2**20
+    print(f"chain of {args.depth} tools, {size:.1f} MiB per result")
+    for release_results in (False, True):
+        peak = measure_peak(plan, args.rows, release_results)
+        label = "release" if release_results else "keep"
+        print(f"{label:<20} {peak / 2**20:>8.1f} MiB peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compares encoding of tool outputs into a response body.
+
+"to_json" is the default path: DataFrame.to_json() strings encoded again by
+DRF's JSONRenderer. Other paths convert DataFrames with dataframe_to_native
+and encode them once with ORJSONRenderer.
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.utils import report, setup_django, timer
+
+setup_django()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from panderyx.workflows.renderers import (  # noqa: E402
+    OUTPUT_ORIENTS,
+    ORJSONRenderer,
+    dataframe_to_native,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--columns", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        rng.random((args.rows, args.columns)),
+        columns=[f"column_{i}" for i in range(args.columns)],
+    )
+
+    results, sizes = {}, {}
+    with timer("to_json", results):
+        body = JSONRenderer().render([{"tool_id": 1, "data": df.to_json()}])
+    sizes["to_json"] = len(body)
+
+    for orient in OUTPUT_ORIENTS:
+        label = f"orjson ({orient})"
+        with timer(label, results):
+            body = ORJSONRenderer().render(
+                [{"tool_id": 1, "data": dataframe_to_native(df, orient)}]
+            )
+        sizes[label] = len(body)
+
+    print(f"{args.rows * args.columns} cells")
+    report(results, baseline="to_json")
+    for label, size in sizes.items():
+        print(f"{label:<20} {size / 2**20:>8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Compares parse throughput of input files with pandas and pyarrow engines.
+
+Every format is written once to a temporary directory and parsed from an
+open file, like files from the download cache. Throughput is reported in
+MiB of the file per second. Parquet, Feather and JSON lines files are parsed
+by the same readers in both engines.
+"""
+
+import argparse
+import importlib.util
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks.utils import report, setup_django, timer
+
+setup_django()
+
+from panderyx.workflows.tools.parsers import (  # noqa: E402
+    ArrowParseEngine,
+    PandasParseEngine,
+    ReadOptions,
+)
+
+FORMATS = {
+    "data.csv": ReadOptions(),
+    "data.csv.gz": ReadOptions(compression="gzip"),
+    "data.csv.zst": ReadOptions(compression="zstd"),
+    "data.parquet": ReadOptions(file_format="parquet"),
+    "data.feather": ReadOptions(file_format="feather"),
+    "data.jsonl": ReadOptions(file_format="jsonl"),
+}
+
+
+def write_files(df: pd.DataFrame, directory: str) -> None:
+    for filename in FORMATS:
+        path = os.path.join(directory, filename)
+        if filename.startswith("data.csv"):
+            with pa.output_stream(path, compression="detect") as stream:
+                stream.write(df.to_csv(index=False).encode())
+        elif filename == "data.parquet":
+            df.to_parquet(path, index=False)
+        elif filename == "data.feather":
+            df.to_feather(path)
+        else:
+            df.to_json(path, orient="records", lines=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "integers": rng.integers(0, 1_000_000, args.rows),
+            "floats": rng.random(args.rows),
+            "strings": rng.choice(["Poland", "Portugal", "United Kingdom"], args.rows),
+        }
+    )
+    engines = {"pandas": PandasParseEngine(), "pyarrow": ArrowParseEngine()}
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_files(df, directory)
+        for filename, options in FORMATS.items():
+            path = os.path.join(directory, filename)
+            size = os.path.getsize(path) / 2**20
+            print(f"{filename} ({size:.1f} MiB)")
+
+            results = {}
+            for label, engine in engines.items():
+                if (
+                    label == "pandas"
+                    and options.compression == "zstd"
+                    and importlib.util.find_spec("zstandard") is None
+                ):
+                    continue
+                with timer(label, results), open(path, "rb") as file:
+                    engine.read(file, options)
+            report(results, baseline=next(iter(results)))
+            for label, elapsed in results.items():
+                print(f"{label:<20} {size / elapsed:>8.1f} MiB/s")
+
+
+if __name__ == "__main__":
+    main()
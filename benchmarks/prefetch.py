@@ -0,0 +1,98 @@
+"""Compares reading input files one after another with and without prefetching.
+
+Files are served by a local HTTP server that delays every response by the
+given latency and responses with bodies additionally by the transfer time,
+like a remote server would. Without prefetching files are downloaded in the
+order in which input tools read them. With prefetching all downloads are
+started at once and every read waits only for its own file, which is read
+from the download cache without another request.
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+import typing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.utils import report, setup_django, timer
+
+setup_django()
+
+from panderyx.workflows.caching import DownloadCache, Prefetcher  # noqa: E402
+
+BODY = b"a,b\n" + b"1,2\n" * 1000
+
+
+class DelayedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.0"
+
+    def do_GET(self) -> None:
+        time.sleep(self.server.latency)
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        time.sleep(self.server.transfer)
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args: typing.Any) -> None:
+        pass
+
+
+def read_sequentially(urls: typing.List[str]) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        cache = DownloadCache(directory, max_bytes=2**30)
+        for url in urls:
+            with cache.open(url) as file:
+                file.read()
+
+
+def read_prefetched(urls: typing.List[str], workers: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        cache = DownloadCache(directory, max_bytes=2**30)
+        prefetcher = Prefetcher(cache, max_workers=workers)
+        prefetcher.prefetch(urls)
+        for url in urls:
+            prefetcher.wait([url])
+            with cache.open(url, revalidate=False) as file:
+                file.read()
+        prefetcher.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--inputs", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--transfer", type=float, default=0.5)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DelayedHandler)
+    server.latency, server.transfer = args.latency, args.transfer
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [
+        f"http://127.0.0.1:{server.server_port}/{i}.csv" for i in range(args.inputs)
+    ]
+
+    results: typing.Dict[str, float] = {}
+    with timer("sequential", results):
+        read_sequentially(urls)
+    with timer("prefetch", results):
+        read_prefetched(urls, args.workers)
+    server.shutdown()
+
+    print(
+        f"{args.inputs} inputs, {args.latency}s latency, "
+        f"{args.transfer}s transfer per file"
+    )
+    report(results, baseline="sequential")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Helpers shared by benchmark scripts.
+
+Benchmarks are run from the repository root, e.g.::
+
+    python -m benchmarks.executors
+"""
+
+import os
+import time
+import typing
+from contextlib import contextmanager
+
+
+def setup_django() -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "panderyx.config")
+    os.environ.setdefault("DJANGO_CONFIGURATION", "Local")
+
+    import configurations
+
+    configurations.setup()
+
+
+@contextmanager
+def timer(label: str, results: typing.Dict[str, float]) -> typing.Iterator[None]:
+    start = time.perf_counter()
+    yield
+    results[label] = time.perf_counter() - start
+
+
+def report(results: typing.Dict[str, float], baseline: str) -> None:
+    for label, elapsed in results.items():
+        speedup = results[baseline] / elapsed
+        print(f"{label:<20} {elapsed:>8.3f}s  x{speedup:.2f}")
@@ -1,6 +1,7 @@
 import os
 from distutils.util import strtobool
 from os.path import join
+from tempfile import gettempdir
 
 import dj_database_url
 from configurations import Configuration
@@ -176,6 +177,112 @@ class Common(Configuration):
     # Custom user app
     AUTH_USER_MODEL = "users.User"
 
+    # Workflows
+    # Backend used to run workflow tools: "serial", "thread", "process" or "chunked".
+    # "process" forks a pool of workers once per web worker process and passes
+    # numeric columns through shared memory, object (string) columns are still
+    # pickled in full. It requires "fork" start method and is meant to be used
+    # with single-threaded (sync) gunicorn workers.
+    WORKFLOW_EXECUTOR = os.getenv("WORKFLOW_EXECUTOR", "serial")
+    WORKFLOW_MAX_WORKERS = int(os.getenv("WORKFLOW_MAX_WORKERS", 4))
+    # "chunked" executor passes results of chunk-capable tools (e.g. input_url,
+    # select_columns, head) to their single consumer in chunks of
+    # WORKFLOW_CHUNK_ROWS rows, so inputs larger than memory can be reduced.
+    # Runs without target tools return results of sink tools only.
+    WORKFLOW_CHUNK_ROWS = int(os.getenv("WORKFLOW_CHUNK_ROWS", 100_000))
+    # Tool results are reused between runs as long as their fingerprint (tool's config,
+    # version of its local input file and fingerprints of its inputs) does not change
+    # and for at most WORKFLOW_RESULT_CACHE_TIMEOUT seconds, so results of remote
+    # files, whose changes are not tracked, are refreshed once they expire.
+    # Backends: "lru" (per-process, limited by WORKFLOW_RESULT_CACHE_MAX_BYTES),
+    # "django" (cache from CACHES setting) or an empty string to disable caching.
+    WORKFLOW_RESULT_CACHE = os.getenv("WORKFLOW_RESULT_CACHE", "lru")
+    WORKFLOW_RESULT_CACHE_MAX_BYTES = int(
+        os.getenv("WORKFLOW_RESULT_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+    )
+    WORKFLOW_RESULT_CACHE_ALIAS = "default"
+    WORKFLOW_RESULT_CACHE_TIMEOUT = int(os.getenv("WORKFLOW_RESULT_CACHE_TIMEOUT", 300))
+    # Results of a run that are not returned are released as soon as the last tool
+    # consuming them has finished (results held by the result cache stay in memory)
+    WORKFLOW_RELEASE_RESULTS = strtobool(os.getenv("WORKFLOW_RELEASE_RESULTS", "yes"))
+    # Results of a run are kept in "memory" or spilled to Arrow IPC files on "disk"
+    # when they use at least WORKFLOW_RESULT_SPILL_BYTES of memory
+    WORKFLOW_RESULT_STORE = os.getenv("WORKFLOW_RESULT_STORE", "memory")
+    WORKFLOW_RESULT_STORE_DIR = os.getenv(
+        "WORKFLOW_RESULT_STORE_DIR", join(MEDIA_ROOT, "workflow_results")
+    )
+    WORKFLOW_RESULT_SPILL_BYTES = int(
+        os.getenv("WORKFLOW_RESULT_SPILL_BYTES", 64 * 1024 * 1024)
+    )
+    # Engine parsing CSV files of input tools: "pyarrow" (multithreaded) or "pandas"
+    WORKFLOW_PARSE_ENGINE = os.getenv("WORKFLOW_PARSE_ENGINE", "pyarrow")
+    # Files of input tools downloaded over HTTP(S) are kept on disk and revalidated
+    # with ETag/Last-Modified headers, so unchanged files are not downloaded again.
+    # Least recently used files are evicted above WORKFLOW_DOWNLOAD_CACHE_MAX_BYTES,
+    # 0 disables the cache.
+    WORKFLOW_DOWNLOAD_CACHE_DIR = os.getenv(
+        "WORKFLOW_DOWNLOAD_CACHE_DIR", join(MEDIA_ROOT, "workflow_downloads")
+    )
+    WORKFLOW_DOWNLOAD_CACHE_MAX_BYTES = int(
+        os.getenv("WORKFLOW_DOWNLOAD_CACHE_MAX_BYTES", 1024 * 1024 * 1024)
+    )
+    # Files of all input tools of a run are downloaded into the download cache
+    # concurrently by up to WORKFLOW_PREFETCH_WORKERS threads as soon as the run
+    # starts, tools wait only for their own files. 0 disables prefetching.
+    WORKFLOW_PREFETCH_WORKERS = int(os.getenv("WORKFLOW_PREFETCH_WORKERS", 8))
+    # Downloads of input tools are aborted above WORKFLOW_FETCH_MAX_BYTES bytes
+    # or WORKFLOW_FETCH_TIMEOUT seconds. Downloads of all tools of a user are
+    # limited to WORKFLOW_USER_FETCH_MAX_BYTES bytes and
+    # WORKFLOW_USER_FETCH_MAX_SECONDS seconds per WORKFLOW_USER_FETCH_WINDOW
+    # seconds, counted in WORKFLOW_USER_FETCH_CACHE_ALIAS cache. 0 disables a limit.
+    # The cache has to be shared by web and worker processes (e.g. processes of
+    # "process" executor), by default it is a file cache in WORKFLOW_USER_FETCH_DIR
+    # shared by processes of the host.
+    WORKFLOW_FETCH_MAX_BYTES = int(
+        os.getenv("WORKFLOW_FETCH_MAX_BYTES", 1024 * 1024 * 1024)
+    )
+    WORKFLOW_FETCH_TIMEOUT = float(os.getenv("WORKFLOW_FETCH_TIMEOUT", 300))
+    WORKFLOW_USER_FETCH_MAX_BYTES = int(
+        os.getenv("WORKFLOW_USER_FETCH_MAX_BYTES", 10 * 1024 * 1024 * 1024)
+    )
+    WORKFLOW_USER_FETCH_MAX_SECONDS = float(
+        os.getenv("WORKFLOW_USER_FETCH_MAX_SECONDS", 3600)
+    )
+    WORKFLOW_USER_FETCH_WINDOW = int(os.getenv("WORKFLOW_USER_FETCH_WINDOW", 3600))
+    WORKFLOW_USER_FETCH_CACHE_ALIAS = "workflow_fetch"
+    WORKFLOW_USER_FETCH_DIR = os.getenv(
+        "WORKFLOW_USER_FETCH_DIR", join(gettempdir(), "panderyx_fetch_usage")
+    )
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "workflow_fetch": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": WORKFLOW_USER_FETCH_DIR,
+        },
+    }
+    # Files of input_file tools are uploaded in chunks of at most
+    # WORKFLOW_UPLOAD_CHUNK_MAX_BYTES bytes appended to partial files in
+    # WORKFLOW_UPLOAD_DIR, which has to be shared by web workers. Completed files
+    # of at most WORKFLOW_UPLOAD_MAX_BYTES bytes are moved to the default storage.
+    WORKFLOW_UPLOAD_DIR = os.getenv(
+        "WORKFLOW_UPLOAD_DIR", join(MEDIA_ROOT, "workflow_uploads")
+    )
+    WORKFLOW_UPLOAD_MAX_BYTES = int(
+        os.getenv("WORKFLOW_UPLOAD_MAX_BYTES", 10 * 1024 * 1024 * 1024)
+    )
+    WORKFLOW_UPLOAD_CHUNK_MAX_BYTES = int(
+        os.getenv("WORKFLOW_UPLOAD_CHUNK_MAX_BYTES", 64 * 1024 * 1024)
+    )
+    # Seconds between checks of an empty queue by run_workflow_worker command
+    WORKFLOW_WORKER_POLL_INTERVAL = float(os.getenv("WORKFLOW_WORKER_POLL_INTERVAL", 1))
+    # Workers mark their runs as alive every WORKFLOW_WORKER_HEARTBEAT_INTERVAL
+    # seconds. Runs without a heartbeat for WORKFLOW_RUN_STALE_TIMEOUT seconds
+    # (e.g. of killed workers) are failed by the next worker polling the queue.
+    WORKFLOW_WORKER_HEARTBEAT_INTERVAL = float(
+        os.getenv("WORKFLOW_WORKER_HEARTBEAT_INTERVAL", 30)
+    )
+    WORKFLOW_RUN_STALE_TIMEOUT = float(os.getenv("WORKFLOW_RUN_STALE_TIMEOUT", 300))
+
     # Django Rest Framework
     REST_FRAMEWORK = {
         "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
@@ -1,8 +1,46 @@
+from django.core.cache import cache
 from rest_framework.test import APIClient
 import pytest
 from pyfakefs.fake_filesystem_unittest import Patcher
 
 from panderyx.test_helpers.data_sets import test_dataset
+from panderyx.workflows.caching import get_lru_result_cache
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # tool results are cached between workflow runs
+    cache.clear()
+    get_lru_result_cache().clear()
+    yield
+    cache.clear()
+    get_lru_result_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def download_cache_dir(settings, tmp_path):
+    # downloaded input files are cached on disk
+    settings.WORKFLOW_DOWNLOAD_CACHE_DIR = str(tmp_path / "downloads")
+
+
+@pytest.fixture(autouse=True)
+def fetch_usage_dir(settings, tmp_path):
+    # download usage of users is counted in a file cache
+    settings.CACHES = {
+        **settings.CACHES,
+        "workflow_fetch": {
+            **settings.CACHES["workflow_fetch"],
+            "LOCATION": str(tmp_path / "fetch_usage"),
+        },
+    }
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    # uploaded files are stored in the default storage
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.WORKFLOW_UPLOAD_DIR = str(tmp_path / "uploads")
+    return tmp_path / "media"
+
 
 @pytest.fixture
 def apiclient():
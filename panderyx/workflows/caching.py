@@ -0,0 +1,375 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import typing
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from urllib.error import HTTPError
+
+import pandas as pd
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+
+from panderyx.workflows.fetching import FETCH_BUFFER_BYTES, FetchBudget, fetch
+
+
+class ResultCache(ABC):
+    """Cache of tool result DataFrames indexed by their fingerprints."""
+
+    @abstractmethod
+    def get(self, fingerprint: str) -> typing.Optional[pd.DataFrame]:
+        """Returns cached DataFrame or None if there is no result for the fingerprint."""
+
+    @abstractmethod
+    def set(self, fingerprint: str, df: pd.DataFrame) -> None:
+        """Stores DataFrame under the fingerprint."""
+
+
+class DjangoResultCache(ResultCache):
+    """Result cache backed by one of the caches configured in CACHES setting."""
+
+    key_prefix = "workflow-result"
+
+    def __init__(self, alias: str, timeout: typing.Optional[int]) -> None:
+        self.cache = caches[alias]
+        self.timeout = timeout
+
+    def get(self, fingerprint: str) -> typing.Optional[pd.DataFrame]:
+        return self.cache.get(f"{self.key_prefix}:{fingerprint}")
+
+    def set(self, fingerprint: str, df: pd.DataFrame) -> None:
+        self.cache.set(f"{self.key_prefix}:{fingerprint}", df, timeout=self.timeout)
+
+
+class LRUResultCache(ResultCache):
+    """Per-process cache that evicts least recently used results above a memory budget.
+
+    Size of every result is measured with DataFrame.memory_usage(deep=True).
+    Results expire timeout seconds after being stored (never if it is None),
+    like results of DjangoResultCache.
+    Cached DataFrames are shared between runs, so tools must not modify their inputs.
+    """
+
+    def __init__(self, max_bytes: int, timeout: typing.Optional[float] = None) -> None:
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # entries are (DataFrame, size, expiration time on the monotonic clock)
+        self._entries: typing.OrderedDict[
+            str, typing.Tuple[pd.DataFrame, int, typing.Optional[float]]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: str) -> typing.Optional[pd.DataFrame]:
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if (
+                entry is not None
+                and entry[2] is not None
+                and entry[2] <= time.monotonic()
+            ):
+                del self._entries[fingerprint]
+                self.size -= entry[1]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(fingerprint)
+            return entry[0]
+
+    def set(self, fingerprint: str, df: pd.DataFrame) -> None:
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous_entry = self._entries.pop(fingerprint, None)
+            if previous_entry is not None:
+                self.size -= previous_entry[1]
+
+            while self._entries and self.size + size > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+            expires = None if self.timeout is None else time.monotonic() + self.timeout
+            self._entries[fingerprint] = (df, size, expires)
+            self.size += size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    @property
+    def stats(self) -> typing.Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+_lru_result_cache: typing.Optional[LRUResultCache] = None
+_lru_result_cache_lock = threading.Lock()
+
+
+def get_lru_result_cache() -> LRUResultCache:
+    """Returns result cache shared by all of the runs in current process."""
+    global _lru_result_cache
+
+    with _lru_result_cache_lock:
+        if _lru_result_cache is None:
+            _lru_result_cache = LRUResultCache(
+                max_bytes=settings.WORKFLOW_RESULT_CACHE_MAX_BYTES,
+                timeout=settings.WORKFLOW_RESULT_CACHE_TIMEOUT,
+            )
+
+    return _lru_result_cache
+
+
+def get_result_cache() -> typing.Optional[ResultCache]:
+    """Returns result cache selected with WORKFLOW_RESULT_CACHE setting."""
+    backend = settings.WORKFLOW_RESULT_CACHE
+
+    if not backend:
+        return None
+    if backend == "lru":
+        return get_lru_result_cache()
+    if backend == "django":
+        return DjangoResultCache(
+            alias=settings.WORKFLOW_RESULT_CACHE_ALIAS,
+            timeout=settings.WORKFLOW_RESULT_CACHE_TIMEOUT,
+        )
+
+    raise ImproperlyConfigured(f"Unknown workflow result cache backend: {backend}.")
+
+
+class DownloadCache:
+    """Disk cache of files downloaded from HTTP(S) URLs with conditional revalidation.
+
+    Every file is revalidated with the ETag and Last-Modified headers of its
+    previous response, so an unchanged file costs a single 304 response instead
+    of a download. Files downloaded earlier in the same run (e.g. prefetched) can
+    be opened without revalidation. Least recently used files are evicted above
+    a size budget.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def __contains__(self, url: str) -> bool:
+        body_path, metadata_path = self._get_paths(url)
+        return os.path.exists(body_path) and os.path.exists(metadata_path)
+
+    @contextmanager
+    def open(
+        self,
+        url: str,
+        budget: typing.Optional[FetchBudget] = None,
+        revalidate: bool = True,
+    ) -> typing.Iterator[typing.BinaryIO]:
+        """Yields a file with the current body of the URL's response.
+
+        Args:
+            url (str): URL of the file
+            budget (Optional[FetchBudget]): limits of the download, no limits
+                when not provided
+            revalidate (bool): whether a cached file is revalidated, files that
+                are not cached are always downloaded
+
+        Raises:
+            HTTPError: catches case in which the file could not be downloaded
+            FetchBudgetExceeded: catches case in which the download exceeds
+                the budget
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        body_path, metadata_path = self._get_paths(url)
+
+        if revalidate or url not in self:
+            self._download(url, budget, body_path, metadata_path)
+
+        with _download_cache_lock:
+            # opened files stay readable after being evicted by other runs
+            file = open(body_path, "rb")
+            self._evict()
+
+        with file:
+            yield file
+
+    def _download(
+        self,
+        url: str,
+        budget: typing.Optional[FetchBudget],
+        body_path: str,
+        metadata_path: str,
+    ) -> None:
+        headers = {}
+        if url in self:
+            with open(metadata_path) as metadata_file:
+                metadata = json.load(metadata_file)
+            if metadata.get("etag"):
+                headers["If-None-Match"] = metadata["etag"]
+            if metadata.get("last_modified"):
+                headers["If-Modified-Since"] = metadata["last_modified"]
+
+        try:
+            with fetch(url, budget or FetchBudget(), headers=headers) as response:
+                self._store(response, url, body_path, metadata_path)
+        except HTTPError as exc:
+            if not headers or exc.code != 304:
+                raise
+            # unchanged files are marked as recently used
+            os.utime(body_path)
+
+    def _store(
+        self,
+        response: typing.Any,
+        url: str,
+        body_path: str,
+        metadata_path: str,
+    ) -> None:
+        # files are moved into place once complete, so concurrent runs never
+        # read partially downloaded files
+        with tempfile.NamedTemporaryFile(dir=self.directory, delete=False) as file:
+            try:
+                shutil.copyfileobj(response, file, FETCH_BUFFER_BYTES)
+            except BaseException:
+                file.close()
+                os.remove(file.name)
+                raise
+        os.replace(file.name, body_path)
+
+        metadata = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        with tempfile.NamedTemporaryFile("w", dir=self.directory, delete=False) as file:
+            json.dump(metadata, file)
+        os.replace(file.name, metadata_path)
+
+    def _evict(self) -> None:
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".body"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name[: -len(".body")]))
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, key in sorted(entries):
+            if size <= self.max_bytes:
+                break
+            for extension in (".body", ".json"):
+                try:
+                    os.remove(os.path.join(self.directory, key + extension))
+                except FileNotFoundError:
+                    pass
+            size -= entry_size
+
+    def _get_paths(self, url: str) -> typing.Tuple[str, str]:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        path = os.path.join(self.directory, key)
+        return f"{path}.body", f"{path}.json"
+
+
+_download_cache_lock = threading.Lock()
+
+
+def get_download_cache() -> typing.Optional[DownloadCache]:
+    """Returns download cache of input files or None if it is disabled."""
+    if not settings.WORKFLOW_DOWNLOAD_CACHE_MAX_BYTES:
+        return None
+
+    return DownloadCache(
+        directory=settings.WORKFLOW_DOWNLOAD_CACHE_DIR,
+        max_bytes=settings.WORKFLOW_DOWNLOAD_CACHE_MAX_BYTES,
+    )
+
+
+class Prefetcher:
+    """Downloads files into the download cache on a thread pool ahead of their use.
+
+    Downloads of all files are started at once, so their network time overlaps
+    instead of adding up. Every download opens its own connection. Failed
+    downloads are ignored, errors are raised by the tools that read the files.
+    """
+
+    def __init__(
+        self,
+        download_cache: DownloadCache,
+        max_workers: int,
+        budget: typing.Optional[FetchBudget] = None,
+    ) -> None:
+        self.download_cache = download_cache
+        self.budget = budget
+        self.pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="prefetch"
+        )
+        self.futures: typing.Dict[str, Future] = {}
+
+    def prefetch(self, urls: typing.Iterable[str]) -> None:
+        for url in urls:
+            if url not in self.futures:
+                self.futures[url] = self.pool.submit(self._download, url)
+
+    def wait(self, urls: typing.Iterable[str]) -> None:
+        """Blocks until downloads of provided URLs are finished."""
+        wait([self.futures[url] for url in urls if url in self.futures])
+
+    def get_downloaded(self, urls: typing.Iterable[str]) -> typing.List[str]:
+        """Returns provided URLs whose files were downloaded without errors."""
+        return [
+            url
+            for url in urls
+            if url in self.futures
+            and self.futures[url].done()
+            and not self.futures[url].cancelled()
+            and self.futures[url].exception() is None
+        ]
+
+    def close(self) -> None:
+        """Cancels pending downloads without waiting for running ones."""
+        for future in self.futures.values():
+            future.cancel()
+        self.pool.shutdown(wait=False)
+
+    def _download(self, url: str) -> None:
+        with self.download_cache.open(url, self.budget):
+            pass
+
+
+def get_prefetcher(
+    user_id: typing.Optional[int] = None,
+) -> typing.Optional[Prefetcher]:
+    """Returns prefetcher of input files of the user's workflow or None
+    if prefetching is disabled."""
+    download_cache = get_download_cache()
+    if download_cache is None or not settings.WORKFLOW_PREFETCH_WORKERS:
+        return None
+
+    return Prefetcher(
+        download_cache,
+        max_workers=settings.WORKFLOW_PREFETCH_WORKERS,
+        budget=FetchBudget.from_settings(user_id),
+    )
@@ -36,6 +36,10 @@ class ToolServiceException(APIException):
         self.code = code or self.code
         super().__init__(self._error_message, code)
 
+    def __reduce__(self):
+        # keeps exception picklable, so it can be raised from worker processes
+        return (self.__class__, (self.tool_id, None, self.code, self.message))
+
     @property
     def _error_message(self):
         return {
@@ -49,3 +53,19 @@ class ToolServiceException(APIException):
 class MissingToolInput(ToolServiceException):
     message = "Tool is missing input to process."
     code = "missing_input"
+
+
+class UploadConflict(APIException):
+    """Raised when a chunk does not continue an upload, e.g. after a chunk sent
+    before it was lost. Offset to resume the upload from is returned with the error."""
+
+    status_code: int = status.HTTP_409_CONFLICT
+    message: str = "Chunk does not start at the offset of the upload."
+    code: str = "upload_conflict"
+
+    def __init__(self, offset, message=None):
+        self.offset = offset
+        self.message = message or self.message
+        super().__init__({"message": self.message}, self.code)
+        # offset is returned as a number instead of being wrapped into ErrorDetail
+        self.detail["offset"] = offset
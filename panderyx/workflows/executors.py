@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import typing
+from abc import ABC, abstractmethod
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import pandas as pd
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from panderyx.workflows.fetching import check_shared_fetch_cache
+from panderyx.workflows.planner import ExecutionPlan
+from panderyx.workflows.shared_frames import (
+    SharedDataFrame,
+    attach_dataframe,
+    discard_dataframe,
+    load_dataframe,
+    release_segments,
+    share_dataframe,
+)
+from panderyx.workflows.tools.mappings import ToolMapping
+from panderyx.workflows.tools.models import Tool
+from panderyx.workflows.tools.services.tool import ToolService, concat_chunks
+
+if typing.TYPE_CHECKING:
+    from panderyx.workflows.services import WorkflowService
+
+
+def get_tool_service(tool: Tool, **hints: typing.Any) -> ToolService:
+    """Returns the service mapped to the tool's type.
+
+    Hints (e.g. columns used by downstream tools) are passed to the service.
+    """
+    tool_service_class = ToolMapping[tool.config["type"]].value["service"]
+    return tool_service_class(tool=tool, **hints)
+
+
+def run_tool(
+    tool: Tool, inputs: typing.Dict[int, pd.DataFrame], **hints: typing.Any
+) -> pd.DataFrame:
+    """Runs the service mapped to the tool's type on provided input DataFrames."""
+    return get_tool_service(tool, **hints).run_tool(inputs=inputs)
+
+
+class WorkflowExecutor(ABC):
+    @abstractmethod
+    def execute(
+        self, plan: ExecutionPlan, service: WorkflowService
+    ) -> typing.Iterator[Tool]:
+        """Runs tools from the plan and yields each Tool once its result is stored."""
+
+
+class SerialExecutor(WorkflowExecutor):
+    """Runs tools one at a time in the plan's execution order."""
+
+    def execute(
+        self, plan: ExecutionPlan, service: WorkflowService
+    ) -> typing.Iterator[Tool]:
+        for tool in plan.order:
+            service.wait_for_prefetch(tool)
+            inputs = service.get_tool_inputs(tool)
+            hints = service.get_tool_hints(tool)
+            service.set_tool_result(tool, run_tool(tool, inputs, **hints))
+            yield tool
+
+
+class PoolExecutor(WorkflowExecutor):
+    """Base class for executors that run tools with completed inputs on a pool.
+
+    Tools are scheduled from a ready queue, so independent branches of the DAG
+    run concurrently and wall-clock time is bound by the workflow's critical path.
+    """
+
+    def __init__(self, max_workers: typing.Optional[int] = None) -> None:
+        self.max_workers = max_workers
+
+    @abstractmethod
+    def create_pool(self) -> Executor:
+        """Returns a pool on which tools are run."""
+
+    @contextmanager
+    def open_pool(self) -> typing.Iterator[Executor]:
+        with self.create_pool() as pool:
+            yield pool
+
+    def submit(self, pool: Executor, tool: Tool, service: WorkflowService) -> Future:
+        return pool.submit(
+            run_tool,
+            tool,
+            service.get_tool_inputs(tool),
+            **service.get_tool_hints(tool),
+        )
+
+    def get_result(self, future: Future) -> pd.DataFrame:
+        return future.result()
+
+    def discard_result(self, future: Future) -> None:
+        """Releases resources held by a finished or cancelled future whose result
+        is not going to be loaded."""
+
+    def execute(
+        self, plan: ExecutionPlan, service: WorkflowService
+    ) -> typing.Iterator[Tool]:
+        pending_inputs = {
+            tool_id: len(input_ids) for tool_id, input_ids in plan.inputs.items()
+        }
+        ready_tools = [tool for tool in plan.order if pending_inputs[tool.id] == 0]
+        futures = {}
+
+        with self.open_pool() as pool:
+            try:
+                while ready_tools or futures:
+                    for ready_tool in ready_tools:
+                        service.wait_for_prefetch(ready_tool)
+                        futures[self.submit(pool, ready_tool, service)] = ready_tool
+                    ready_tools = []
+
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        tool = futures.pop(future)
+                        service.set_tool_result(tool, self.get_result(future))
+                        yield tool
+                        ready_tools.extend(
+                            self._get_ready_outputs(plan, tool, pending_inputs)
+                        )
+            finally:
+                # tools still running after a failure have to finish before
+                # their results can be released
+                for future in futures:
+                    future.cancel()
+                wait(futures)
+                for future in futures:
+                    self.discard_result(future)
+
+    @staticmethod
+    def _get_ready_outputs(
+        plan: ExecutionPlan, tool: Tool, pending_inputs: typing.Dict[int, int]
+    ) -> typing.List[Tool]:
+        """Returns outputs of the finished tool that have all their inputs completed."""
+        ready_tools = []
+        for output_id in plan.outputs[tool.id]:
+            pending_inputs[output_id] -= 1
+            # tools that are part of a cycle never reach zero pending inputs
+            if pending_inputs[output_id] == 0:
+                ready_tools.append(plan.tools[output_id])
+
+        return ready_tools
+
+
+class ThreadPoolWorkflowExecutor(PoolExecutor):
+    """Runs independent tools concurrently on a thread pool."""
+
+    def create_pool(self) -> Executor:
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="workflow"
+        )
+
+
+def run_shared_tool(
+    tool: Tool,
+    shared_inputs: typing.Dict[int, SharedDataFrame],
+    hints: typing.Dict[str, typing.Any],
+) -> typing.Tuple[SharedDataFrame, typing.Dict[str, typing.Any]]:
+    """Runs tool in a worker process on DataFrames passed through shared memory.
+
+    Tools run in worker processes must not access the database, since connections
+    inherited from the parent process cannot be safely used in a child process.
+    Metadata recorded by the tool's service is returned with the result and saved
+    by the parent process.
+    """
+    inputs, input_segments = {}, []
+    try:
+        for input_id, shared_input in shared_inputs.items():
+            inputs[input_id], segments = attach_dataframe(shared_input)
+            input_segments.extend(segments)
+
+        df = run_tool(tool, inputs, **hints)
+        shared_output, output_segments = share_dataframe(df)
+        # output blocks are unlinked by the parent process after loading the result
+        del df
+        release_segments(output_segments)
+    finally:
+        inputs.clear()
+        release_segments(input_segments)
+
+    return shared_output, tool.metadata
+
+
+_process_pools: typing.Dict[typing.Tuple[int, typing.Optional[int]], Executor] = {}
+_process_pools_lock = threading.Lock()
+
+
+class ProcessPoolWorkflowExecutor(PoolExecutor):
+    """Runs independent tools in parallel on a pool of worker processes.
+
+    Numeric column blocks of input and output DataFrames are passed between
+    processes through shared memory instead of being pickled through the pool's
+    pipes. Object columns (e.g. strings) have no out-of-band representation
+    and are still pickled in full.
+
+    Workers are forked once per process on the first run and reused by later runs.
+    """
+
+    def __init__(self, max_workers: typing.Optional[int] = None) -> None:
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise ImproperlyConfigured(
+                "Process workflow executor requires 'fork' start method."
+            )
+        # downloads of tools run in worker processes are counted in the cache
+        check_shared_fetch_cache()
+        super().__init__(max_workers=max_workers)
+        self.input_segments: typing.Dict[Future, typing.List[SharedMemory]] = {}
+        self.submitted_tools: typing.Dict[Future, Tool] = {}
+
+    def create_pool(self) -> Executor:
+        # tracker has to be started before workers are created, so workers share it
+        # with the parent process and do not unlink blocks they did not create on exit
+        resource_tracker.ensure_running()
+        # forked workers inherit configured Django settings and app registry
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=multiprocessing.get_context("fork")
+        )
+
+    @contextmanager
+    def open_pool(self) -> typing.Iterator[Executor]:
+        # pools are kept per process ID, so forked web workers never share them
+        key = (os.getpid(), self.max_workers)
+        with _process_pools_lock:
+            if key not in _process_pools:
+                _process_pools[key] = self.create_pool()
+            pool = _process_pools[key]
+
+        try:
+            yield pool
+        except BrokenProcessPool:
+            with _process_pools_lock:
+                if _process_pools.get(key) is pool:
+                    del _process_pools[key]
+            pool.shutdown(wait=False)
+            raise
+
+    def submit(self, pool: Executor, tool: Tool, service: WorkflowService) -> Future:
+        shared_inputs, segments = {}, []
+        try:
+            for input_id, df in service.get_tool_inputs(tool).items():
+                shared_inputs[input_id], input_segments = share_dataframe(df)
+                segments.extend(input_segments)
+            future = pool.submit(
+                run_shared_tool, tool, shared_inputs, service.get_tool_hints(tool)
+            )
+        except Exception:
+            release_segments(segments, unlink=True)
+            raise
+
+        self.input_segments[future] = segments
+        self.submitted_tools[future] = tool
+        return future
+
+    def get_result(self, future: Future) -> pd.DataFrame:
+        release_segments(self.input_segments.pop(future), unlink=True)
+        shared_output, metadata = future.result()
+        # tool of the worker process is a copy of the tool of the plan
+        self.submitted_tools.pop(future).metadata = metadata
+        return load_dataframe(shared_output)
+
+    def discard_result(self, future: Future) -> None:
+        release_segments(self.input_segments.pop(future), unlink=True)
+        self.submitted_tools.pop(future)
+        if not future.cancelled() and future.exception() is None:
+            discard_dataframe(future.result()[0])
+
+
+class ChunkedExecutor(WorkflowExecutor):
+    """Runs tools one at a time, passing chunks of results between chunk-capable tools.
+
+    A chunk-capable tool whose result is consumed by a single tool of the plan
+    and is not returned is fused with its consumer: its chunks are produced
+    lazily while the consumer reads them and its result is never stored.
+    Results of other tools are materialized, so tools that do not support
+    chunks get whole DataFrames.
+
+    When no target tools are requested, only results of sink tools (tools
+    without consumers) are returned, results of fused tools are skipped.
+    """
+
+    def __init__(self, chunk_rows: int) -> None:
+        self.chunk_rows = chunk_rows
+
+    def execute(
+        self, plan: ExecutionPlan, service: WorkflowService
+    ) -> typing.Iterator[Tool]:
+        # chunks of fused results and tools that produce them indexed by Tool IDs
+        streams: typing.Dict[
+            int, typing.Tuple[typing.Iterator[pd.DataFrame], typing.List[Tool]]
+        ] = {}
+
+        for tool in plan.order:
+            inputs, fused_tools = {}, []
+            for input_id in plan.inputs[tool.id]:
+                if input_id in streams:
+                    inputs[input_id], input_fused_tools = streams.pop(input_id)
+                    fused_tools.extend(input_fused_tools)
+            for input_id, df in service.get_tool_inputs(
+                tool, exclude_ids=inputs
+            ).items():
+                inputs[input_id] = iter([df])
+
+            service.wait_for_prefetch(tool)
+            tool_service = get_tool_service(tool, **service.get_tool_hints(tool))
+            chunks = tool_service.run_tool_chunked(
+                inputs=inputs, chunk_rows=self.chunk_rows
+            )
+            is_returned = service.target_ids is not None and service.is_output(tool.id)
+            if (
+                tool_service.chunked
+                and len(plan.outputs[tool.id]) == 1
+                and not is_returned
+            ):
+                streams[tool.id] = (chunks, fused_tools + [tool])
+                continue
+
+            try:
+                df = concat_chunks(chunks)
+            finally:
+                chunks.close()
+            service.set_tool_result(tool, df)
+            # inputs of fused tools are released once the whole pipeline is done
+            for fused_tool in fused_tools:
+                service.save_tool_metadata(fused_tool)
+                service.release_tool_inputs(fused_tool)
+            yield tool
+
+
+def get_executor() -> WorkflowExecutor:
+    """Returns executor backend selected with WORKFLOW_EXECUTOR setting."""
+    backend = settings.WORKFLOW_EXECUTOR
+
+    if backend == "serial":
+        return SerialExecutor()
+    if backend == "thread":
+        return ThreadPoolWorkflowExecutor(max_workers=settings.WORKFLOW_MAX_WORKERS)
+    if backend == "process":
+        return ProcessPoolWorkflowExecutor(max_workers=settings.WORKFLOW_MAX_WORKERS)
+    if backend == "chunked":
+        return ChunkedExecutor(chunk_rows=settings.WORKFLOW_CHUNK_ROWS)
+
+    raise ImproperlyConfigured(f"Unknown workflow executor backend: {backend}.")
@@ -0,0 +1,229 @@
+import io
+import socket
+import time
+import typing
+from contextlib import contextmanager
+from urllib.error import URLError
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+
+# size of buffers in which response bodies are read
+FETCH_BUFFER_BYTES = 1024 * 1024
+
+
+class FetchBudgetExceeded(Exception):
+    """Raised when a download exceeds its byte or time budget."""
+
+
+class FetchBudget:
+    """Limits bytes and seconds of downloads of a tool and of its user.
+
+    Limits of a tool apply to every download separately. Limits of a user apply
+    to all downloads of the user's tools within a window of time and are counted
+    in a Django cache, so they are shared by processes that share the cache.
+    Downloads that run at the same time are checked against usage from before
+    they started, so together they can exceed the limits of the user.
+    Limits set to 0 (or None) are disabled.
+    """
+
+    key_prefix = "workflow-fetch"
+
+    def __init__(
+        self,
+        max_bytes: typing.Optional[int] = None,
+        timeout: typing.Optional[float] = None,
+        user_id: typing.Optional[int] = None,
+        user_max_bytes: typing.Optional[int] = None,
+        user_max_seconds: typing.Optional[float] = None,
+        user_window: int = 3600,
+        cache_alias: str = "default",
+    ) -> None:
+        self.max_bytes = max_bytes or None
+        self.timeout = timeout or None
+        self.user_id = user_id
+        self.user_max_bytes = user_max_bytes or None
+        self.user_max_seconds = user_max_seconds or None
+        self.user_window = user_window
+        self.cache_alias = cache_alias
+
+    @classmethod
+    def from_settings(cls, user_id: typing.Optional[int] = None) -> "FetchBudget":
+        return cls(
+            max_bytes=settings.WORKFLOW_FETCH_MAX_BYTES,
+            timeout=settings.WORKFLOW_FETCH_TIMEOUT,
+            user_id=user_id,
+            user_max_bytes=settings.WORKFLOW_USER_FETCH_MAX_BYTES,
+            user_max_seconds=settings.WORKFLOW_USER_FETCH_MAX_SECONDS,
+            user_window=settings.WORKFLOW_USER_FETCH_WINDOW,
+            cache_alias=settings.WORKFLOW_USER_FETCH_CACHE_ALIAS,
+        )
+
+    def get_limits(self) -> typing.Tuple[typing.Optional[int], typing.Optional[float]]:
+        """Returns bytes and seconds left for a download that starts now.
+
+        Raises:
+            FetchBudgetExceeded: catches case in which the user has no budget left
+        """
+        max_bytes, max_seconds = self.max_bytes, self.timeout
+        if self.user_id is None:
+            return max_bytes, max_seconds
+
+        used_bytes, used_milliseconds = self._get_user_usage()
+        if self.user_max_bytes is not None:
+            if used_bytes >= self.user_max_bytes:
+                raise FetchBudgetExceeded("User has exceeded the download size limit.")
+            max_bytes = _min(max_bytes, self.user_max_bytes - used_bytes)
+        if self.user_max_seconds is not None:
+            left_seconds = self.user_max_seconds - used_milliseconds / 1000
+            if left_seconds <= 0:
+                raise FetchBudgetExceeded("User has exceeded the download time limit.")
+            max_seconds = _min(max_seconds, left_seconds)
+
+        return max_bytes, max_seconds
+
+    def add_usage(self, nbytes: int, seconds: float) -> None:
+        """Adds a finished (or aborted) download to the usage of the user."""
+        if self.user_id is None:
+            return
+
+        cache = caches[self.cache_alias]
+        for name, value in (("bytes", nbytes), ("milliseconds", int(seconds * 1000))):
+            key = self._get_user_key(name)
+            cache.add(key, 0, timeout=self.user_window)
+            try:
+                cache.incr(key, value)
+            except ValueError:
+                # key expired between add and incr
+                cache.set(key, value, timeout=self.user_window)
+
+    def _get_user_usage(self) -> typing.Tuple[int, int]:
+        cache = caches[self.cache_alias]
+        return (
+            cache.get(self._get_user_key("bytes"), 0),
+            cache.get(self._get_user_key("milliseconds"), 0),
+        )
+
+    def _get_user_key(self, name: str) -> str:
+        window = int(time.time() // self.user_window)
+        return f"{self.key_prefix}:{self.user_id}:{window}:{name}"
+
+
+def check_shared_fetch_cache() -> None:
+    """Raises ImproperlyConfigured when limits of users are counted in a cache
+    that is not shared by processes, e.g. by workers of the process executor."""
+    if not (
+        settings.WORKFLOW_USER_FETCH_MAX_BYTES
+        or settings.WORKFLOW_USER_FETCH_MAX_SECONDS
+    ):
+        return
+    if isinstance(caches[settings.WORKFLOW_USER_FETCH_CACHE_ALIAS], LocMemCache):
+        raise ImproperlyConfigured(
+            "Download limits of users require a cache shared by processes, "
+            "WORKFLOW_USER_FETCH_CACHE_ALIAS must not be a local-memory cache."
+        )
+
+
+def _min(
+    limit: typing.Optional[float], other_limit: typing.Optional[float]
+) -> typing.Optional[float]:
+    return other_limit if limit is None else min(limit, other_limit)
+
+
+class BudgetedStream(io.RawIOBase):
+    """Unbuffered stream of a response body that raises FetchBudgetExceeded once
+    the body is larger or its download takes longer than allowed."""
+
+    def __init__(
+        self,
+        response: typing.Any,
+        url: str,
+        max_bytes: typing.Optional[int],
+        max_seconds: typing.Optional[float],
+    ) -> None:
+        self.response = response
+        self.url = url
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.start = time.monotonic()
+        self.bytes = 0
+
+    @property
+    def seconds(self) -> float:
+        return time.monotonic() - self.start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: typing.Any) -> int:
+        try:
+            size = self.response.readinto(buffer)
+        except socket.timeout:
+            raise FetchBudgetExceeded(f"Download of {self.url} has timed out.")
+
+        self.bytes += size
+        if self.max_bytes is not None and self.bytes > self.max_bytes:
+            raise FetchBudgetExceeded(
+                f"Download of {self.url} exceeds the limit of {self.max_bytes} bytes."
+            )
+        if self.max_seconds is not None and self.seconds > self.max_seconds:
+            raise FetchBudgetExceeded(f"Download of {self.url} has timed out.")
+        return size
+
+    def close(self) -> None:
+        self.response.close()
+        super().close()
+
+
+class FetchedBody(io.BufferedReader):
+    """Buffered response body with the headers of its response."""
+
+    def __init__(self, stream: BudgetedStream, headers: typing.Any) -> None:
+        super().__init__(stream, buffer_size=FETCH_BUFFER_BYTES)
+        self.headers = headers
+
+
+@contextmanager
+def fetch(
+    url: str,
+    budget: FetchBudget,
+    headers: typing.Optional[typing.Dict[str, str]] = None,
+) -> typing.Iterator[FetchedBody]:
+    """Yields a buffered stream of the URL's response body within the budget.
+
+    Bodies whose Content-Length exceeds the budget are rejected before being
+    downloaded. Bytes and seconds of the download are added to the usage
+    of the user once the stream is closed.
+
+    Raises:
+        FetchBudgetExceeded: catches case in which the download exceeds its budget
+        HTTPError: catches case in which the server responds with an error
+    """
+    max_bytes, max_seconds = budget.get_limits()
+    start = time.monotonic()
+    try:
+        response = urlopen(Request(url, headers=headers or {}), timeout=max_seconds)
+    except URLError as exc:
+        if isinstance(exc.reason, socket.timeout):
+            raise FetchBudgetExceeded(f"Download of {url} has timed out.")
+        raise
+    except socket.timeout:
+        raise FetchBudgetExceeded(f"Download of {url} has timed out.")
+
+    content_length = response.headers.get("Content-Length")
+    if max_bytes is not None and content_length and int(content_length) > max_bytes:
+        response.close()
+        budget.add_usage(0, time.monotonic() - start)
+        raise FetchBudgetExceeded(
+            f"Download of {url} exceeds the limit of {max_bytes} bytes."
+        )
+
+    stream = BudgetedStream(response, url, max_bytes, max_seconds)
+    try:
+        with FetchedBody(stream, response.headers) as body:
+            yield body
+    finally:
+        budget.add_usage(stream.bytes, time.monotonic() - start)
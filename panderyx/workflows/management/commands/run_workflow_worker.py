@@ -0,0 +1,38 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from panderyx.workflows.workers import WorkflowWorker
+
+
+class Command(BaseCommand):
+    help = "Processes workflow runs queued with the runs endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.WORKFLOW_WORKER_POLL_INTERVAL,
+            help="Seconds to wait before checking an empty queue again.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once there are no queued runs left.",
+        )
+
+    def handle(self, *args, **options):
+        worker = WorkflowWorker(
+            poll_interval=options["poll_interval"],
+            heartbeat_interval=settings.WORKFLOW_WORKER_HEARTBEAT_INTERVAL,
+            stale_timeout=settings.WORKFLOW_RUN_STALE_TIMEOUT,
+        )
+        signal.signal(signal.SIGTERM, worker.stop)
+        signal.signal(signal.SIGINT, worker.stop)
+
+        if options["burst"]:
+            processed = worker.run_pending()
+            self.stdout.write(f"Processed {processed} workflow run(s).")
+        else:
+            worker.run_forever()
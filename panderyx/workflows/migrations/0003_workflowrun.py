@@ -0,0 +1,71 @@
+# Generated by Django 4.0.1 on 2022-03-06 12:00
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workflows", "0002_alter_workflow_options_alter_workflow_user"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorkflowRun",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "queued"),
+                            ("running", "running"),
+                            ("succeeded", "succeeded"),
+                            ("failed", "failed"),
+                        ],
+                        default="queued",
+                        max_length=20,
+                    ),
+                ),
+                ("target_ids", models.JSONField(blank=True, null=True)),
+                ("result", models.JSONField(blank=True, null=True)),
+                ("error", models.JSONField(blank=True, null=True)),
+                (
+                    "date_created",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="date of creation"
+                    ),
+                ),
+                (
+                    "date_started",
+                    models.DateTimeField(null=True, verbose_name="start of run"),
+                ),
+                (
+                    "date_finished",
+                    models.DateTimeField(null=True, verbose_name="end of run"),
+                ),
+                (
+                    "workflow",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="runs",
+                        to="workflows.workflow",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-date_created"],
+            },
+        ),
+    ]
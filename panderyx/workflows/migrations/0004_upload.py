@@ -0,0 +1,81 @@
+# Generated by Django 4.0.1 on 2022-03-20 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import panderyx.workflows.models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("workflows", "0003_workflowrun"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Upload",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "filename",
+                    models.CharField(max_length=200, verbose_name="file name"),
+                ),
+                ("size", models.BigIntegerField(verbose_name="size in bytes")),
+                (
+                    "offset",
+                    models.BigIntegerField(default=0, verbose_name="uploaded bytes"),
+                ),
+                (
+                    "file",
+                    models.FileField(
+                        blank=True,
+                        max_length=255,
+                        upload_to=panderyx.workflows.models.get_upload_path,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("in_progress", "in progress"),
+                            ("completed", "completed"),
+                        ],
+                        default="in_progress",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "date_created",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="date of creation"
+                    ),
+                ),
+                (
+                    "date_updated",
+                    models.DateTimeField(auto_now=True, verbose_name="last update"),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="uploads",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-date_created"],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.0.1 on 2022-03-27 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workflows", "0004_upload"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="workflowrun",
+            name="date_heartbeat",
+            field=models.DateTimeField(
+                null=True, verbose_name="last heartbeat of worker"
+            ),
+        ),
+    ]
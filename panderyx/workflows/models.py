@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import os
 import uuid
-from typing import TYPE_CHECKING, List, Set
+from datetime import timedelta
+from typing import TYPE_CHECKING, BinaryIO, List, Optional
 
-from django.db import models
+from django.conf import settings
+from django.core.files import File
+from django.db import models, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from panderyx.users.models import User
+from panderyx.workflows.exceptions import UploadConflict
+from panderyx.workflows.planner import ExecutionPlan
 
 if TYPE_CHECKING:
     from panderyx.workflows.tools.models import Tool
@@ -27,6 +34,18 @@ class Workflow(models.Model):
     def __str__(self):
         return f"{self.name} workflow owned by {self.user.username}"
 
+    @property
+    def execution_plan(self) -> ExecutionPlan:
+        """Plan of the Workflow's DAG built with a fixed number of DB queries.
+
+        Raises:
+            ValueError: catches case in which Workflow does not contain any input-like Tools
+
+        Returns:
+            ExecutionPlan: plan that includes Tool execution order and their connections
+        """
+        return ExecutionPlan.from_workflow(self)
+
     @property
     def tool_execution_order(self) -> List[Tool]:
         """List of Tool objects that defines their execution order inside a Workflow.
@@ -37,46 +56,223 @@ class Workflow(models.Model):
         Returns:
             List[Tool]: list of Tool objects that defines their execution order
         """
-        tool_qs = self.tools.prefetch_related("inputs")
-        starting_tools = list(tool_qs.filter(inputs=None))
+        return self.execution_plan.order
 
-        if not starting_tools:
-            raise ValueError("Workflow cannot be run without any input files.")
 
-        return self._find_next_tools(set(starting_tools), starting_tools, set(tool_qs))
+class WorkflowRun(models.Model):
+    """Queued run of a Workflow processed by a background worker.
 
-    def _find_next_tools(
-        self,
-        previous_tools: Set[Tool],
-        tool_order: List[Tool],
-        tool_set: Set[Tool],
-    ) -> List[Tool]:
-        """Recurrent function that returns a list of Tool objects in the order of their execution.
+    Outputs of a successful run are stored in the same format as returned by
+    the run_workflow endpoint, errors of a failed run in the format of the
+    raised service exception.
+    """
 
-        Args:
-            previous_tools (Set[Tool]): tools from previous iteration for which connected tools are to be found
-            tool_order (List[Tool]): current status of tool execution order
-            tool_set (Set[Tool]): starting set of tools that includes all of the Tool objects from the current workflow
+    class Status(models.TextChoices):
+        QUEUED = "queued", _("queued")
+        RUNNING = "running", _("running")
+        SUCCEEDED = "succeeded", _("succeeded")
+        FAILED = "failed", _("failed")
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    workflow = models.ForeignKey(
+        Workflow, on_delete=models.CASCADE, related_name="runs"
+    )
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.QUEUED
+    )
+    target_ids = models.JSONField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.JSONField(null=True, blank=True)
+    date_created = models.DateTimeField(
+        auto_now_add=True, verbose_name=_("date of creation")
+    )
+    date_started = models.DateTimeField(null=True, verbose_name=_("start of run"))
+    date_heartbeat = models.DateTimeField(
+        null=True, verbose_name=_("last heartbeat of worker")
+    )
+    date_finished = models.DateTimeField(null=True, verbose_name=_("end of run"))
+
+    class Meta:
+        ordering = ["-date_created"]
+
+    def __str__(self):
+        return f"Run of {self.workflow.name} workflow ({self.status})"
+
+    @classmethod
+    def claim_next(cls) -> Optional[WorkflowRun]:
+        """Marks the oldest queued run as running and returns it.
+
+        Status is changed with a conditional update, so each run is claimed
+        by exactly one of the workers polling the queue.
 
         Returns:
-            List[Tool]: final status of tool execution order
+            Optional[WorkflowRun]: claimed run or None if the queue is empty
         """
-        # TODO Check how many DB queries are fired for this function
-        tools = tool_set - previous_tools - set(tool_order)
-        next_iteration_candidates = set(
-            tool for tool in tools if set(tool.inputs.all()) & previous_tools
-        )
-        tools_with_complete_inputs = [
-            candidate
-            for candidate in next_iteration_candidates
-            if not (set(candidate.inputs.all()) - set(tool_order))
-        ]
+        queued_runs = cls.objects.filter(status=cls.Status.QUEUED)
+        while True:
+            run_id = (
+                queued_runs.order_by("date_created")
+                .values_list("id", flat=True)
+                .first()
+            )
+            if run_id is None:
+                return None
 
-        if not tools_with_complete_inputs:
-            return tool_order
+            # run could have been claimed by another worker in the meantime
+            now = timezone.now()
+            if queued_runs.filter(id=run_id).update(
+                status=cls.Status.RUNNING, date_started=now, date_heartbeat=now
+            ):
+                return cls.objects.select_related("workflow").get(id=run_id)
 
-        tool_order.extend(tools_with_complete_inputs)
+    @classmethod
+    def fail_stale(cls, timeout: float) -> int:
+        """Marks running runs without a heartbeat for timeout seconds as failed.
 
-        return self._find_next_tools(
-            set(tools_with_complete_inputs), tool_order, tool_set
+        Workers of such runs have stopped without finishing them (e.g. were killed).
+        Runs are not queued again, since they could have stopped their workers,
+        e.g. by running out of memory.
+
+        Returns:
+            int: number of failed runs
+        """
+        limit = timezone.now() - timedelta(seconds=timeout)
+        # runs claimed before heartbeats were recorded have only their start date
+        stale_runs = cls.objects.filter(status=cls.Status.RUNNING).filter(
+            models.Q(date_heartbeat__lt=limit)
+            | models.Q(date_heartbeat__isnull=True, date_started__lt=limit)
         )
+        failed = 0
+        for run_id, workflow_id in stale_runs.values_list("id", "workflow_id"):
+            # run could have been failed by another worker in the meantime
+            failed += stale_runs.filter(id=run_id).update(
+                status=cls.Status.FAILED,
+                error={
+                    "workflow_id": str(workflow_id),
+                    "message": "Worker processing the run has stopped.",
+                },
+                date_finished=timezone.now(),
+            )
+        return failed
+
+    def heartbeat(self) -> None:
+        """Marks the run as processed by a running worker."""
+        WorkflowRun.objects.filter(id=self.id, status=self.Status.RUNNING).update(
+            date_heartbeat=timezone.now()
+        )
+
+    def finish(self, status: str, result=None, error=None) -> None:
+        self.status = status
+        self.result = result
+        self.error = error
+        self.date_finished = timezone.now()
+        self.save(update_fields=["status", "result", "error", "date_finished"])
+
+
+def get_upload_path(upload: Upload, filename: str) -> str:
+    return f"uploads/{upload.user_id}/{upload.id}/{filename}"
+
+
+class Upload(models.Model):
+    """File uploaded in chunks and parsed by input_file tools.
+
+    Chunks are appended to a partial file in WORKFLOW_UPLOAD_DIR, so an interrupted
+    upload is resumed from its offset. Once its last chunk is appended, the file
+    is moved to the default storage (MEDIA_ROOT or a django-storages backend).
+    """
+
+    class Status(models.TextChoices):
+        IN_PROGRESS = "in_progress", _("in progress")
+        COMPLETED = "completed", _("completed")
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="uploads")
+    filename = models.CharField(max_length=200, verbose_name=_("file name"))
+    size = models.BigIntegerField(verbose_name=_("size in bytes"))
+    offset = models.BigIntegerField(default=0, verbose_name=_("uploaded bytes"))
+    file = models.FileField(upload_to=get_upload_path, max_length=255, blank=True)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.IN_PROGRESS
+    )
+    date_created = models.DateTimeField(
+        auto_now_add=True, verbose_name=_("date of creation")
+    )
+    date_updated = models.DateTimeField(auto_now=True, verbose_name=_("last update"))
+
+    class Meta:
+        ordering = ["-date_created"]
+
+    def __str__(self):
+        return f"{self.filename} uploaded by {self.user.username} ({self.status})"
+
+    @property
+    def partial_path(self) -> str:
+        return os.path.join(settings.WORKFLOW_UPLOAD_DIR, str(self.id))
+
+    def append_chunk(self, offset: int, chunk: BinaryIO, length: int) -> None:
+        """Writes length bytes of the chunk at the offset of the upload.
+
+        Upload is locked while the chunk is written, so concurrent chunks are
+        appended one at a time. Bytes received before the chunk was interrupted
+        (e.g. the client disconnected) are kept and the upload is resumed from
+        its new offset.
+
+        Raises:
+            UploadConflict: catches case in which the offset is not the offset
+                of the upload or the upload is already completed
+            OSError: catches case in which the chunk could not be read, raised
+                once the received bytes are saved
+        """
+        read_error = None
+        with transaction.atomic():
+            upload = Upload.objects.select_for_update().get(pk=self.pk)
+            if upload.status == self.Status.COMPLETED:
+                raise UploadConflict(upload.offset, "Upload is already completed.")
+            if offset != upload.offset:
+                raise UploadConflict(upload.offset)
+
+            os.makedirs(settings.WORKFLOW_UPLOAD_DIR, exist_ok=True)
+            mode = "r+b" if os.path.exists(self.partial_path) else "wb"
+            with open(self.partial_path, mode) as file:
+                file.seek(offset)
+                try:
+                    copy_bytes(chunk, file, length)
+                except OSError as exc:
+                    # error is raised after the transaction, so the offset is saved
+                    read_error = exc
+                upload.offset = file.tell()
+                # bytes of a chunk that was written but not saved are overwritten
+                file.truncate()
+
+            if upload.offset == upload.size:
+                upload.complete()
+            upload.save(update_fields=["offset", "file", "status", "date_updated"])
+
+        self.refresh_from_db()
+        if read_error is not None:
+            raise read_error
+
+    def complete(self) -> None:
+        with open(self.partial_path, "rb") as file:
+            self.file.save(self.filename, File(file), save=False)
+        os.remove(self.partial_path)
+        self.status = self.Status.COMPLETED
+
+    def delete_files(self) -> None:
+        if self.file:
+            self.file.delete(save=False)
+        if os.path.exists(self.partial_path):
+            os.remove(self.partial_path)
+
+
+def copy_bytes(source: BinaryIO, destination: BinaryIO, length: int) -> int:
+    """Copies up to length bytes in buffers of 1 MiB and returns number of
+    copied bytes, which is lower if the source ends earlier."""
+    copied = 0
+    while copied < length:
+        buffer = source.read(min(1024 * 1024, length - copied))
+        if not buffer:
+            break
+        destination.write(buffer)
+        copied += len(buffer)
+    return copied
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import deque
+from dataclasses import dataclass, field
+from functools import reduce
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+if TYPE_CHECKING:
+    from panderyx.workflows.models import Workflow
+    from panderyx.workflows.tools.models import Tool
+    from panderyx.workflows.tools.services.tool import ToolService
+
+T = TypeVar("T")
+
+
+@dataclass
+class ExecutionPlan:
+    """In-memory view of a Workflow's DAG that defines the order of Tool execution.
+
+    Attributes:
+        tools (Dict[int, Tool]): Tool objects indexed by their IDs
+        inputs (Dict[int, List[int]]): IDs of input tools for every Tool ID
+        outputs (Dict[int, List[int]]): IDs of output tools for every Tool ID
+        order (List[Tool]): Tool objects in the order of their execution
+    """
+
+    tools: Dict[int, Tool]
+    inputs: Dict[int, List[int]]
+    outputs: Dict[int, List[int]]
+    order: List[Tool] = field(default_factory=list)
+
+    @classmethod
+    def from_workflow(cls, workflow: Workflow) -> ExecutionPlan:
+        """Builds a plan with two DB queries regardless of the Workflow's size.
+
+        Args:
+            workflow (Workflow): workflow for which plan is to be built
+
+        Raises:
+            ValueError: catches case in which Workflow has no input-like Tools
+
+        Returns:
+            ExecutionPlan: plan of the workflow
+        """
+        tools = list(workflow.tools.all())
+        through_model = workflow.tools.model.inputs.through
+        edges = through_model.objects.filter(from_tool__workflow=workflow).values_list(
+            "to_tool_id", "from_tool_id"
+        )
+
+        return cls.from_edges(tools, edges)
+
+    @classmethod
+    def from_edges(
+        cls, tools: Iterable[Tool], edges: Iterable[Tuple[int, int]]
+    ) -> ExecutionPlan:
+        """Builds a plan from Tool objects and (input ID, tool ID) pairs.
+
+        Execution order is defined with Kahn's algorithm, so tools are ordered
+        by the level of their dependencies in a linear time.
+
+        Args:
+            tools (Iterable[Tool]): all of the Tool objects from the workflow
+            edges (Iterable[Tuple[int, int]]): pairs of input tool ID and tool ID
+
+        Raises:
+            ValueError: catches case in which there are no Tools without inputs
+
+        Returns:
+            ExecutionPlan: plan of the workflow
+        """
+        tools = {tool.id: tool for tool in tools}
+        inputs = {tool_id: [] for tool_id in tools}
+        outputs = {tool_id: [] for tool_id in tools}
+
+        for input_id, tool_id in edges:
+            inputs[tool_id].append(input_id)
+            outputs[input_id].append(tool_id)
+
+        plan = cls(tools=tools, inputs=inputs, outputs=outputs)
+        plan.order = [tools[tool_id] for tool_id in plan._sort()]
+
+        return plan
+
+    def get_ancestors(self, tool_ids: Iterable[int]) -> Set[int]:
+        """Returns IDs of provided tools together with IDs of their upstream tools."""
+        ancestors = set(tool_ids)
+        queue = deque(ancestors)
+        while queue:
+            for input_id in self.inputs[queue.popleft()]:
+                if input_id not in ancestors:
+                    ancestors.add(input_id)
+                    queue.append(input_id)
+
+        return ancestors
+
+    def exclude(self, tool_ids: Iterable[int]) -> ExecutionPlan:
+        """Returns a plan without provided tools, e.g. tools with already known results.
+
+        Connections to excluded tools are removed, so remaining tools do not wait
+        for them before being run.
+
+        Args:
+            tool_ids (Iterable[int]): IDs of tools to be excluded
+
+        Returns:
+            ExecutionPlan: plan with remaining tools
+        """
+        excluded_ids = set(tool_ids)
+
+        return self._subplan(set(self.tools) - excluded_ids)
+
+    def prune(self, target_ids: Iterable[int]) -> ExecutionPlan:
+        """Returns a plan limited to the target tools and the tools they depend on.
+
+        Args:
+            target_ids (Iterable[int]): IDs of tools whose results are required
+
+        Returns:
+            ExecutionPlan: plan with the ancestor subgraph of target tools
+        """
+        return self._subplan(self.get_ancestors(target_ids))
+
+    def _subplan(self, tool_ids: Set[int]) -> ExecutionPlan:
+        return ExecutionPlan(
+            tools={tool_id: self.tools[tool_id] for tool_id in tool_ids},
+            inputs={
+                tool_id: [
+                    input_id
+                    for input_id in self.inputs[tool_id]
+                    if input_id in tool_ids
+                ]
+                for tool_id in tool_ids
+            },
+            outputs={
+                tool_id: [
+                    output_id
+                    for output_id in self.outputs[tool_id]
+                    if output_id in tool_ids
+                ]
+                for tool_id in tool_ids
+            },
+            order=[tool for tool in self.order if tool.id in tool_ids],
+        )
+
+    def get_required_columns(
+        self, output_ids: Iterable[int]
+    ) -> Dict[int, Optional[FrozenSet[str]]]:
+        """Returns columns of tool results that are used by downstream tools.
+
+        Columns required by each tool service from its inputs are propagated
+        upstream, so every tool gets the union of columns required by its outputs.
+
+        Args:
+            output_ids (Iterable[int]): IDs of tools whose results are returned
+                with all of their columns
+
+        Returns:
+            Dict[int, Optional[FrozenSet[str]]]: used columns indexed by Tool IDs,
+                None if all of the columns are used
+        """
+        required_columns = self._propagate_upstream(
+            output_needs={tool_id: None for tool_id in output_ids},
+            get_input_need=lambda service, columns: service.get_input_columns(columns),
+            combine=lambda columns, other_columns: columns | other_columns,
+        )
+        return {
+            tool_id: None if columns is None else frozenset(columns)
+            for tool_id, columns in required_columns.items()
+        }
+
+    def get_required_rows(
+        self, output_rows: Dict[int, Optional[int]]
+    ) -> Dict[int, Optional[int]]:
+        """Returns numbers of leading rows of tool results used by downstream tools.
+
+        Row limits are propagated upstream through tools that preserve the order
+        of rows, so e.g. an input tool followed only by a head tool is limited
+        to the number of rows taken by the head tool.
+
+        Args:
+            output_rows (Dict[int, Optional[int]]): numbers of rows of returned
+                results indexed by IDs of returned tools, None if all of the rows
+                are returned
+
+        Returns:
+            Dict[int, Optional[int]]: used rows indexed by Tool IDs, None if all
+                of the rows are used
+        """
+        return self._propagate_upstream(
+            output_needs=output_rows,
+            get_input_need=lambda service, rows: service.get_input_rows(rows),
+            combine=max,
+        )
+
+    def _propagate_upstream(
+        self,
+        output_needs: Dict[int, Optional[T]],
+        get_input_need: Callable[[ToolService, Optional[T]], Optional[T]],
+        combine: Callable[[T, T], T],
+    ) -> Dict[int, Optional[T]]:
+        """Propagates needs (e.g. used columns) of tools towards their inputs.
+
+        None stands for a need of the whole result and takes precedence over
+        any other need when needs of several outputs are combined.
+        """
+        # imported here, since tool services depend on models that depend on planner
+        from panderyx.workflows.tools.mappings import ToolMapping
+
+        needs: Dict[int, Optional[T]] = {}
+        for tool in reversed(self.order):
+            tool_needs = []
+            if tool.id in output_needs:
+                tool_needs.append(output_needs[tool.id])
+            elif not self.outputs[tool.id]:
+                tool_needs.append(None)
+
+            for output_id in self.outputs[tool.id]:
+                output_tool = self.tools[output_id]
+                service_class = ToolMapping[output_tool.config["type"]].value["service"]
+                # tools that are part of a cycle are not in the execution order
+                tool_needs.append(
+                    get_input_need(
+                        service_class(tool=output_tool), needs.get(output_id)
+                    )
+                )
+
+            if any(need is None for need in tool_needs):
+                needs[tool.id] = None
+            else:
+                needs[tool.id] = reduce(combine, tool_needs)
+
+        return needs
+
+    def get_fingerprints(
+        self,
+        hints: Optional[Dict[int, Dict[str, Any]]] = None,
+        versions: Optional[Dict[int, str]] = None,
+    ) -> Dict[int, str]:
+        """Returns fingerprints of tool results in the plan.
+
+        Fingerprint of a tool is built from its config (including its type),
+        hints passed to its service, version of the data it reads and fingerprints
+        of its inputs, so it changes whenever the tool or any of its upstream tools
+        (or their files) is changed.
+
+        Args:
+            hints (Optional[Dict[int, Dict[str, Any]]]): hints passed to tool
+                services indexed by Tool IDs
+            versions (Optional[Dict[int, str]]): versions of data read by tools
+                (see ToolService.get_source_version) indexed by Tool IDs
+
+        Returns:
+            Dict[int, str]: fingerprints indexed by Tool IDs
+        """
+        hints = hints or {}
+        versions = versions or {}
+        fingerprints = {}
+        for tool in self.order:
+            content = {
+                "config": tool.config,
+                "inputs": [
+                    fingerprints[input_id] for input_id in sorted(self.inputs[tool.id])
+                ],
+            }
+            if tool.id in hints:
+                content["hints"] = hints[tool.id]
+            if tool.id in versions:
+                content["version"] = versions[tool.id]
+            fingerprints[tool.id] = hashlib.sha256(
+                json.dumps(content, sort_keys=True, default=str).encode()
+            ).hexdigest()
+
+        return fingerprints
+
+    def _sort(self) -> List[int]:
+        pending_inputs = {
+            tool_id: len(input_ids) for tool_id, input_ids in self.inputs.items()
+        }
+        queue = deque(
+            tool_id for tool_id, count in pending_inputs.items() if count == 0
+        )
+
+        if not queue:
+            raise ValueError("Workflow cannot be run without any input files.")
+
+        order = []
+        while queue:
+            tool_id = queue.popleft()
+            order.append(tool_id)
+
+            for output_id in self.outputs[tool_id]:
+                pending_inputs[output_id] -= 1
+                if pending_inputs[output_id] == 0:
+                    queue.append(output_id)
+
+        # tools that are part of a cycle never reach zero pending inputs and
+        # are left out of the execution order
+        return order
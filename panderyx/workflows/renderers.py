@@ -0,0 +1,159 @@
+import typing
+from abc import ABC, abstractmethod
+
+import numpy as np
+import orjson
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pandas.api.types import is_datetime64_any_dtype, is_timedelta64_dtype
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+OUTPUT_ORIENTS = ("split", "records", "columns")
+
+ARROW_ERRORS = (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError)
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(data: typing.Any) -> bytes:
+    """Encodes data with orjson, falling back to DRF's encoder for other types."""
+    return orjson.dumps(data, default=JSONEncoder().default, option=ORJSON_OPTIONS)
+
+
+def dataframe_to_native(df: pd.DataFrame, orient: str) -> typing.Any:
+    """Converts DataFrame into structures encoded by orjson as native JSON.
+
+    Structures and values follow DataFrame.to_json(): dates and durations are
+    encoded as epoch milliseconds, missing values as null and keys as strings.
+    Values of homogeneous numeric DataFrames are kept in a numpy array that
+    orjson encodes without converting every value into a Python object.
+
+    Args:
+        df (pd.DataFrame): DataFrame to be converted
+        orient (str): one of "split", "records" or "columns"
+
+    Raises:
+        ValueError: catches unknown orients
+
+    Returns:
+        Any: dict or list with DataFrame's contents
+    """
+    if orient == "split":
+        return {
+            "columns": _to_list(df.columns),
+            "index": _to_list(df.index),
+            "data": _get_values(df),
+        }
+    if orient == "records":
+        columns = _to_keys(df.columns)
+        return [dict(zip(columns, row)) for row in _get_rows(df)]
+    if orient == "columns":
+        index = _to_keys(df.index)
+        return {
+            column: dict(zip(index, _to_list(values)))
+            for column, (_, values) in zip(_to_keys(df.columns), df.items())
+        }
+
+    raise ValueError(f"Unknown output orient: {orient}.")
+
+
+def _get_rows(df: pd.DataFrame) -> typing.Iterable[tuple]:
+    # columns are converted into Python objects one at a time, instead of per value
+    return zip(*(_to_list(values) for _, values in df.items()))
+
+
+def _get_values(df: pd.DataFrame) -> typing.Union[np.ndarray, list]:
+    if all(_is_numeric(dtype) for dtype in df.dtypes):
+        values = df.to_numpy()
+        if values.dtype.kind in "biuf":
+            # orjson encodes only C-contiguous arrays
+            return np.ascontiguousarray(values)
+    return [list(row) for row in _get_rows(df)]
+
+
+def _is_numeric(dtype: typing.Any) -> bool:
+    # NaN of numpy floats is encoded by orjson as null
+    return isinstance(dtype, np.dtype) and dtype.kind in "biuf"
+
+
+def _to_list(values: typing.Union[pd.Series, pd.Index]) -> list:
+    if _is_numeric(values.dtype):
+        return values.tolist()
+    if is_datetime64_any_dtype(values.dtype) or is_timedelta64_dtype(values.dtype):
+        milliseconds = (values.array.asi8 // 1_000_000).astype(object)
+        milliseconds[np.asarray(values.isna())] = None
+        return milliseconds.tolist()
+    values = values.astype(object)
+    return values.where(values.notna(), None).tolist()
+
+
+def _to_keys(values: pd.Index) -> list:
+    return ["null" if key is None else str(key) for key in _to_list(values)]
+
+
+class ORJSONRenderer(BaseRenderer):
+    """Renders JSON with orjson, encoding numpy arrays natively."""
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return dumps(data)
+
+
+class DataFrameRenderer(BaseRenderer, ABC):
+    """Base class for renderers of DataFrames in binary columnar formats.
+
+    Object columns with values of mixed types, like the ones returned by
+    describe(), are rendered as strings, because Arrow columns have a single type.
+    """
+
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        sink = pa.BufferOutputStream()
+        self.write_table(self.to_table(data), sink)
+        return sink.getvalue().to_pybytes()
+
+    @staticmethod
+    def to_table(df: pd.DataFrame) -> pa.Table:
+        try:
+            return pa.Table.from_pandas(df)
+        except ARROW_ERRORS:
+            df = df.copy()
+        for position in range(df.shape[1]):
+            values = df.iloc[:, position]
+            if values.dtype != object:
+                continue
+            try:
+                pa.array(values, from_pandas=True)
+            except ARROW_ERRORS:
+                df.iloc[:, position] = values.astype(str).where(values.notna(), None)
+        return pa.Table.from_pandas(df)
+
+    @abstractmethod
+    def write_table(self, table: pa.Table, sink: pa.NativeFile) -> None:
+        """Writes table into the sink in the renderer's format."""
+
+
+class ArrowStreamRenderer(DataFrameRenderer):
+    media_type = "application/vnd.apache.arrow.stream"
+    format = "arrow"
+
+    def write_table(self, table: pa.Table, sink: pa.NativeFile) -> None:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+class ParquetRenderer(DataFrameRenderer):
+    media_type = "application/vnd.apache.parquet"
+    format = "parquet"
+
+    def write_table(self, table: pa.Table, sink: pa.NativeFile) -> None:
+        pq.write_table(table, sink)
@@ -0,0 +1,106 @@
+import os
+import shutil
+import typing
+import uuid
+import weakref
+from collections.abc import MutableMapping
+
+import pandas as pd
+import pyarrow as pa
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+class DiskResultStore(MutableMapping):
+    """Mapping of tool IDs to result DataFrames that spills large results to disk.
+
+    DataFrames that use at least `spill_bytes` of memory are written to Arrow IPC
+    files in a directory created for the store, DataFrames that Arrow cannot
+    convert (e.g. object columns with mixed types) are pickled instead. Smaller
+    results are kept in memory. Every access reads a spilled result from its
+    memory-mapped file into a new DataFrame, so the result uses memory only while
+    its consumer holds it.
+    """
+
+    def __init__(self, directory: str, spill_bytes: int = 0) -> None:
+        self.directory = os.path.join(directory, uuid.uuid4().hex)
+        self.spill_bytes = spill_bytes
+        self._dfs: typing.Dict[int, pd.DataFrame] = {}
+        self._paths: typing.Dict[int, str] = {}
+        os.makedirs(self.directory)
+        # files are removed even if the store is not closed explicitly
+        self._finalizer = weakref.finalize(
+            self, shutil.rmtree, self.directory, ignore_errors=True
+        )
+
+    def __getitem__(self, tool_id: int) -> pd.DataFrame:
+        if tool_id in self._dfs:
+            return self._dfs[tool_id]
+
+        path = self._paths[tool_id]
+        if path.endswith(".pickle"):
+            return pd.read_pickle(path)
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+
+    def __setitem__(self, tool_id: int, df: pd.DataFrame) -> None:
+        self._discard(tool_id)
+        if df.memory_usage(deep=True).sum() < self.spill_bytes:
+            self._dfs[tool_id] = df
+            return
+
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            path = os.path.join(self.directory, f"{tool_id}.pickle")
+            df.to_pickle(path)
+            self._paths[tool_id] = path
+            return
+
+        path = os.path.join(self.directory, f"{tool_id}.arrow")
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        self._paths[tool_id] = path
+
+    def __delitem__(self, tool_id: int) -> None:
+        if tool_id not in self:
+            raise KeyError(tool_id)
+        self._discard(tool_id)
+
+    def __contains__(self, tool_id: object) -> bool:
+        return tool_id in self._dfs or tool_id in self._paths
+
+    def __iter__(self) -> typing.Iterator[int]:
+        yield from self._dfs
+        yield from self._paths
+
+    def __len__(self) -> int:
+        return len(self._dfs) + len(self._paths)
+
+    def close(self) -> None:
+        """Removes all of the results together with their files."""
+        self._dfs.clear()
+        self._paths.clear()
+        self._finalizer()
+
+    def _discard(self, tool_id: int) -> None:
+        self._dfs.pop(tool_id, None)
+        path = self._paths.pop(tool_id, None)
+        if path is not None:
+            os.remove(path)
+
+
+def get_result_store() -> typing.MutableMapping[int, pd.DataFrame]:
+    """Returns store for results of a single run selected with WORKFLOW_RESULT_STORE."""
+    backend = settings.WORKFLOW_RESULT_STORE
+
+    if backend == "memory":
+        return {}
+    if backend == "disk":
+        return DiskResultStore(
+            directory=settings.WORKFLOW_RESULT_STORE_DIR,
+            spill_bytes=settings.WORKFLOW_RESULT_SPILL_BYTES,
+        )
+
+    raise ImproperlyConfigured(f"Unknown workflow result store backend: {backend}.")
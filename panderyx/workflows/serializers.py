@@ -1,6 +1,10 @@
+import os
+
+from django.conf import settings
 from rest_framework import serializers
 
-from panderyx.workflows.models import Workflow
+from panderyx.workflows.models import Upload, Workflow, WorkflowRun
+from panderyx.workflows.renderers import OUTPUT_ORIENTS
 
 
 class WorkflowSerializer(serializers.ModelSerializer):
@@ -13,3 +17,83 @@ class WorkflowSerializer(serializers.ModelSerializer):
             "date_created",
             "date_updated",
         ]
+
+
+class RunWorkflowSerializer(serializers.Serializer):
+    target = serializers.ListField(child=serializers.IntegerField(), required=False)
+    stream = serializers.BooleanField(required=False, default=False)
+    # outputs are encoded into JSON strings when orient is not provided
+    orient = serializers.ChoiceField(choices=OUTPUT_ORIENTS, required=False)
+    limit = serializers.IntegerField(min_value=0, required=False)
+    offset = serializers.IntegerField(min_value=0, default=0)
+    sample = serializers.IntegerField(min_value=1, required=False)
+    # only rows up to offset + limit are read, total row counts are then unknown
+    preview = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, data):
+        if "sample" in data and ("limit" in data or data["offset"]):
+            raise serializers.ValidationError(
+                "Outputs can be either sampled or limited with an offset."
+            )
+        if data["preview"] and "limit" not in data:
+            raise serializers.ValidationError("Preview requires a limit.")
+        return data
+
+
+class WorkflowRunSerializer(serializers.ModelSerializer):
+    target_ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_null=True
+    )
+
+    class Meta:
+        model = WorkflowRun
+        exclude = ["result"]
+        read_only_fields = [
+            "id",
+            "workflow",
+            "status",
+            "error",
+            "date_created",
+            "date_started",
+            "date_finished",
+        ]
+
+    def validate_target_ids(self, value):
+        workflow = self.context.get("workflow")
+        if value and workflow:
+            if workflow.tools.filter(id__in=value).count() != len(set(value)):
+                raise serializers.ValidationError(
+                    "Provided target tool is not a part of this workflow."
+                )
+        return value
+
+
+class UploadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Upload
+        # uploaded files are read by input_file tools instead of being downloaded
+        exclude = ["file"]
+        read_only_fields = [
+            "id",
+            "user",
+            "offset",
+            "status",
+            "date_created",
+            "date_updated",
+        ]
+
+    def validate_filename(self, value):
+        filename = os.path.basename(value)
+        if not filename:
+            raise serializers.ValidationError("File name must not be empty.")
+        return filename
+
+    def validate_size(self, value):
+        if value < 1:
+            raise serializers.ValidationError("Uploaded file must not be empty.")
+        if value > settings.WORKFLOW_UPLOAD_MAX_BYTES:
+            raise serializers.ValidationError(
+                f"Uploaded file cannot be larger than "
+                f"{settings.WORKFLOW_UPLOAD_MAX_BYTES} bytes."
+            )
+        return value
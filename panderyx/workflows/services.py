@@ -1,18 +1,137 @@
+import copy
 import typing
-from panderyx.workflows.exceptions import WorkflowServiceException
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
 
+from panderyx.workflows.caching import (
+    Prefetcher,
+    ResultCache,
+    get_prefetcher,
+    get_result_cache,
+)
+from panderyx.workflows.exceptions import WorkflowServiceException
+from panderyx.workflows.executors import (
+    WorkflowExecutor,
+    get_executor,
+    get_tool_service,
+)
 from panderyx.workflows.models import Workflow
-from panderyx.workflows.tools.mappings import ToolMapping
+from panderyx.workflows.planner import ExecutionPlan
+from panderyx.workflows.renderers import dataframe_to_native
+from panderyx.workflows.result_stores import get_result_store
+from panderyx.workflows.tools.models import Tool
+
+
+@dataclass
+class OutputOptions:
+    """Rows and format of tool outputs returned by a run.
+
+    Attributes:
+        orient (Optional[str]): orient of native JSON structures (see
+            dataframe_to_native) DataFrames are converted into. DataFrames are
+            encoded into JSON strings when not provided.
+        limit (Optional[int]): maximum number of returned rows
+        offset (int): number of rows skipped before the returned rows
+        sample (Optional[int]): number of rows randomly sampled from the output,
+            sampled rows keep their order and are the same in every request
+    """
+
+    orient: typing.Optional[str] = None
+    limit: typing.Optional[int] = None
+    offset: int = 0
+    sample: typing.Optional[int] = None
+
+    def select_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.sample is not None and self.sample < len(df):
+            rng = np.random.default_rng(0)
+            df = df.iloc[np.sort(rng.choice(len(df), self.sample, replace=False))]
+
+        stop = None if self.limit is None else self.offset + self.limit
+        return df.iloc[self.offset : stop]
 
 
 class WorkflowService:
-    def __init__(self, workflow: Workflow) -> None:
+    def __init__(
+        self,
+        workflow: Workflow,
+        executor: typing.Optional[WorkflowExecutor] = None,
+        result_cache: typing.Optional[ResultCache] = None,
+        result_store: typing.Optional[typing.MutableMapping[int, pd.DataFrame]] = None,
+        release_results: typing.Optional[bool] = None,
+        output_rows: typing.Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            workflow (Workflow): workflow to be run
+            executor (Optional[WorkflowExecutor]): executor of the tools, selected
+                with WORKFLOW_EXECUTOR setting when not provided
+            result_cache (Optional[ResultCache]): cache of tool results, selected
+                with WORKFLOW_RESULT_CACHE setting when not provided
+            result_store (Optional[MutableMapping[int, pd.DataFrame]]): store of
+                results of the run, selected with WORKFLOW_RESULT_STORE setting
+                when not provided
+            release_results (Optional[bool]): whether results that are no longer
+                needed are released during the run, WORKFLOW_RELEASE_RESULTS
+                setting is used when not provided
+            output_rows (Optional[int]): number of leading rows of requested
+                results that are going to be returned, tools read only the rows
+                needed for them. All rows are returned when not provided.
+        """
         self.workflow = workflow
-        self.tool_result_dfs = {}
+        self.executor = executor or get_executor()
+        self.result_cache = result_cache or get_result_cache()
+        self.release_results = (
+            settings.WORKFLOW_RELEASE_RESULTS
+            if release_results is None
+            else release_results
+        )
+        self.plan: typing.Optional[ExecutionPlan] = None
+        self.fingerprints: typing.Dict[int, str] = {}
+        self.tool_hints: typing.Dict[int, typing.Dict[str, typing.Any]] = {}
+        self.target_ids: typing.Optional[typing.Set[int]] = None
+        self.output_rows = output_rows
+        self.pending_consumers: typing.Dict[int, int] = {}
+        self.emitted_ids: typing.Set[int] = set()
+        self.saved_metadata: typing.Dict[int, typing.Dict[str, typing.Any]] = {}
+        self.prefetcher: typing.Optional[Prefetcher] = None
+        self.prefetch_urls: typing.Dict[int, typing.List[str]] = {}
+        self.tool_result_dfs = (
+            get_result_store() if result_store is None else result_store
+        )
+
+    def run_workflow(
+        self, target_ids: typing.Optional[typing.Iterable[int]] = None
+    ) -> None:
+        """Runs workflow tools and stores their results.
+
+        Args:
+            target_ids (Optional[Iterable[int]]): IDs of tools whose results are
+                requested, only these tools and their ancestors are run. All tools
+                are run when not provided.
+        """
+        self.execute_plan(self.get_plan(target_ids))
+
+    def get_plan(
+        self, target_ids: typing.Optional[typing.Iterable[int]] = None
+    ) -> ExecutionPlan:
+        """Returns plan of the workflow limited to the target tools and their ancestors.
+
+        Args:
+            target_ids (Optional[Iterable[int]]): IDs of tools whose results are
+                requested. Plan includes all tools when not provided.
 
-    def run_workflow(self) -> None:
+        Raises:
+            WorkflowServiceException: catches workflows without input tools and
+                target tools that are not a part of the workflow
+
+        Returns:
+            ExecutionPlan: plan of the tools to be run
+        """
         try:
-            execution_order = self.workflow.tool_execution_order
+            plan = self.workflow.execution_plan
         except ValueError:
             raise WorkflowServiceException(
                 workflow_id=self.workflow.id,
@@ -20,25 +139,246 @@ class WorkflowService:
                 code="workflow_no_inputs",
             )
 
-        for tool in execution_order:
-            # TODO
-            # below can be replaced with a single DB query using filtering
-            # and then I can loop over the inputs
-            input_ids = tool.inputs.values_list("id", flat=True)
-            # In cases where input order matters it will be handled by proper config fields
-            # that will indicate input IDs and their order (depending on the tool logic)
-            input_dfs = {
-                input_id: self.tool_result_dfs[input_id] for input_id in input_ids
-            }
-
-            tool_service_class = ToolMapping[tool.config["type"]].value["service"]
-            tool_service = tool_service_class(tool=tool)
-            self.tool_result_dfs[tool.id] = tool_service.run_tool(inputs=input_dfs)
-
-    def get_outputs(self) -> typing.List[typing.Dict]:
+        if target_ids is not None:
+            self.target_ids = set(target_ids)
+            missing_ids = self.target_ids - set(plan.tools)
+            if missing_ids:
+                raise WorkflowServiceException(
+                    workflow_id=self.workflow.id,
+                    message=(
+                        "Target tools are not a part of this workflow: "
+                        f"{', '.join(map(str, sorted(missing_ids)))}."
+                    ),
+                    code="workflow_invalid_target",
+                )
+            plan = plan.prune(self.target_ids)
+
+        return plan
+
+    def execute_plan(self, plan: ExecutionPlan) -> None:
+        for _ in self.iter_plan(plan):
+            pass
+
+    def iter_plan(self, plan: ExecutionPlan) -> typing.Iterator[Tool]:
+        """Runs tools from the plan and yields each Tool once its result is stored.
+
+        Tools with cached results are yielded first, before any tool is run.
+        """
+        self.plan = plan
+        self.saved_metadata = {
+            tool_id: copy.deepcopy(tool.metadata)
+            for tool_id, tool in plan.tools.items()
+        }
+        self.tool_hints = self._get_hints()
+        # only tools whose fingerprint has no cached result are run
+        cached_ids = self._load_cached_results()
+        plan = plan.exclude(cached_ids)
+        if self.release_results:
+            self._count_consumers(plan)
+
+        for tool_id in cached_ids:
+            yield self.plan.tools[tool_id]
+
+        self._prefetch(plan)
+        try:
+            yield from self.executor.execute(plan, self)
+        finally:
+            if self.prefetcher is not None:
+                self.prefetcher.close()
+
+    def _prefetch(self, plan: ExecutionPlan) -> None:
+        """Starts downloads of files read by tools of the plan."""
+        self.prefetch_urls = {}
+        for tool in plan.order:
+            urls = get_tool_service(
+                tool, **self.get_tool_hints(tool)
+            ).get_prefetch_urls()
+            if urls:
+                self.prefetch_urls[tool.id] = urls
+        if not self.prefetch_urls:
+            return
+
+        self.prefetcher = get_prefetcher(user_id=self.workflow.user_id)
+        if self.prefetcher is not None:
+            for urls in self.prefetch_urls.values():
+                self.prefetcher.prefetch(urls)
+
+    def wait_for_prefetch(self, tool: Tool) -> None:
+        """Blocks until files of the tool are downloaded, so the tool reads them
+        from the download cache."""
+        if self.prefetcher is not None and tool.id in self.prefetch_urls:
+            self.prefetcher.wait(self.prefetch_urls[tool.id])
+
+    def iter_outputs(
+        self, plan: ExecutionPlan, options: typing.Optional[OutputOptions] = None
+    ) -> typing.Iterator[typing.Dict]:
+        """Runs tools from the plan and yields outputs of requested tools as soon
+        as they are available.
+
+        Results that are not consumed by any of the remaining tools are released
+        right after their output is yielded.
+        """
+        for tool in self.iter_plan(plan):
+            if self.is_output(tool.id):
+                yield self._get_output(tool, options or OutputOptions())
+                self.emitted_ids.add(tool.id)
+                if self.release_results and not self.pending_consumers[tool.id]:
+                    self._release_result(tool.id)
+
+    def _load_cached_results(self) -> typing.List[int]:
+        if self.result_cache is None:
+            return []
+
+        self.fingerprints = self.plan.get_fingerprints(
+            self.tool_hints, self._get_source_versions()
+        )
+        cached_ids = []
+        for tool in self.plan.order:
+            df = self.result_cache.get(self.fingerprints[tool.id])
+            if df is not None:
+                self.tool_result_dfs[tool.id] = df
+                cached_ids.append(tool.id)
+
+        return cached_ids
+
+    def _get_source_versions(self) -> typing.Dict[int, str]:
+        versions = {}
+        for tool in self.plan.order:
+            version = get_tool_service(
+                tool, **self.get_tool_hints(tool)
+            ).get_source_version()
+            if version is not None:
+                versions[tool.id] = version
+        return versions
+
+    def _get_hints(self) -> typing.Dict[int, typing.Dict[str, typing.Any]]:
+        """Returns hints for services of tools whose results are only partially used.
+
+        Results of requested tools are always returned with all of their columns.
+        """
+        output_ids = self.plan.tools if self.target_ids is None else self.target_ids
+        required_columns = self.plan.get_required_columns(output_ids)
+        required_rows = self.plan.get_required_rows(
+            {tool_id: self.output_rows for tool_id in output_ids}
+        )
+
+        hints = {}
+        for tool_id in self.plan.tools:
+            tool_hints = {}
+            if required_columns.get(tool_id) is not None:
+                tool_hints["columns"] = sorted(required_columns[tool_id])
+            if required_rows.get(tool_id) is not None:
+                tool_hints["rows"] = required_rows[tool_id]
+            if tool_hints:
+                hints[tool_id] = tool_hints
+
+        return hints
+
+    def _count_consumers(self, plan: ExecutionPlan) -> None:
+        """Counts tools from the plan that are yet to consume each of the results."""
+        self.pending_consumers = {tool_id: 0 for tool_id in self.plan.tools}
+        for tool in plan.order:
+            for input_id in self.plan.inputs[tool.id]:
+                self.pending_consumers[input_id] += 1
+
+        # cached results that are neither consumed nor returned are not needed
+        for tool_id, count in self.pending_consumers.items():
+            if count == 0:
+                self._release_result(tool_id)
+
+    def is_output(self, tool_id: int) -> bool:
+        return self.target_ids is None or tool_id in self.target_ids
+
+    def _release_result(self, tool_id: int) -> None:
+        is_needed = self.is_output(tool_id) and tool_id not in self.emitted_ids
+        if not is_needed and tool_id in self.tool_result_dfs:
+            del self.tool_result_dfs[tool_id]
+
+    def get_tool_inputs(
+        self, tool: Tool, exclude_ids: typing.Collection[int] = ()
+    ) -> typing.Dict[int, pd.DataFrame]:
+        # In cases where input order matters it will be handled by proper config fields
+        # that will indicate input IDs and their order (depending on the tool logic)
+        return {
+            input_id: self.tool_result_dfs[input_id]
+            for input_id in self.plan.inputs[tool.id]
+            if input_id not in exclude_ids
+        }
+
+    def get_tool_hints(self, tool: Tool) -> typing.Dict[str, typing.Any]:
+        hints = self.tool_hints.get(tool.id, {})
+        if self.prefetcher is not None and tool.id in self.prefetch_urls:
+            # files prefetched by this run are read without another request
+            fresh_urls = self.prefetcher.get_downloaded(self.prefetch_urls[tool.id])
+            if fresh_urls:
+                hints = {**hints, "fresh_urls": fresh_urls}
+        return hints
+
+    def set_tool_result(self, tool: Tool, df: pd.DataFrame) -> None:
+        self.tool_result_dfs[tool.id] = df
+        if self.result_cache is not None:
+            self.result_cache.set(self.fingerprints[tool.id], df)
+
+        self.save_tool_metadata(tool)
+        self.release_tool_inputs(tool)
+
+    def save_tool_metadata(self, tool: Tool) -> None:
+        """Saves metadata recorded by the tool's service during its run.
+
+        Metadata is saved by the service of the workflow, since tools run in worker
+        processes must not access the database.
+        """
+        if tool.metadata != self.saved_metadata.get(tool.id, tool.metadata):
+            Tool.objects.filter(pk=tool.pk).update(metadata=tool.metadata)
+            self.saved_metadata[tool.id] = copy.deepcopy(tool.metadata)
+
+    def release_tool_inputs(self, tool: Tool) -> None:
+        """Releases inputs of the finished tool that are not consumed by other tools."""
+        if self.release_results:
+            for input_id in self.plan.inputs[tool.id]:
+                self.pending_consumers[input_id] -= 1
+                if self.pending_consumers[input_id] == 0:
+                    self._release_result(input_id)
+
+    def get_outputs(
+        self, options: typing.Optional[OutputOptions] = None
+    ) -> typing.List[typing.Dict]:
+        """Returns outputs of requested tools in the execution order.
+
+        Args:
+            options (Optional[OutputOptions]): rows and format of the outputs,
+                all rows are encoded into JSON strings when not provided
+
+        Returns:
+            List[Dict]: tool IDs and their data
+        """
+        # outputs follow the execution order, since pool executors store
+        # results in the order of their completion
         json_output = [
-            {"tool_id": tool_id, "data": tool.to_json()}
-            for tool_id, tool in self.tool_result_dfs.items()
+            self._get_output(tool, options or OutputOptions())
+            for tool in self.plan.order
+            if tool.id in self.tool_result_dfs and self.is_output(tool.id)
         ]
 
         return json_output
+
+    def _get_output(self, tool: Tool, options: OutputOptions) -> typing.Dict:
+        df = self.tool_result_dfs[tool.id]
+        rows = options.select_rows(df)
+        if options.orient is None:
+            data = rows.to_json()
+        else:
+            data = dataframe_to_native(rows, options.orient)
+
+        total_rows = len(df)
+        if self.output_rows is not None and total_rows >= self.output_rows:
+            # result could have been cut short by the row limit
+            total_rows = None
+
+        return {"tool_id": tool.id, "data": data, "total_rows": total_rows}
+
+    def close(self) -> None:
+        """Releases results of the run, e.g. files of results spilled to disk."""
+        close = getattr(self.tool_result_dfs, "close", None)
+        if close is not None:
+            close()
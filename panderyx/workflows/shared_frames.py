@@ -0,0 +1,110 @@
+import pickle
+import typing
+from dataclasses import dataclass, field
+from multiprocessing.shared_memory import SharedMemory
+
+import pandas as pd
+
+
+@dataclass
+class SharedDataFrame:
+    """Picklable handle of a DataFrame whose data buffers are placed in shared memory.
+
+    DataFrame is pickled with protocol 5, so contiguous numeric column blocks are
+    stored out-of-band in shared memory blocks. Object columns (e.g. strings) have
+    no out-of-band representation and are pickled in full into the payload.
+
+    Attributes:
+        payload (bytes): in-band part of the pickled DataFrame
+        blocks (List[Tuple[str, int]]): names and sizes of shared memory blocks
+    """
+
+    payload: bytes
+    blocks: typing.List[typing.Tuple[str, int]] = field(default_factory=list)
+
+
+def share_dataframe(
+    df: pd.DataFrame,
+) -> typing.Tuple[SharedDataFrame, typing.List[SharedMemory]]:
+    """Copies DataFrame buffers into new shared memory blocks.
+
+    Args:
+        df (pd.DataFrame): DataFrame to be shared
+
+    Returns:
+        Tuple[SharedDataFrame, List[SharedMemory]]: handle to be sent to other process
+        and created blocks that are to be released by their owner
+    """
+    buffers = []
+    payload = pickle.dumps(df, protocol=5, buffer_callback=buffers.append)
+
+    shared_df = SharedDataFrame(payload=payload)
+    segments = []
+    try:
+        for buffer in buffers:
+            raw = buffer.raw()
+            # shared memory blocks cannot be empty
+            segment = SharedMemory(create=True, size=max(raw.nbytes, 1))
+            segments.append(segment)
+            segment.buf[: raw.nbytes] = raw
+            shared_df.blocks.append((segment.name, raw.nbytes))
+    except Exception:
+        release_segments(segments, unlink=True)
+        raise
+
+    return shared_df, segments
+
+
+def attach_dataframe(
+    shared_df: SharedDataFrame,
+) -> typing.Tuple[pd.DataFrame, typing.List[SharedMemory]]:
+    """Rebuilds DataFrame on top of shared memory blocks without copying its buffers.
+
+    Returned DataFrame is valid only as long as returned blocks stay open.
+
+    Args:
+        shared_df (SharedDataFrame): handle of the shared DataFrame
+
+    Returns:
+        Tuple[pd.DataFrame, List[SharedMemory]]: DataFrame and attached blocks
+    """
+    segments = [SharedMemory(name=name) for name, _ in shared_df.blocks]
+    buffers = [
+        segment.buf[:size] for segment, (_, size) in zip(segments, shared_df.blocks)
+    ]
+    df = pickle.loads(shared_df.payload, buffers=buffers)
+
+    return df, segments
+
+
+def load_dataframe(shared_df: SharedDataFrame) -> pd.DataFrame:
+    """Copies shared DataFrame into the memory of current process and releases its blocks."""
+    segments = [SharedMemory(name=name) for name, _ in shared_df.blocks]
+    try:
+        buffers = [
+            bytearray(segment.buf[:size])
+            for segment, (_, size) in zip(segments, shared_df.blocks)
+        ]
+    finally:
+        release_segments(segments, unlink=True)
+
+    return pickle.loads(shared_df.payload, buffers=buffers)
+
+
+def discard_dataframe(shared_df: SharedDataFrame) -> None:
+    """Removes blocks of a shared DataFrame that is not going to be loaded."""
+    segments = [SharedMemory(name=name) for name, _ in shared_df.blocks]
+    release_segments(segments, unlink=True)
+
+
+def release_segments(segments: typing.List[SharedMemory], unlink: bool = False) -> None:
+    """Closes shared memory blocks and optionally removes them from the system."""
+    for segment in segments:
+        try:
+            segment.close()
+        except BufferError:
+            # some DataFrame still points to the block, its mapping is
+            # released together with the process
+            pass
+        if unlink:
+            segment.unlink()
@@ -1,4 +1,5 @@
 import factory
+from django.core.files.base import ContentFile
 
 from panderyx.users.test.factories import UserFactory
 
@@ -13,3 +14,22 @@ class WorkflowFactory(factory.django.DjangoModelFactory):
 
     user = factory.SubFactory(UserFactory)
     name = factory.Sequence(lambda n: f"workflow{n}")
+
+
+class UploadFactory(factory.django.DjangoModelFactory):
+    """Completed upload of the data file."""
+
+    class Meta:
+        model = "workflows.Upload"
+
+    class Params:
+        data = b"a,b\n1,x\n2,y\n"
+
+    user = factory.SubFactory(UserFactory)
+    filename = "data.csv"
+    size = factory.LazyAttribute(lambda upload: len(upload.data))
+    offset = factory.SelfAttribute("size")
+    file = factory.LazyAttribute(
+        lambda upload: ContentFile(upload.data, name=upload.filename)
+    )
+    status = "completed"
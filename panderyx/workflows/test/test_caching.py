@@ -0,0 +1,347 @@
+import os
+import threading
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.error import HTTPError
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from panderyx.workflows import executors
+from panderyx.workflows.caching import DownloadCache, LRUResultCache, Prefetcher
+from panderyx.workflows.executors import SerialExecutor
+from panderyx.workflows.fetching import FetchBudget
+from panderyx.workflows.services import WorkflowService
+from panderyx.workflows.test.factories import WorkflowFactory
+from panderyx.workflows.tools.dtos.input_tools import InputUrlConfig
+from panderyx.workflows.tools.dtos.preview_tools import DescribeDataConfig
+from panderyx.workflows.tools.helpers import DataTypes
+from panderyx.workflows.tools.services.input_tools import InputUrlService
+from panderyx.workflows.tools.test.factories import ToolFactory
+
+
+@pytest.mark.django_db()
+class TestIncrementalExecution:
+    @pytest.fixture()
+    def setUp(self, test_dataset_path) -> None:
+        # input_tool -> describe_tool_1 -> describe_tool_2
+        #           \
+        #            describe_tool_3
+        self.workflow = WorkflowFactory()
+        self.input_tool = ToolFactory(
+            config=asdict(InputUrlConfig(url=test_dataset_path)),
+            workflow=self.workflow,
+        )
+        self.describe_tool_1 = ToolFactory(
+            config=asdict(DescribeDataConfig()), workflow=self.workflow
+        )
+        self.describe_tool_2 = ToolFactory(
+            config=asdict(DescribeDataConfig(data_type=DataTypes.ALL.value)),
+            workflow=self.workflow,
+        )
+        self.describe_tool_3 = ToolFactory(
+            config=asdict(DescribeDataConfig(data_type=DataTypes.OBJECT.value)),
+            workflow=self.workflow,
+        )
+        self.describe_tool_1.inputs.add(self.input_tool)
+        self.describe_tool_2.inputs.add(self.describe_tool_1)
+        self.describe_tool_3.inputs.add(self.input_tool)
+
+    def run_workflow(self):
+        service = WorkflowService(self.workflow, executor=SerialExecutor())
+        with mock.patch.object(
+            executors, "run_tool", wraps=executors.run_tool
+        ) as run_tool:
+            service.run_workflow()
+
+        return service, [call.args[0].id for call in run_tool.call_args_list]
+
+    def test_fingerprints_change_with_upstream_config(self, setUp):
+        fingerprints = self.workflow.execution_plan.get_fingerprints()
+        self.describe_tool_1.config["data_type"] = DataTypes.ALL.value
+        self.describe_tool_1.save()
+        new_fingerprints = self.workflow.execution_plan.get_fingerprints()
+
+        assert fingerprints[self.input_tool.id] == new_fingerprints[self.input_tool.id]
+        assert (
+            fingerprints[self.describe_tool_3.id]
+            == new_fingerprints[self.describe_tool_3.id]
+        )
+        assert (
+            fingerprints[self.describe_tool_1.id]
+            != new_fingerprints[self.describe_tool_1.id]
+        )
+        assert (
+            fingerprints[self.describe_tool_2.id]
+            != new_fingerprints[self.describe_tool_2.id]
+        )
+
+    def test_unchanged_tools_are_not_run_again(self, setUp):
+        service, run_ids = self.run_workflow()
+        cached_service, cached_run_ids = self.run_workflow()
+
+        assert len(run_ids) == 4
+        assert cached_run_ids == []
+        for tool_id, df in service.tool_result_dfs.items():
+            assert df.equals(cached_service.tool_result_dfs[tool_id])
+
+    def test_only_edited_tool_and_its_outputs_are_run_again(self, setUp):
+        self.run_workflow()
+        self.describe_tool_1.config["data_type"] = DataTypes.ALL.value
+        self.describe_tool_1.save()
+
+        service, run_ids = self.run_workflow()
+
+        assert run_ids == [self.describe_tool_1.id, self.describe_tool_2.id]
+        assert len(service.get_outputs()) == 4
+
+    def test_changed_input_file_is_read_again(self, setUp):
+        service, _ = self.run_workflow()
+        rows = len(service.tool_result_dfs[self.input_tool.id])
+        with open(self.input_tool.config["url"], "a") as file:
+            file.write("\nSpain,ESP,Europe,30,31,32")
+
+        service, run_ids = self.run_workflow()
+
+        # results of the file and of all its downstream tools are refreshed
+        assert len(run_ids) == 4
+        assert len(service.tool_result_dfs[self.input_tool.id]) == rows + 1
+
+    def test_results_are_not_reused_without_cache(self, setUp, settings):
+        settings.WORKFLOW_RESULT_CACHE = ""
+        self.run_workflow()
+
+        _, run_ids = self.run_workflow()
+
+        assert len(run_ids) == 4
+
+
+def make_df(rows):
+    return pd.DataFrame({"values": np.arange(rows, dtype="int64")})
+
+
+class TestLRUResultCache:
+    def test_hit_and_miss_counters(self):
+        cache = LRUResultCache(max_bytes=10_000)
+        df = make_df(10)
+        cache.set("a", df)
+
+        assert cache.get("a") is df
+        assert cache.get("b") is None
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+
+    def test_eviction_by_memory_usage(self):
+        df_size = int(make_df(100).memory_usage(deep=True).sum())
+        cache = LRUResultCache(max_bytes=df_size * 2)
+        cache.set("a", make_df(100))
+        cache.set("b", make_df(100))
+        # "a" becomes the most recently used entry
+        cache.get("a")
+        cache.set("c", make_df(100))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.stats["evictions"] == 1
+        assert cache.stats["size"] == df_size * 2
+
+    def test_expired_result_is_not_returned(self):
+        cache = LRUResultCache(max_bytes=10_000, timeout=300)
+        with mock.patch("panderyx.workflows.caching.time.monotonic", return_value=0):
+            cache.set("a", make_df(10))
+        with mock.patch("panderyx.workflows.caching.time.monotonic", return_value=299):
+            assert cache.get("a") is not None
+        with mock.patch("panderyx.workflows.caching.time.monotonic", return_value=300):
+            assert cache.get("a") is None
+
+        assert cache.stats["expirations"] == 1
+        assert cache.stats["entries"] == 0
+        assert cache.stats["size"] == 0
+
+    def test_result_larger_than_budget_is_not_cached(self):
+        cache = LRUResultCache(max_bytes=10)
+        cache.set("a", make_df(100))
+
+        assert cache.get("a") is None
+        assert cache.stats["entries"] == 0
+        assert cache.stats["evictions"] == 0
+
+
+class FileHandler(BaseHTTPRequestHandler):
+    """Serves server's files with ETag or Last-Modified validators."""
+
+    def do_GET(self):
+        status, body, headers = self.server.files.get(self.path, (404, b"", {}))
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        if status == 200 and (
+            (etag and self.headers.get("If-None-Match") == etag)
+            or (
+                last_modified and self.headers.get("If-Modified-Since") == last_modified
+            )
+        ):
+            status, body = 304, b""
+        elif status == 200 and self.server.barrier is not None:
+            # downloads of all files have to be in progress at the same time
+            self.server.barrier.wait(timeout=5)
+        self.server.statuses.append(status)
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.mark.django_db()
+class TestDownloadCache:
+    @pytest.fixture()
+    def setUp(self, tmp_path):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FileHandler)
+        self.server.files, self.server.statuses = {}, []
+        self.server.barrier = None
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.directory = str(tmp_path / "cache")
+        yield
+        self.server.shutdown()
+        self.server.server_close()
+
+    def add_file(self, path, body, **headers):
+        self.server.files[path] = (200, body, headers)
+        return f"{self.url}{path}"
+
+    def read(self, cache, url):
+        with cache.open(url) as file:
+            return file.read()
+
+    @pytest.mark.parametrize(
+        "headers",
+        [{"ETag": '"v1"'}, {"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}],
+    )
+    def test_unchanged_file_is_revalidated(self, setUp, headers):
+        url = self.add_file("/data.csv", b"a,b\n1,2\n", **headers)
+        cache = DownloadCache(self.directory, max_bytes=1024)
+
+        assert self.read(cache, url) == b"a,b\n1,2\n"
+        assert self.read(cache, url) == b"a,b\n1,2\n"
+        assert self.server.statuses == [200, 304]
+
+    def test_fresh_file_is_not_revalidated(self, setUp):
+        url = self.add_file("/data.csv", b"a\n1\n", ETag='"v1"')
+        cache = DownloadCache(self.directory, max_bytes=1024)
+        self.read(cache, url)
+
+        with cache.open(url, revalidate=False) as file:
+            assert file.read() == b"a\n1\n"
+        assert self.server.statuses == [200]
+
+    def test_changed_file_is_downloaded(self, setUp):
+        url = self.add_file("/data.csv", b"a\n1\n", ETag='"v1"')
+        cache = DownloadCache(self.directory, max_bytes=1024)
+        self.read(cache, url)
+        self.add_file("/data.csv", b"a\n2\n", ETag='"v2"')
+
+        assert self.read(cache, url) == b"a\n2\n"
+        assert self.server.statuses == [200, 200]
+
+    def test_least_recently_used_file_is_evicted(self, setUp):
+        urls = [
+            self.add_file(f"/{name}.csv", b"x" * 400, ETag=f'"{name}"')
+            for name in ("first", "second", "third")
+        ]
+        cache = DownloadCache(self.directory, max_bytes=1000)
+        self.read(cache, urls[0])
+        self.read(cache, urls[1])
+        # second file is marked as the least recently used one
+        os.utime(cache._get_paths(urls[1])[0], (0, 0))
+        self.read(cache, urls[2])
+
+        assert urls[0] in cache
+        assert urls[1] not in cache
+        assert urls[2] in cache
+
+    def test_missing_file(self, setUp):
+        cache = DownloadCache(self.directory, max_bytes=1024)
+
+        with pytest.raises(HTTPError):
+            self.read(cache, f"{self.url}/missing.csv")
+
+        assert f"{self.url}/missing.csv" not in cache
+
+    def test_input_url_uses_cache(self, setUp, settings):
+        settings.WORKFLOW_DOWNLOAD_CACHE_DIR = self.directory
+        url = self.add_file("/data.csv", b"a,b\n1,2\n3,4\n", ETag='"v1"')
+        tool = ToolFactory.build(config=asdict(InputUrlConfig(url=url)))
+
+        for _ in range(2):
+            df = InputUrlService(tool).run_tool({})
+
+        assert df.equals(pd.DataFrame({"a": [1, 3], "b": [2, 4]}))
+        assert self.server.statuses == [200, 304]
+
+    def test_prefetched_files_are_cached(self, setUp):
+        urls = [self.add_file(f"/{name}.csv", b"a\n1\n") for name in ("a", "b")]
+        prefetcher = Prefetcher(DownloadCache(self.directory, max_bytes=1024), 2)
+
+        prefetcher.prefetch(urls)
+        prefetcher.wait(urls)
+        prefetcher.close()
+
+        assert all(url in prefetcher.download_cache for url in urls)
+
+    def test_failed_prefetch_is_ignored(self, setUp):
+        url = f"{self.url}/missing.csv"
+        prefetcher = Prefetcher(DownloadCache(self.directory, max_bytes=1024), 2)
+
+        prefetcher.prefetch([url])
+        prefetcher.wait([url])
+        prefetcher.close()
+
+        assert url not in prefetcher.download_cache
+
+    def test_inputs_of_run_are_downloaded_concurrently(self, setUp, settings):
+        settings.WORKFLOW_DOWNLOAD_CACHE_DIR = self.directory
+        self.server.barrier = threading.Barrier(2)
+        workflow = WorkflowFactory()
+        input_tools = [
+            ToolFactory(
+                config=asdict(
+                    InputUrlConfig(url=self.add_file(path, b"a\n1\n", ETag='"v1"'))
+                ),
+                workflow=workflow,
+            )
+            for path in ("/first.csv", "/second.csv")
+        ]
+
+        service = WorkflowService(workflow, executor=SerialExecutor())
+        service.run_workflow()
+
+        # prefetched files are read without another request
+        assert self.server.statuses == [200, 200]
+        for tool in input_tools:
+            assert service.tool_result_dfs[tool.id].equals(pd.DataFrame({"a": [1]}))
+
+    def test_prefetched_files_without_validators_are_downloaded_once(
+        self, setUp, settings
+    ):
+        settings.WORKFLOW_DOWNLOAD_CACHE_DIR = self.directory
+        settings.WORKFLOW_USER_FETCH_MAX_BYTES = 1024
+        workflow = WorkflowFactory()
+        for path in ("/first.csv", "/second.csv"):
+            ToolFactory(
+                config=asdict(InputUrlConfig(url=self.add_file(path, b"a\n1\n"))),
+                workflow=workflow,
+            )
+
+        WorkflowService(workflow, executor=SerialExecutor()).run_workflow()
+
+        assert self.server.statuses == [200, 200]
+        used_bytes, _ = FetchBudget.from_settings(workflow.user_id)._get_user_usage()
+        assert used_bytes == 2 * len(b"a\n1\n")
@@ -0,0 +1,338 @@
+import os
+import threading
+from dataclasses import asdict
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from panderyx.test_helpers.data_sets import test_dataset
+from panderyx.workflows.exceptions import MissingToolInput, ToolServiceException
+from panderyx.workflows.executors import (
+    ChunkedExecutor,
+    ProcessPoolWorkflowExecutor,
+    SerialExecutor,
+    ThreadPoolWorkflowExecutor,
+)
+from panderyx.workflows.services import WorkflowService
+from panderyx.workflows.shared_frames import (
+    load_dataframe,
+    release_segments,
+    share_dataframe,
+)
+from panderyx.workflows.test.factories import WorkflowFactory
+from panderyx.workflows.tools.dtos.input_tools import InputUrlConfig
+from panderyx.workflows.tools.dtos.preview_tools import DescribeDataConfig
+from panderyx.workflows.tools.dtos.transform_tools import (
+    HeadConfig,
+    SelectColumnsConfig,
+)
+from panderyx.workflows.tools.helpers import DataTypes
+from panderyx.workflows.tools.test.factories import ToolFactory
+
+
+@pytest.mark.django_db()
+class TestThreadPoolWorkflowExecutor:
+    @pytest.fixture()
+    def setUp(self) -> None:
+        self.workflow = WorkflowFactory()
+
+    def test_results_match_serial_executor(self, setUp, test_dataset_path):
+        # input_1 -> describe_1
+        # input_2 -> describe_2
+        for _ in range(2):
+            input_tool = ToolFactory(
+                config=asdict(InputUrlConfig(url=test_dataset_path)),
+                workflow=self.workflow,
+            )
+            describe_tool = ToolFactory(
+                config=asdict(DescribeDataConfig()), workflow=self.workflow
+            )
+            describe_tool.inputs.add(input_tool)
+
+        serial_service = WorkflowService(self.workflow, executor=SerialExecutor())
+        serial_service.run_workflow()
+        thread_service = WorkflowService(
+            self.workflow, executor=ThreadPoolWorkflowExecutor(max_workers=4)
+        )
+        thread_service.run_workflow()
+
+        assert (
+            serial_service.tool_result_dfs.keys()
+            == thread_service.tool_result_dfs.keys()
+        )
+        for tool_id, df in serial_service.tool_result_dfs.items():
+            assert df.equals(thread_service.tool_result_dfs[tool_id])
+
+    def test_independent_tools_run_concurrently(self, setUp):
+        # tool_1, tool_2 and tool_3 can only pass the barrier together
+        tools = ToolFactory.create_batch(3, workflow=self.workflow)
+        barrier = threading.Barrier(len(tools), timeout=5)
+
+        def run_tool(tool, inputs):
+            barrier.wait()
+            return pd.DataFrame({"tool": [tool.id]})
+
+        service = WorkflowService(
+            self.workflow, executor=ThreadPoolWorkflowExecutor(max_workers=3)
+        )
+        with mock.patch("panderyx.workflows.executors.run_tool", run_tool):
+            service.run_workflow()
+
+        assert set(service.tool_result_dfs) == set(tool.id for tool in tools)
+
+    def test_dependent_tools_wait_for_inputs(self, setUp):
+        # tool_1 -> tool_2 -> tool_3
+        tool_1 = ToolFactory(workflow=self.workflow)
+        tool_2 = ToolFactory(workflow=self.workflow)
+        tool_3 = ToolFactory(workflow=self.workflow)
+        tool_2.inputs.add(tool_1)
+        tool_3.inputs.add(tool_2)
+
+        def run_tool(tool, inputs):
+            return pd.DataFrame({"tool": [tool.id]})
+
+        service = WorkflowService(
+            self.workflow, executor=ThreadPoolWorkflowExecutor(max_workers=3)
+        )
+        with mock.patch("panderyx.workflows.executors.run_tool", run_tool):
+            service.run_workflow()
+
+        assert list(service.tool_result_dfs) == [tool_1.id, tool_2.id, tool_3.id]
+
+    def test_tool_error_is_raised(self, setUp):
+        ToolFactory(config=asdict(DescribeDataConfig()), workflow=self.workflow)
+        service = WorkflowService(
+            self.workflow, executor=ThreadPoolWorkflowExecutor(max_workers=2)
+        )
+
+        with pytest.raises(MissingToolInput):
+            service.run_workflow()
+
+    def test_outputs_follow_execution_order(self, setUp):
+        # tool_1 -> tool_3
+        # tool_2 (finishes first)
+        tool_1 = ToolFactory(workflow=self.workflow)
+        tool_2 = ToolFactory(workflow=self.workflow)
+        tool_3 = ToolFactory(workflow=self.workflow)
+        tool_3.inputs.add(tool_1)
+        tool_2_finished = threading.Event()
+
+        def run_tool(tool, inputs):
+            # tool_1 waits for tool_2 only when they run concurrently, tools run
+            # by the serial executor would wait for a tool that runs after them
+            if tool.id == tool_1.id and threading.current_thread() is not main:
+                tool_2_finished.wait(timeout=5)
+            elif tool.id == tool_2.id:
+                tool_2_finished.set()
+            return pd.DataFrame({"tool": [tool.id]})
+
+        main = threading.main_thread()
+        outputs = []
+        for executor in (SerialExecutor(), ThreadPoolWorkflowExecutor(max_workers=3)):
+            service = WorkflowService(self.workflow, executor=executor)
+            with mock.patch("panderyx.workflows.executors.run_tool", run_tool):
+                service.run_workflow()
+            outputs.append([output["tool_id"] for output in service.get_outputs()])
+        assert tool_2_finished.is_set()
+
+        assert outputs[0] == outputs[1]
+        assert outputs[0] == [tool.id for tool in self.workflow.tool_execution_order]
+
+
+@pytest.mark.django_db()
+class TestChunkedExecutor:
+    @pytest.fixture()
+    def setUp(self, tmp_path, settings) -> None:
+        # results of previous runs would be reused instead of running the tools
+        settings.WORKFLOW_RESULT_CACHE = None
+        self.workflow = WorkflowFactory()
+        self.path = tmp_path / "dataset.csv"
+        self.path.write_text(test_dataset)
+        self.input_tool = ToolFactory(
+            config=asdict(InputUrlConfig(url=str(self.path))),
+            workflow=self.workflow,
+        )
+
+    def add_tool(self, config, input_tool):
+        tool = ToolFactory(config=asdict(config), workflow=self.workflow)
+        tool.inputs.add(input_tool)
+        return tool
+
+    def run_workflow(self, executor, target_ids=None):
+        service = WorkflowService(
+            self.workflow, executor=executor, release_results=False
+        )
+        service.run_workflow(target_ids)
+        return service
+
+    def test_results_match_serial_executor(self, setUp):
+        # input -> select_columns -> head
+        #              #       describe
+        select_tool = self.add_tool(
+            SelectColumnsConfig(columns=["Country Code", "2020"]), self.input_tool
+        )
+        self.add_tool(HeadConfig(rows=3), select_tool)
+        self.add_tool(DescribeDataConfig(), self.input_tool)
+
+        serial_service = self.run_workflow(SerialExecutor())
+        chunked_service = self.run_workflow(ChunkedExecutor(chunk_rows=2))
+
+        # select_columns is fused with head, since no target tools are requested
+        assert chunked_service.tool_result_dfs.keys() == (
+            serial_service.tool_result_dfs.keys() - {select_tool.id}
+        )
+        for tool_id, df in chunked_service.tool_result_dfs.items():
+            assert df.equals(serial_service.tool_result_dfs[tool_id])
+
+    def test_outputs_of_sink_tools_without_targets(self, setUp):
+        # input -> select_columns -> head
+        select_tool = self.add_tool(
+            SelectColumnsConfig(columns=["Country Code", "2020"]), self.input_tool
+        )
+        head_tool = self.add_tool(HeadConfig(rows=3), select_tool)
+
+        service = self.run_workflow(ChunkedExecutor(chunk_rows=2))
+
+        assert [output["tool_id"] for output in service.get_outputs()] == [head_tool.id]
+
+    def test_fused_results_are_not_stored(self, setUp):
+        # input -> select_columns -> head (target)
+        select_tool = self.add_tool(
+            SelectColumnsConfig(columns=["Country Code", "2020"]), self.input_tool
+        )
+        head_tool = self.add_tool(HeadConfig(rows=3), select_tool)
+
+        service = self.run_workflow(
+            ChunkedExecutor(chunk_rows=2), target_ids=[head_tool.id]
+        )
+
+        assert list(service.tool_result_dfs) == [head_tool.id]
+        expected_df = pd.read_csv(self.path, usecols=["Country Code", "2020"]).head(3)
+        assert service.tool_result_dfs[head_tool.id].equals(expected_df)
+
+    def test_tool_without_chunks_gets_whole_input(self, setUp):
+        # input -> describe (target)
+        describe_tool = self.add_tool(
+            DescribeDataConfig(data_type=DataTypes.ALL.value), self.input_tool
+        )
+        received_inputs = []
+
+        def run_tool(service, inputs):
+            received_inputs.append(inputs)
+            return pd.DataFrame()
+
+        with mock.patch(
+            "panderyx.workflows.tools.services.preview_tools.DescribeDataService"
+            ".run_tool",
+            autospec=True,
+            side_effect=run_tool,
+        ):
+            self.run_workflow(
+                ChunkedExecutor(chunk_rows=2), target_ids=[describe_tool.id]
+            )
+
+        assert received_inputs[0][self.input_tool.id].equals(pd.read_csv(self.path))
+
+
+def get_shared_memory_blocks():
+    return set(name for name in os.listdir("/dev/shm") if name.startswith("psm_"))
+
+
+@pytest.mark.django_db()
+class TestProcessPoolWorkflowExecutor:
+    @pytest.fixture()
+    def setUp(self, tmp_path) -> None:
+        self.workflow = WorkflowFactory()
+        # fake file system is not visible to worker processes
+        self.path = tmp_path / "dataset.csv"
+        self.path.write_text(test_dataset)
+        self.input_tool = ToolFactory(
+            config=asdict(InputUrlConfig(url=str(self.path))),
+            workflow=self.workflow,
+        )
+
+    def add_describe_tool(self, data_type):
+        describe_tool = ToolFactory(
+            config=asdict(DescribeDataConfig(data_type=data_type)),
+            workflow=self.workflow,
+        )
+        describe_tool.inputs.add(self.input_tool)
+        return describe_tool
+
+    def test_results_match_serial_executor(self, setUp):
+        # input -> describe_1
+        #      \
+        #       describe_2
+        self.add_describe_tool(DataTypes.ALL.value)
+        self.add_describe_tool(DataTypes.NUMERIC.value)
+
+        serial_service = WorkflowService(self.workflow, executor=SerialExecutor())
+        serial_service.run_workflow()
+        process_service = WorkflowService(
+            self.workflow, executor=ProcessPoolWorkflowExecutor(max_workers=2)
+        )
+        process_service.run_workflow()
+
+        serial_outputs = serial_service.tool_result_dfs
+        process_outputs = process_service.tool_result_dfs
+        assert serial_outputs.keys() == process_outputs.keys()
+        for tool_id, df in serial_outputs.items():
+            assert df.equals(process_outputs[tool_id])
+
+    def test_metadata_of_worker_tools_is_saved(self, setUp):
+        service = WorkflowService(
+            self.workflow, executor=ProcessPoolWorkflowExecutor(max_workers=2)
+        )
+        service.run_workflow()
+
+        self.input_tool.refresh_from_db()
+        assert self.input_tool.metadata["schema"]["source"] == str(self.path)
+
+    def test_tool_error_is_raised(self, setUp):
+        tool = ToolFactory(config=asdict(DescribeDataConfig()), workflow=self.workflow)
+        service = WorkflowService(
+            self.workflow, executor=ProcessPoolWorkflowExecutor(max_workers=2)
+        )
+
+        with pytest.raises(MissingToolInput) as exc:
+            service.run_workflow()
+
+        assert exc.value.tool_id == tool.id
+
+    def test_failed_branch_does_not_leave_shared_memory(self, setUp):
+        # input -> describe (fails)
+        #      \
+        #       describe (x3)
+        self.add_describe_tool(DataTypes.CATEGORY.value)
+        for _ in range(3):
+            self.add_describe_tool(DataTypes.ALL.value)
+        blocks = get_shared_memory_blocks()
+        service = WorkflowService(
+            self.workflow, executor=ProcessPoolWorkflowExecutor(max_workers=4)
+        )
+
+        with pytest.raises(ToolServiceException):
+            service.run_workflow()
+
+        assert get_shared_memory_blocks() == blocks
+
+
+class TestSharedFrames:
+    def test_dataframe_round_trip(self):
+        df = pd.DataFrame(
+            {
+                "integers": range(1000),
+                "floats": [i / 3 for i in range(1000)],
+                "strings": [str(i) for i in range(1000)],
+            }
+        )
+
+        shared_df, segments = share_dataframe(df)
+        release_segments(segments)
+
+        assert shared_df.blocks
+        assert load_dataframe(shared_df).equals(df)
+        assert not get_shared_memory_blocks() & set(
+            name.lstrip("/") for name, _ in shared_df.blocks
+        )
@@ -0,0 +1,194 @@
+import threading
+import time
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pandas as pd
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from panderyx.workflows import executors
+from panderyx.workflows.caching import DownloadCache
+from panderyx.workflows.exceptions import ToolServiceException
+from panderyx.workflows.executors import ProcessPoolWorkflowExecutor
+from panderyx.workflows.fetching import FetchBudget, FetchBudgetExceeded, fetch
+from panderyx.workflows.services import WorkflowService
+from panderyx.workflows.test.factories import WorkflowFactory
+from panderyx.workflows.tools.dtos.input_tools import InputUrlConfig
+from panderyx.workflows.tools.services.input_tools import InputUrlService
+from panderyx.workflows.tools.test.factories import ToolFactory
+
+
+class BodyHandler(BaseHTTPRequestHandler):
+    """Serves bodies in parts, with or without Content-Length and with a delay
+    before every part."""
+
+    protocol_version = "HTTP/1.0"
+
+    def do_GET(self):
+        parts, content_length, delay = self.server.bodies[self.path]
+        self.send_response(200)
+        if content_length:
+            self.send_header("Content-Length", str(sum(map(len, parts))))
+        self.end_headers()
+        try:
+            for part in parts:
+                time.sleep(delay)
+                self.wfile.write(part)
+                self.wfile.flush()
+                self.server.sent_bytes += len(part)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.mark.django_db()
+class TestFetch:
+    @pytest.fixture()
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), BodyHandler)
+        self.server.bodies, self.server.sent_bytes = {}, 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        yield
+        self.server.shutdown()
+        self.server.server_close()
+
+    def add_body(self, path, parts, content_length=True, delay=0.0):
+        self.server.bodies[path] = (parts, content_length, delay)
+        return f"{self.url}{path}"
+
+    def read(self, url, budget):
+        with fetch(url, budget) as body:
+            return body.read()
+
+    def test_body_within_budget(self, setUp):
+        url = self.add_body("/data.csv", [b"a,b\n", b"1,2\n"], content_length=False)
+
+        assert self.read(url, FetchBudget(max_bytes=8, timeout=5)) == b"a,b\n1,2\n"
+
+    def test_body_with_too_large_content_length_is_not_downloaded(self, setUp):
+        url = self.add_body("/data.csv", [b"x" * 1024] * 64, delay=0.01)
+
+        with pytest.raises(FetchBudgetExceeded):
+            self.read(url, FetchBudget(max_bytes=1024))
+
+        assert self.server.sent_bytes < 64 * 1024
+
+    def test_too_large_body_is_aborted(self, setUp):
+        url = self.add_body("/data.csv", [b"x" * 1024] * 4, content_length=False)
+
+        with pytest.raises(FetchBudgetExceeded, match="limit of 3000 bytes"):
+            self.read(url, FetchBudget(max_bytes=3000))
+
+    def test_slow_body_is_aborted(self, setUp):
+        url = self.add_body("/data.csv", [b"x"] * 20, delay=0.05)
+
+        with pytest.raises(FetchBudgetExceeded, match="timed out"):
+            self.read(url, FetchBudget(timeout=0.3))
+
+    def test_user_budget_is_shared_by_downloads(self, setUp):
+        url = self.add_body("/data.csv", [b"x" * 600])
+        small_url = self.add_body("/small.csv", [b"x" * 400])
+        budget = FetchBudget(user_id=1, user_max_bytes=1000)
+
+        self.read(url, budget)
+        # second download exceeds bytes left for the user
+        with pytest.raises(FetchBudgetExceeded):
+            self.read(url, budget)
+        self.read(small_url, budget)
+        with pytest.raises(FetchBudgetExceeded, match="User has exceeded"):
+            self.read(small_url, budget)
+
+        # budgets of other users are not affected
+        assert self.read(url, FetchBudget(user_id=2, user_max_bytes=1000))
+
+    def test_user_budget_is_shared_by_worker_processes(self, setUp, settings):
+        # files are downloaded by input tools instead of the prefetcher
+        settings.WORKFLOW_PREFETCH_WORKERS = 0
+        workflow = WorkflowFactory()
+        for path in ("/first.csv", "/second.csv"):
+            ToolFactory(
+                config=asdict(InputUrlConfig(url=self.add_body(path, [b"a\n1\n"]))),
+                workflow=workflow,
+            )
+
+        # workers forked by other tests use caches from their settings
+        with mock.patch.dict(executors._process_pools, clear=True):
+            try:
+                WorkflowService(
+                    workflow, executor=ProcessPoolWorkflowExecutor(max_workers=2)
+                ).run_workflow()
+            finally:
+                for pool in executors._process_pools.values():
+                    pool.shutdown()
+
+        used_bytes, _ = FetchBudget.from_settings(workflow.user_id)._get_user_usage()
+        assert used_bytes == 2 * len(b"a\n1\n")
+
+    def test_process_executor_requires_shared_cache(self, settings):
+        settings.CACHES = {
+            **settings.CACHES,
+            "workflow_fetch": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+            },
+        }
+
+        with pytest.raises(ImproperlyConfigured):
+            ProcessPoolWorkflowExecutor()
+
+        settings.WORKFLOW_USER_FETCH_MAX_BYTES = 0
+        settings.WORKFLOW_USER_FETCH_MAX_SECONDS = 0
+        ProcessPoolWorkflowExecutor()
+
+    def test_aborted_download_is_not_cached(self, setUp, tmp_path):
+        url = self.add_body("/data.csv", [b"x" * 1024] * 4, content_length=False)
+        cache = DownloadCache(str(tmp_path), max_bytes=2**20)
+
+        with pytest.raises(FetchBudgetExceeded):
+            with cache.open(url, FetchBudget(max_bytes=3000)):
+                pass
+
+        assert url not in cache
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.parametrize("rows", [None, 1])
+    @pytest.mark.parametrize("engine", ["pandas", "pyarrow"])
+    def test_input_url_exceeding_budget(self, setUp, settings, rows, engine):
+        settings.WORKFLOW_FETCH_MAX_BYTES = 1024
+        settings.WORKFLOW_PARSE_ENGINE = engine
+        url = self.add_body("/data.csv", [b"a\n"] + [b"1\n" * 512] * 4, False)
+        tool = ToolFactory.build(
+            config=asdict(InputUrlConfig(url=url)), workflow=WorkflowFactory.build()
+        )
+
+        with pytest.raises(ToolServiceException) as exc:
+            InputUrlService(tool, rows=rows).run_tool({})
+
+        assert exc.value.code == "fetch_limit_exceeded"
+
+    def test_chunked_input_url_exceeding_budget(self, setUp, settings):
+        settings.WORKFLOW_FETCH_MAX_BYTES = 1024
+        url = self.add_body("/data.csv", [b"a\n"] + [b"1\n" * 512] * 4, False)
+        tool = ToolFactory.build(
+            config=asdict(InputUrlConfig(url=url)), workflow=WorkflowFactory.build()
+        )
+
+        with pytest.raises(ToolServiceException) as exc:
+            list(InputUrlService(tool).run_tool_chunked({}, chunk_rows=100))
+
+        assert exc.value.code == "fetch_limit_exceeded"
+
+    def test_input_url_within_budget(self, setUp, settings):
+        settings.WORKFLOW_FETCH_MAX_BYTES = 64 * 1024
+        df = pd.DataFrame({"a": range(10)})
+        # parquet responses are spooled to a temporary file
+        url = self.add_body("/data.parquet", [df.to_parquet()])
+        tool = ToolFactory.build(
+            config=asdict(InputUrlConfig(url=url)), workflow=WorkflowFactory.build()
+        )
+
+        assert InputUrlService(tool, rows=5).run_tool({}).equals(df.head(5))
@@ -1,7 +1,14 @@
+from dataclasses import asdict
+
 import pytest
 
 from panderyx.users.test.factories import UserFactory
 from panderyx.workflows.test.factories import WorkflowFactory
+from panderyx.workflows.tools.dtos.preview_tools import DescribeDataConfig
+from panderyx.workflows.tools.dtos.transform_tools import (
+    HeadConfig,
+    SelectColumnsConfig,
+)
 from panderyx.workflows.tools.test.factories import ToolFactory
 
 
@@ -187,3 +194,134 @@ class TestWorkflowModel:
             self.workflow.tool_execution_order
 
             assert exc.value == "Workflow cannot be run without any input files."
+
+    @pytest.mark.parametrize("number_of_branches", [1, 10, 50])
+    def test_tool_execution_order_number_of_queries(
+        self, setUp, django_assert_num_queries, number_of_branches
+    ):
+        # tool_1 -> tool_2 -> tool_3 (repeated number_of_branches times)
+        for _ in range(number_of_branches):
+            tool_1 = ToolFactory(workflow=self.workflow)
+            tool_2 = ToolFactory(workflow=self.workflow)
+            tool_3 = ToolFactory(workflow=self.workflow)
+            tool_2.inputs.add(tool_1)
+            tool_3.inputs.add(tool_2)
+
+        with django_assert_num_queries(2):
+            order = self.workflow.tool_execution_order
+
+        assert len(order) == number_of_branches * 3
+
+    def test_execution_plan_connections(self, setUp):
+        # tool_1 -> tool_3
+        # tool_2 /
+        tool_1 = ToolFactory(workflow=self.workflow)
+        tool_2 = ToolFactory(workflow=self.workflow)
+        tool_3 = ToolFactory(workflow=self.workflow)
+        tool_3.inputs.add(tool_1, tool_2)
+
+        plan = self.workflow.execution_plan
+
+        assert set(plan.inputs[tool_3.id]) == {tool_1.id, tool_2.id}
+        assert plan.outputs[tool_1.id] == [tool_3.id]
+        assert plan.outputs[tool_2.id] == [tool_3.id]
+        assert plan.order[-1] == tool_3
+
+    def test_execution_plan_prune_to_target_ancestors(self, setUp):
+        # tool_1 -> tool_2 -> tool_3
+        #      \
+        #       tool_4
+        # tool_5
+        tool_1 = ToolFactory(workflow=self.workflow)
+        tool_2 = ToolFactory(workflow=self.workflow)
+        tool_3 = ToolFactory(workflow=self.workflow)
+        tool_4 = ToolFactory(workflow=self.workflow)
+        ToolFactory(workflow=self.workflow)
+        tool_2.inputs.add(tool_1)
+        tool_3.inputs.add(tool_2)
+        tool_4.inputs.add(tool_1)
+
+        plan = self.workflow.execution_plan.prune([tool_2.id])
+
+        assert plan.order == [tool_1, tool_2]
+        assert set(plan.tools) == {tool_1.id, tool_2.id}
+        assert plan.outputs[tool_1.id] == [tool_2.id]
+        assert plan.outputs[tool_2.id] == []
+
+    def test_execution_plan_required_columns(self, setUp):
+        # tool_1 -> select_1 (a, b)
+        #      \
+        #       select_2 (b, c)
+        # tool_2 -> select_3 (a)
+        #      \
+        #       describe
+        tool_1 = ToolFactory(workflow=self.workflow)
+        tool_2 = ToolFactory(workflow=self.workflow)
+        for input_tool, columns in ((tool_1, ["a", "b"]), (tool_1, ["b", "c"])):
+            ToolFactory(
+                config=asdict(SelectColumnsConfig(columns=columns)),
+                workflow=self.workflow,
+            ).inputs.add(input_tool)
+        select_3 = ToolFactory(
+            config=asdict(SelectColumnsConfig(columns=["a"])), workflow=self.workflow
+        )
+        describe = ToolFactory(
+            config=asdict(DescribeDataConfig()), workflow=self.workflow
+        )
+        select_3.inputs.add(tool_2)
+        describe.inputs.add(tool_2)
+        plan = self.workflow.execution_plan
+
+        required_columns = plan.get_required_columns([select_3.id, describe.id])
+
+        assert required_columns[tool_1.id] == {"a", "b", "c"}
+        # describe uses all of the columns
+        assert required_columns[tool_2.id] is None
+        assert required_columns[select_3.id] is None
+
+    def test_execution_plan_required_columns_of_returned_tool(self, setUp):
+        # tool_1 -> select (a)
+        tool_1 = ToolFactory(workflow=self.workflow)
+        select = ToolFactory(
+            config=asdict(SelectColumnsConfig(columns=["a"])), workflow=self.workflow
+        )
+        select.inputs.add(tool_1)
+        plan = self.workflow.execution_plan
+
+        assert plan.get_required_columns([select.id])[tool_1.id] == {"a"}
+        assert plan.get_required_columns([tool_1.id, select.id])[tool_1.id] is None
+
+    def test_execution_plan_required_rows(self, setUp):
+        # tool_1 -> select -> head (10)
+        #      \
+        #       head (20)
+        # tool_2 -> head (10)
+        #      \
+        #       describe
+        tool_1 = ToolFactory(workflow=self.workflow)
+        tool_2 = ToolFactory(workflow=self.workflow)
+        select = ToolFactory(
+            config=asdict(SelectColumnsConfig(columns=["a"])), workflow=self.workflow
+        )
+        head_1 = ToolFactory(config=asdict(HeadConfig(rows=10)), workflow=self.workflow)
+        head_2 = ToolFactory(config=asdict(HeadConfig(rows=20)), workflow=self.workflow)
+        head_3 = ToolFactory(config=asdict(HeadConfig(rows=10)), workflow=self.workflow)
+        describe = ToolFactory(
+            config=asdict(DescribeDataConfig()), workflow=self.workflow
+        )
+        select.inputs.add(tool_1)
+        head_1.inputs.add(select)
+        head_2.inputs.add(tool_1)
+        head_3.inputs.add(tool_2)
+        describe.inputs.add(tool_2)
+        plan = self.workflow.execution_plan
+
+        required_rows = plan.get_required_rows(
+            {head_1.id: None, head_2.id: 5, head_3.id: None, describe.id: None}
+        )
+
+        assert required_rows[select.id] == 10
+        assert required_rows[tool_1.id] == 10
+        assert required_rows[head_2.id] == 5
+        # describe uses all of the rows
+        assert required_rows[tool_2.id] is None
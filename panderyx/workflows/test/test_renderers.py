@@ -0,0 +1,85 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from panderyx.workflows.renderers import (
+    OUTPUT_ORIENTS,
+    ArrowStreamRenderer,
+    ORJSONRenderer,
+    dataframe_to_native,
+    dumps,
+)
+
+
+class TestDataFrameToNative:
+    @pytest.fixture()
+    def setUp(self):
+        self.numeric_df = pd.DataFrame(
+            {"integers": range(10), "floats": [i / 4 for i in range(10)]}
+        )
+        self.numeric_df.loc[3, "floats"] = np.nan
+        self.mixed_df = self.numeric_df.assign(strings=[str(i) for i in range(10)])
+        dates = pd.Series(pd.date_range("2021-01-01", periods=10, freq="D"))
+        dates[4] = pd.NaT
+        self.nullable_df = pd.DataFrame(
+            {
+                "integers": pd.array([1, None] * 5, dtype="Int64"),
+                "strings": pd.array(["a", None] * 5, dtype="string"),
+                "arrow_strings": pd.array(["b", None] * 5, dtype="string[pyarrow]"),
+                "dates": dates,
+                "zoned_dates": dates.dt.tz_localize("Europe/Warsaw"),
+                "durations": dates - dates[0],
+            }
+        )
+        self.dated_df = self.numeric_df.set_index(
+            pd.date_range("2021-01-01", periods=10, freq="H")
+        )
+
+    @pytest.mark.parametrize("orient", OUTPUT_ORIENTS)
+    def test_matches_pandas_json(self, setUp, orient):
+        for df in (self.numeric_df, self.mixed_df, self.nullable_df, self.dated_df):
+            native = dataframe_to_native(df, orient)
+
+            assert json.loads(dumps(native)) == json.loads(df.to_json(orient=orient))
+
+    def test_numeric_values_are_kept_in_array(self, setUp):
+        native = dataframe_to_native(self.numeric_df, "split")
+
+        assert isinstance(native["data"], np.ndarray)
+
+    def test_missing_values_are_null(self, setUp):
+        native = dataframe_to_native(self.nullable_df, "records")
+
+        assert native[1]["integers"] is None
+        assert native[1]["arrow_strings"] is None
+        assert native[4]["dates"] is None
+        assert native[0]["zoned_dates"] == 1609455600000
+
+    def test_unknown_orient(self, setUp):
+        with pytest.raises(ValueError):
+            dataframe_to_native(self.numeric_df, "table")
+
+
+class TestORJSONRenderer:
+    def test_render(self):
+        data = [{"tool_id": 1, "data": {"values": np.arange(3)}}]
+
+        rendered = ORJSONRenderer().render(data)
+
+        assert json.loads(rendered) == [{"tool_id": 1, "data": {"values": [0, 1, 2]}}]
+
+
+class TestArrowStreamRenderer:
+    def test_render_mixed_object_columns_as_strings(self):
+        df = pd.DataFrame({"numbers": [1.5, 2.0], "strings": ["a", None]})
+        description = df.describe(include="all")
+
+        rendered = ArrowStreamRenderer().render(description)
+        table = pa.ipc.open_stream(rendered).read_all()
+
+        assert table.schema.field("strings").type == pa.string()
+        assert table.column("strings").to_pylist()[:4] == ["1", "1", "a", "1"]
+        assert table.column("numbers").to_pylist()[0] == 2.0
@@ -0,0 +1,115 @@
+import os
+from dataclasses import asdict
+
+import pandas as pd
+import pytest
+
+from panderyx.test_helpers.data_sets import test_dataset
+from panderyx.workflows.executors import SerialExecutor
+from panderyx.workflows.result_stores import DiskResultStore, get_result_store
+from panderyx.workflows.services import WorkflowService
+from panderyx.workflows.test.factories import WorkflowFactory
+from panderyx.workflows.tools.dtos.input_tools import InputUrlConfig
+from panderyx.workflows.tools.dtos.preview_tools import DescribeDataConfig
+from panderyx.workflows.tools.helpers import DataTypes
+from panderyx.workflows.tools.test.factories import ToolFactory
+
+
+class TestDiskResultStore:
+    @pytest.fixture()
+    def setUp(self, tmp_path) -> None:
+        self.directory = str(tmp_path)
+        self.df = pd.DataFrame(
+            {"Country Code": ["ARE", "GBR", "POL"], "2021": [50.0, 34.3, None]},
+            index=["a", "b", "c"],
+        )
+
+    def test_large_results_are_spilled_to_disk(self, setUp):
+        store = DiskResultStore(self.directory, spill_bytes=0)
+        store[1] = self.df
+
+        assert os.listdir(store.directory) == ["1.arrow"]
+        assert store[1].equals(self.df)
+        assert list(store) == [1]
+
+    def test_results_not_convertible_to_arrow_are_pickled(self, setUp):
+        # describe_data outputs mix numbers and strings in object columns
+        df = pd.DataFrame({"value": [3, "POL", 0.5]}, index=["count", "top", "freq"])
+        store = DiskResultStore(self.directory, spill_bytes=0)
+        store[1] = df
+
+        assert os.listdir(store.directory) == ["1.pickle"]
+        assert store[1].equals(df)
+
+        del store[1]
+
+        assert os.listdir(store.directory) == []
+
+    def test_small_results_are_kept_in_memory(self, setUp):
+        store = DiskResultStore(self.directory, spill_bytes=10**9)
+        store[1] = self.df
+
+        assert os.listdir(store.directory) == []
+        assert store[1] is self.df
+
+    def test_delete_and_close_remove_files(self, setUp):
+        store = DiskResultStore(self.directory, spill_bytes=0)
+        store[1] = self.df
+        store[2] = self.df
+        del store[1]
+
+        assert 1 not in store
+        assert os.listdir(store.directory) == ["2.arrow"]
+
+        store.close()
+
+        assert not os.path.exists(store.directory)
+
+    def test_result_store_from_settings(self, setUp, settings):
+        settings.WORKFLOW_RESULT_STORE = "disk"
+        settings.WORKFLOW_RESULT_STORE_DIR = self.directory
+
+        store = get_result_store()
+
+        assert isinstance(store, DiskResultStore)
+        assert store.directory.startswith(self.directory)
+
+
+@pytest.mark.django_db()
+class TestWorkflowServiceWithDiskResultStore:
+    # describe outputs of object and all columns are pickled
+    @pytest.mark.parametrize(
+        "data_type",
+        [DataTypes.NUMERIC.value, DataTypes.OBJECT.value, DataTypes.ALL.value],
+    )
+    def test_run_workflow(self, tmp_path, data_type):
+        # fake file system is not visible to pyarrow
+        test_dataset_path = tmp_path / "dataset.csv"
+        test_dataset_path.write_text(test_dataset)
+
+        # input_tool -> describe_tool
+        workflow = WorkflowFactory()
+        input_tool = ToolFactory(
+            config=asdict(InputUrlConfig(url=str(test_dataset_path))),
+            workflow=workflow,
+        )
+        describe_tool = ToolFactory(
+            config=asdict(DescribeDataConfig(data_type=data_type)), workflow=workflow
+        )
+        describe_tool.inputs.add(input_tool)
+
+        memory_service = WorkflowService(
+            workflow, executor=SerialExecutor(), result_store={}
+        )
+        memory_service.run_workflow()
+        disk_store = DiskResultStore(str(tmp_path), spill_bytes=0)
+        disk_service = WorkflowService(
+            workflow, executor=SerialExecutor(), result_store=disk_store
+        )
+        disk_service.run_workflow()
+
+        assert disk_service.get_outputs() == memory_service.get_outputs()
+
+        disk_service.close()
+
+        assert not os.path.exists(disk_store.directory)
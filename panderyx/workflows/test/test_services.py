@@ -1,9 +1,20 @@
+from dataclasses import asdict
+from unittest import mock
+
+import pandas as pd
 import pytest
 from django.test import TestCase
 from panderyx.workflows.exceptions import WorkflowServiceException
 
 from panderyx.workflows.test.factories import WorkflowFactory
-from panderyx.workflows.services import WorkflowService
+from panderyx.workflows.services import OutputOptions, WorkflowService
+from panderyx.workflows.tools.dtos.input_tools import InputUrlConfig
+from panderyx.workflows.tools.dtos.preview_tools import DescribeDataConfig
+from panderyx.workflows.tools.dtos.transform_tools import (
+    HeadConfig,
+    SelectColumnsConfig,
+)
+from panderyx.workflows.tools.test.factories import ToolFactory
 
 
 @pytest.mark.django_db()
@@ -24,3 +35,194 @@ class TestWorkflowService:
                     "message": "Workflow cannot be run without any input files.",
                 }
             } == exc.value
+
+
+@pytest.mark.django_db()
+class TestWorkflowServiceTargets:
+    @pytest.fixture()
+    def setUp(self, test_dataset_path):
+        # input_tool -> describe_tool
+        #           \
+        #            failing_tool (describes missing category columns)
+        self.workflow = WorkflowFactory()
+        self.input_tool = ToolFactory(
+            config=asdict(InputUrlConfig(url=test_dataset_path)),
+            workflow=self.workflow,
+        )
+        self.describe_tool = ToolFactory(
+            config=asdict(DescribeDataConfig()), workflow=self.workflow
+        )
+        self.failing_tool = ToolFactory(
+            config=asdict(DescribeDataConfig(data_type=3)), workflow=self.workflow
+        )
+        self.describe_tool.inputs.add(self.input_tool)
+        self.failing_tool.inputs.add(self.input_tool)
+
+    def test_run_workflow_with_target(self, setUp):
+        service = WorkflowService(self.workflow)
+        service.run_workflow(target_ids=[self.describe_tool.id])
+        outputs = service.get_outputs()
+
+        # input tool's result is released once describe tool has consumed it
+        assert set(service.tool_result_dfs) == {self.describe_tool.id}
+        assert [output["tool_id"] for output in outputs] == [self.describe_tool.id]
+
+    def test_run_workflow_with_column_projection(self, setUp):
+        select_tool = ToolFactory(
+            config=asdict(SelectColumnsConfig(columns=["Country Code"])),
+            workflow=self.workflow,
+        )
+        select_tool.inputs.add(self.input_tool)
+        service = WorkflowService(self.workflow, release_results=False)
+        service.run_workflow(target_ids=[select_tool.id])
+
+        # input tool reads only the columns used by the select tool
+        assert service.tool_hints == {self.input_tool.id: {"columns": ["Country Code"]}}
+        input_df = service.tool_result_dfs[self.input_tool.id]
+        assert input_df.columns.tolist() == ["Country Code"]
+
+    def test_run_workflow_with_row_limit(self, setUp):
+        head_tool = ToolFactory(
+            config=asdict(HeadConfig(rows=3)), workflow=self.workflow
+        )
+        head_tool.inputs.add(self.input_tool)
+        service = WorkflowService(self.workflow, release_results=False, output_rows=2)
+        service.run_workflow(target_ids=[head_tool.id])
+
+        assert service.tool_hints == {
+            self.input_tool.id: {"rows": 2},
+            head_tool.id: {"rows": 2},
+        }
+        assert len(service.tool_result_dfs[self.input_tool.id]) == 2
+
+    def test_run_workflow_saves_pinned_schema(self, setUp):
+        service = WorkflowService(self.workflow, release_results=False)
+        service.run_workflow(target_ids=[self.describe_tool.id])
+
+        self.input_tool.refresh_from_db()
+        df = service.tool_result_dfs[self.input_tool.id]
+        assert self.input_tool.metadata["schema"]["header"] == list(df.columns)
+        assert self.input_tool.metadata["schema"]["dtypes"] == {
+            column: str(dtype) for column, dtype in df.dtypes.items()
+        }
+
+    def test_run_workflow_with_target_outside_of_workflow(self, setUp):
+        other_tool = ToolFactory()
+        service = WorkflowService(self.workflow)
+
+        with pytest.raises(WorkflowServiceException) as exc:
+            service.run_workflow(target_ids=[other_tool.id])
+
+        assert exc.value.code == "workflow_invalid_target"
+
+
+@pytest.mark.django_db()
+class TestWorkflowServiceReleaseResults:
+    @pytest.fixture()
+    def setUp(self):
+        # tool_1 -> tool_2 -> tool_4
+        #       \            /
+        #        -> tool_3 --
+        self.workflow = WorkflowFactory()
+        self.tool_1, self.tool_2, self.tool_3, self.tool_4 = ToolFactory.create_batch(
+            4, workflow=self.workflow
+        )
+        self.tool_2.inputs.add(self.tool_1)
+        self.tool_3.inputs.add(self.tool_1)
+        self.tool_4.inputs.add(self.tool_2, self.tool_3)
+        self.stored_ids = []
+
+    def run_tool(self, tool, inputs):
+        self.stored_ids.append(set(self.service.tool_result_dfs))
+        return pd.DataFrame({"tool": [tool.id]})
+
+    def run_workflow(self, **kwargs):
+        with mock.patch("panderyx.workflows.executors.run_tool", self.run_tool):
+            self.service.run_workflow(**kwargs)
+
+    def test_intermediate_results_are_released(self, setUp):
+        self.service = WorkflowService(self.workflow, release_results=True)
+        self.run_workflow(target_ids=[self.tool_4.id])
+
+        assert self.stored_ids == [
+            set(),
+            {self.tool_1.id},
+            {self.tool_1.id, self.tool_2.id},
+            {self.tool_2.id, self.tool_3.id},
+        ]
+        assert set(self.service.tool_result_dfs) == {self.tool_4.id}
+
+    def test_target_results_are_kept(self, setUp):
+        self.service = WorkflowService(self.workflow, release_results=True)
+        self.run_workflow(target_ids=[self.tool_2.id, self.tool_4.id])
+
+        assert set(self.service.tool_result_dfs) == {self.tool_2.id, self.tool_4.id}
+
+    def test_all_results_are_kept_without_targets(self, setUp):
+        self.service = WorkflowService(self.workflow, release_results=True)
+        self.run_workflow()
+
+        assert len(self.service.tool_result_dfs) == 4
+
+    def test_results_are_kept_when_release_is_disabled(self, setUp):
+        self.service = WorkflowService(self.workflow, release_results=False)
+        self.run_workflow(target_ids=[self.tool_4.id])
+
+        assert len(self.service.tool_result_dfs) == 4
+
+    def test_unused_cached_results_are_released(self, setUp):
+        self.service = WorkflowService(self.workflow, release_results=True)
+        self.run_workflow(target_ids=[self.tool_4.id])
+        self.tool_3.config = {**self.tool_3.config, "changed": True}
+        self.tool_3.save()
+
+        self.service = WorkflowService(self.workflow, release_results=True)
+        self.stored_ids = []
+        self.run_workflow(target_ids=[self.tool_4.id])
+
+        # tool_1 is loaded from cache for tool_3, tool_2 is loaded and kept for tool_4
+        assert self.stored_ids == [
+            {self.tool_1.id, self.tool_2.id},
+            {self.tool_2.id, self.tool_3.id},
+        ]
+        assert set(self.service.tool_result_dfs) == {self.tool_4.id}
+
+    def test_streamed_outputs_are_released(self, setUp):
+        self.service = WorkflowService(self.workflow, release_results=True)
+        plan = self.service.get_plan()
+        outputs = []
+        with mock.patch("panderyx.workflows.executors.run_tool", self.run_tool):
+            for output in self.service.iter_outputs(plan):
+                outputs.append(output["tool_id"])
+
+        # tool_1 is needed by tool_3 after being streamed
+        assert outputs == [tool.id for tool in plan.order]
+        assert self.stored_ids[2:] == [
+            {self.tool_1.id, self.tool_2.id},
+            {self.tool_2.id, self.tool_3.id},
+        ]
+        assert not self.service.tool_result_dfs
+
+
+class TestOutputOptions:
+    @pytest.fixture()
+    def setUp(self):
+        self.df = pd.DataFrame({"values": range(100)}, index=range(100, 200))
+
+    def test_all_rows_are_selected_by_default(self, setUp):
+        assert OutputOptions().select_rows(self.df).equals(self.df)
+
+    def test_limit_and_offset(self, setUp):
+        rows = OutputOptions(limit=10, offset=95).select_rows(self.df)
+
+        assert rows["values"].tolist() == [95, 96, 97, 98, 99]
+
+    def test_sample_keeps_row_order(self, setUp):
+        rows = OutputOptions(sample=10).select_rows(self.df)
+
+        assert len(rows) == 10
+        assert rows.index.is_monotonic_increasing
+        assert rows.equals(OutputOptions(sample=10).select_rows(self.df))
+
+    def test_sample_larger_than_dataframe(self, setUp):
+        assert OutputOptions(sample=1000).select_rows(self.df).equals(self.df)
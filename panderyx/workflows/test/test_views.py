@@ -1,15 +1,20 @@
+import io
+import json
+import os
 from dataclasses import asdict
 
 import pytest
+from django.http import UnreadablePostError
 from django.urls import reverse
 from rest_framework import status
 
 from panderyx.users.test.factories import UserFactory
-from panderyx.workflows.models import Workflow
-from panderyx.workflows.test.factories import WorkflowFactory
+from panderyx.workflows.models import Upload, Workflow, WorkflowRun
+from panderyx.workflows.test.factories import UploadFactory, WorkflowFactory
 from panderyx.workflows.tools.dtos.input_tools import InputUrlConfig
 from panderyx.workflows.tools.dtos.preview_tools import DescribeDataConfig
 from panderyx.workflows.tools.test.factories import ToolFactory
+from panderyx.workflows.workers import process_run
 
 
 @pytest.mark.django_db()
@@ -221,6 +226,149 @@ class TestRunWorkflowTestCase:
         assert response.status_code == status.HTTP_200_OK
         assert len(r_json) == 2
 
+    def test_run_with_target(self, setUp, apiclient, test_dataset_path):
+        tool_1 = ToolFactory(
+            config=asdict(InputUrlConfig(url=test_dataset_path)),
+            workflow=self.workflow_user_1,
+        )
+        tool_2 = ToolFactory(
+            config=asdict(DescribeDataConfig()), workflow=self.workflow_user_1
+        )
+        tool_2.inputs.add(tool_1)
+        url = reverse("workflow-run-workflow", kwargs={"pk": self.workflow_user_1.id})
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.get(url, {"target": [tool_2.id]})
+        r_json = response.json()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [output["tool_id"] for output in r_json] == [tool_2.id]
+
+    def test_run_with_invalid_target(self, setUp, apiclient, test_dataset_path):
+        ToolFactory(
+            config=asdict(InputUrlConfig(url=test_dataset_path)),
+            workflow=self.workflow_user_1,
+        )
+        url = reverse("workflow-run-workflow", kwargs={"pk": self.workflow_user_1.id})
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.get(url, {"target": ["not-a-tool"]})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_run_with_orient(self, setUp, apiclient, test_dataset_path):
+        tool_1 = ToolFactory(
+            config=asdict(InputUrlConfig(url=test_dataset_path)),
+            workflow=self.workflow_user_1,
+        )
+        url = reverse("workflow-run-workflow", kwargs={"pk": self.workflow_user_1.id})
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.get(url, {"orient": "split"})
+        r_json = response.json()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert r_json[0]["tool_id"] == tool_1.id
+        assert set(r_json[0]["data"]) == {"columns", "index", "data"}
+
+    def test_run_with_invalid_orient(self, setUp, apiclient, test_dataset_path):
+        url = reverse("workflow-run-workflow", kwargs={"pk": self.workflow_user_1.id})
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.get(url, {"orient": "table"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_run_with_limit(self, setUp, apiclient, test_dataset_path):
+        ToolFactory(
+            config=asdict(InputUrlConfig(url=test_dataset_path)),
+            workflow=self.workflow_user_1,
+        )
+        url = reverse("workflow-run-workflow", kwargs={"pk": self.workflow_user_1.id})
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.get(url, {"orient": "records", "limit": 2, "offset": 1})
+        r_json = response.json()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert r_json[0]["total_rows"] == 5
+        assert [row["Country Code"] for row in r_json[0]["data"]] == ["GBR", "POL"]
+
+    def test_run_with_preview(self, setUp, apiclient, test_dataset_path):
+        ToolFactory(
+            config=asdict(InputUrlConfig(url=test_dataset_path)),
+            workflow=self.workflow_user_1,
+        )
+        url = reverse("workflow-run-workflow", kwargs={"pk": self.workflow_user_1.id})
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.get(url, {"limit": 2, "offset": 1, "preview": True})
+        r_json = response.json()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert r_json[0]["total_rows"] is None
+        assert len(json.loads(r_json[0]["data"])["Country Code"]) == 2
+
+    def test_run_with_preview_without_limit(self, setUp, apiclient):
+        url = reverse("workflow-run-workflow", kwargs={"pk": self.workflow_user_1.id})
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.get(url, {"preview": True})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_run_with_sample_and_limit(self, setUp, apiclient, test_dataset_path):
+        url = reverse("workflow-run-workflow", kwargs={"pk": self.workflow_user_1.id})
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.get(url, {"sample": 2, "limit": 2})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_run_with_streamed_outputs(self, setUp, apiclient, test_dataset_path):
+        tool_1 = ToolFactory(
+            config=asdict(InputUrlConfig(url=test_dataset_path)),
+            workflow=self.workflow_user_1,
+        )
+        tool_2 = ToolFactory(
+            config=asdict(DescribeDataConfig()), workflow=self.workflow_user_1
+        )
+        tool_2.inputs.add(tool_1)
+        url = reverse("workflow-run-workflow", kwargs={"pk": self.workflow_user_1.id})
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.get(url, {"stream": True})
+        records = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert [record["tool_id"] for record in records] == [tool_1.id, tool_2.id]
+
+    def test_run_with_streamed_tool_error(self, setUp, apiclient, test_dataset_path):
+        tool_1 = ToolFactory(
+            config=asdict(InputUrlConfig(url=test_dataset_path)),
+            workflow=self.workflow_user_1,
+        )
+        tool_2 = ToolFactory(
+            config=asdict(DescribeDataConfig()), workflow=self.workflow_user_1
+        )
+        url = reverse("workflow-run-workflow", kwargs={"pk": self.workflow_user_1.id})
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.get(url, {"stream": True})
+        records = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+
+        assert records[0]["tool_id"] == tool_1.id
+        assert records[-1] == {
+            "error": {
+                "tool_id": str(tool_2.id),
+                "message": "Tool is missing input to process.",
+            }
+        }
+
+    def test_run_with_streamed_outputs_on_empty_workflow(self, setUp, apiclient):
+        url = reverse("workflow-run-workflow", kwargs={"pk": self.workflow_user_1.id})
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.get(url, {"stream": True})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_run_without_permissions(self, setUp, apiclient, test_dataset_path):
         ToolFactory(
             config=asdict(InputUrlConfig(url=test_dataset_path)),
@@ -232,3 +380,274 @@ class TestRunWorkflowTestCase:
         r_json = response.json()
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db()
+class TestWorkflowRunTestCase:
+    """
+    Tests /workflows/{id}/runs operations.
+    """
+
+    @pytest.fixture()
+    def setUp(self, test_dataset_path) -> None:
+        self.user_1 = UserFactory()
+        self.user_2 = UserFactory()
+        self.workflow_user_1 = WorkflowFactory(user=self.user_1)
+        self.input_tool = ToolFactory(
+            config=asdict(InputUrlConfig(url=test_dataset_path)),
+            workflow=self.workflow_user_1,
+        )
+        self.describe_tool = ToolFactory(
+            config=asdict(DescribeDataConfig()), workflow=self.workflow_user_1
+        )
+        self.describe_tool.inputs.add(self.input_tool)
+        self.list_url = reverse(
+            "workflow-runs-list", kwargs={"workflow_pk": self.workflow_user_1.id}
+        )
+
+    def get_result_url(self, run_id):
+        return reverse(
+            "workflow-runs-result",
+            kwargs={"workflow_pk": self.workflow_user_1.id, "pk": run_id},
+        )
+
+    def test_post_queues_run(self, setUp, apiclient):
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.post(
+            self.list_url, {"target_ids": [self.describe_tool.id]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data["status"] == WorkflowRun.Status.QUEUED
+        run = WorkflowRun.objects.get(id=response.data["id"])
+        assert run.workflow == self.workflow_user_1
+        assert run.target_ids == [self.describe_tool.id]
+
+    def test_post_with_invalid_target(self, setUp, apiclient):
+        other_tool = ToolFactory()
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.post(
+            self.list_url, {"target_ids": [other_tool.id]}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not WorkflowRun.objects.exists()
+
+    def test_post_without_permissions(self, setUp, apiclient):
+        apiclient.force_authenticate(self.user_2)
+        response = apiclient.post(self.list_url, {}, format="json")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert not WorkflowRun.objects.exists()
+
+    def test_get_result_of_queued_run(self, setUp, apiclient):
+        run = WorkflowRun.objects.create(workflow=self.workflow_user_1)
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.get(self.get_result_url(run.id))
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data["status"] == WorkflowRun.Status.QUEUED
+
+    def test_get_result_of_processed_run(self, setUp, apiclient):
+        apiclient.force_authenticate(self.user_1)
+        run_id = apiclient.post(self.list_url, {}, format="json").data["id"]
+        process_run(WorkflowRun.claim_next())
+        response = apiclient.get(self.get_result_url(run_id))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [output["tool_id"] for output in response.json()] == [
+            self.input_tool.id,
+            self.describe_tool.id,
+        ]
+
+    def test_get_status_without_permissions(self, setUp, apiclient):
+        run = WorkflowRun.objects.create(workflow=self.workflow_user_1)
+        url = reverse(
+            "workflow-runs-detail",
+            kwargs={"workflow_pk": self.workflow_user_1.id, "pk": run.id},
+        )
+        apiclient.force_authenticate(self.user_2)
+        response = apiclient.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class InterruptedStream(io.BytesIO):
+    """Request body of a client that disconnects after sending its contents."""
+
+    def read(self, size=-1):
+        data = super().read(size)
+        if not data:
+            raise UnreadablePostError("Client disconnected.")
+        return data
+
+
+@pytest.mark.django_db()
+class TestUploadTestCase:
+    """
+    Tests /uploads operations.
+    """
+
+    @pytest.fixture()
+    def setUp(self) -> None:
+        self.user_1 = UserFactory()
+        self.user_2 = UserFactory()
+        self.data = b"a,b\n1,x\n2,y\n3,z\n"
+        self.upload = Upload.objects.create(
+            user=self.user_1, filename="data.csv", size=len(self.data)
+        )
+        self.url = reverse("upload-detail", kwargs={"pk": self.upload.id})
+        self.chunk_url = reverse("upload-chunk", kwargs={"pk": self.upload.id})
+
+    def send_chunk(self, apiclient, chunk, offset):
+        return apiclient.patch(
+            self.chunk_url,
+            chunk,
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def test_create_upload(self, setUp, apiclient):
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.post(
+            reverse("upload-list"),
+            {"filename": "../data.csv", "size": 10, "offset": 10},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["filename"] == "data.csv"
+        assert response.data["offset"] == 0
+        assert response.data["status"] == Upload.Status.IN_PROGRESS
+        assert response.data["user"] == self.user_1.id
+
+    @pytest.mark.parametrize("size", [0, 1025])
+    def test_create_upload_with_invalid_size(self, setUp, apiclient, settings, size):
+        settings.WORKFLOW_UPLOAD_MAX_BYTES = 1024
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.post(
+            reverse("upload-list"), {"filename": "data.csv", "size": size}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_upload_in_chunks(self, setUp, apiclient, media_root):
+        apiclient.force_authenticate(self.user_1)
+
+        response = self.send_chunk(apiclient, self.data[:5], 0)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["offset"] == 5
+        assert response.data["status"] == Upload.Status.IN_PROGRESS
+
+        response = self.send_chunk(apiclient, self.data[5:], 5)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["offset"] == len(self.data)
+        assert response.data["status"] == Upload.Status.COMPLETED
+
+        self.upload.refresh_from_db()
+        with self.upload.file.open("rb") as file:
+            assert file.read() == self.data
+        assert self.upload.file.path.startswith(str(media_root))
+        assert not os.path.exists(self.upload.partial_path)
+
+    def test_resume_upload_from_offset(self, setUp, apiclient):
+        apiclient.force_authenticate(self.user_1)
+        self.send_chunk(apiclient, self.data[:5], 0)
+
+        # chunk sent after a lost chunk does not continue the upload
+        response = self.send_chunk(apiclient, self.data[8:], 8)
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.data["offset"] == 5
+
+        offset = apiclient.get(self.url).data["offset"]
+        response = self.send_chunk(apiclient, self.data[offset:], offset)
+        assert response.data["status"] == Upload.Status.COMPLETED
+
+        self.upload.refresh_from_db()
+        with self.upload.file.open("rb") as file:
+            assert file.read() == self.data
+
+    def test_interrupted_chunk_keeps_received_bytes(self, setUp):
+        with pytest.raises(UnreadablePostError):
+            self.upload.append_chunk(
+                0, InterruptedStream(self.data[:5]), len(self.data)
+            )
+
+        assert self.upload.offset == 5
+        self.upload.append_chunk(5, io.BytesIO(self.data[5:]), len(self.data) - 5)
+        assert self.upload.status == Upload.Status.COMPLETED
+        with self.upload.file.open("rb") as file:
+            assert file.read() == self.data
+
+    def test_chunk_exceeding_size_of_upload(self, setUp, apiclient):
+        apiclient.force_authenticate(self.user_1)
+        response = self.send_chunk(apiclient, self.data + b"4,w\n", 0)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert apiclient.get(self.url).data["offset"] == 0
+
+    def test_too_large_chunk(self, setUp, apiclient, settings):
+        settings.WORKFLOW_UPLOAD_CHUNK_MAX_BYTES = 4
+        apiclient.force_authenticate(self.user_1)
+        response = self.send_chunk(apiclient, self.data[:5], 0)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_chunk_without_offset(self, setUp, apiclient):
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.patch(
+            self.chunk_url, self.data, content_type="application/offset+octet-stream"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_chunk_of_completed_upload(self, setUp, apiclient):
+        apiclient.force_authenticate(self.user_1)
+        self.send_chunk(apiclient, self.data, 0)
+        response = self.send_chunk(apiclient, self.data[:5], 0)
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+    def test_upload_without_permissions(self, setUp, apiclient):
+        apiclient.force_authenticate(self.user_2)
+
+        assert apiclient.get(self.url).status_code == status.HTTP_404_NOT_FOUND
+        response = self.send_chunk(apiclient, self.data, 0)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert len(apiclient.get(reverse("upload-list")).data) == 0
+
+    def test_delete_upload(self, setUp, apiclient):
+        upload = UploadFactory(user=self.user_1)
+        path = upload.file.path
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.delete(reverse("upload-detail", kwargs={"pk": upload.id}))
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert not Upload.objects.filter(id=upload.id).exists()
+        assert not os.path.exists(path)
+
+    def test_run_workflow_with_uploaded_file(self, setUp, apiclient):
+        apiclient.force_authenticate(self.user_1)
+        self.send_chunk(apiclient, self.data, 0)
+        workflow = WorkflowFactory(user=self.user_1)
+        response = apiclient.post(
+            reverse("workflow-tools-list", kwargs={"workflow_pk": workflow.id}),
+            {
+                "name": "input",
+                "config": {"type": "input_file", "upload": str(self.upload.id)},
+            },
+            format="json",
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        response = apiclient.get(
+            reverse("workflow-run-workflow", kwargs={"pk": workflow.id}),
+            {"orient": "records"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()[0]["data"] == [
+            {"a": 1, "b": "x"},
+            {"a": 2, "b": "y"},
+            {"a": 3, "b": "z"},
+        ]
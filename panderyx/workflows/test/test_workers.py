@@ -0,0 +1,157 @@
+import time
+from dataclasses import asdict
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from panderyx.workflows.models import WorkflowRun
+from panderyx.workflows.test.factories import WorkflowFactory
+from panderyx.workflows.tools.dtos.input_tools import InputUrlConfig
+from panderyx.workflows.tools.dtos.preview_tools import DescribeDataConfig
+from panderyx.workflows.tools.test.factories import ToolFactory
+from panderyx.workflows.workers import WorkflowWorker, process_run
+
+
+@pytest.mark.django_db()
+class TestWorkflowWorker:
+    @pytest.fixture()
+    def setUp(self, test_dataset_path):
+        # input_tool -> describe_tool
+        self.workflow = WorkflowFactory()
+        self.input_tool = ToolFactory(
+            config=asdict(InputUrlConfig(url=test_dataset_path)),
+            workflow=self.workflow,
+        )
+        self.describe_tool = ToolFactory(
+            config=asdict(DescribeDataConfig()), workflow=self.workflow
+        )
+        self.describe_tool.inputs.add(self.input_tool)
+
+    def test_claim_next_returns_oldest_queued_run(self, setUp):
+        first_run = WorkflowRun.objects.create(workflow=self.workflow)
+        WorkflowRun.objects.create(workflow=self.workflow)
+
+        run = WorkflowRun.claim_next()
+
+        assert run == first_run
+        assert run.status == WorkflowRun.Status.RUNNING
+        assert run.date_started is not None
+        assert WorkflowRun.claim_next() != first_run
+
+    def test_claim_next_with_empty_queue(self, setUp):
+        WorkflowRun.objects.create(
+            workflow=self.workflow, status=WorkflowRun.Status.SUCCEEDED
+        )
+
+        assert WorkflowRun.claim_next() is None
+
+    def test_process_run_stores_outputs(self, setUp):
+        WorkflowRun.objects.create(
+            workflow=self.workflow, target_ids=[self.describe_tool.id]
+        )
+        run = WorkflowRun.claim_next()
+
+        process_run(run)
+        run.refresh_from_db()
+
+        assert run.status == WorkflowRun.Status.SUCCEEDED
+        assert [output["tool_id"] for output in run.result] == [self.describe_tool.id]
+        assert run.date_finished is not None
+
+    def test_process_run_stores_tool_error(self, setUp):
+        failing_tool = ToolFactory(
+            config=asdict(DescribeDataConfig()), workflow=self.workflow
+        )
+        WorkflowRun.objects.create(workflow=self.workflow)
+        run = WorkflowRun.claim_next()
+
+        process_run(run)
+        run.refresh_from_db()
+
+        assert run.status == WorkflowRun.Status.FAILED
+        assert run.error == {
+            "tool_id": str(failing_tool.id),
+            "message": "Tool is missing input to process.",
+        }
+
+    def test_process_run_stores_unexpected_error(self, setUp):
+        WorkflowRun.objects.create(workflow=self.workflow)
+        run = WorkflowRun.claim_next()
+
+        with mock.patch(
+            "panderyx.workflows.executors.run_tool", side_effect=RuntimeError
+        ):
+            process_run(run)
+        run.refresh_from_db()
+
+        assert run.status == WorkflowRun.Status.FAILED
+        assert run.error["message"] == "Workflow run failed unexpectedly."
+
+    def test_run_pending_processes_whole_queue(self, setUp):
+        WorkflowRun.objects.create(workflow=self.workflow)
+        WorkflowRun.objects.create(workflow=self.workflow)
+
+        assert WorkflowWorker(poll_interval=0).run_pending() == 2
+        assert not WorkflowRun.objects.exclude(
+            status=WorkflowRun.Status.SUCCEEDED
+        ).exists()
+
+    def test_command_in_burst_mode(self, setUp, capsys):
+        WorkflowRun.objects.create(workflow=self.workflow)
+
+        call_command("run_workflow_worker", "--burst")
+
+        assert "Processed 1 workflow run(s)." in capsys.readouterr().out
+
+    def test_runs_of_stopped_workers_are_failed(self, setUp):
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        stale_run = WorkflowRun.objects.create(
+            workflow=self.workflow,
+            status=WorkflowRun.Status.RUNNING,
+            date_started=an_hour_ago,
+            date_heartbeat=an_hour_ago,
+        )
+        # run of a worker that is still alive
+        running_run = WorkflowRun.objects.create(
+            workflow=self.workflow,
+            status=WorkflowRun.Status.RUNNING,
+            date_started=an_hour_ago,
+            date_heartbeat=timezone.now(),
+        )
+
+        WorkflowWorker(poll_interval=0, stale_timeout=300).run_pending()
+        stale_run.refresh_from_db()
+        running_run.refresh_from_db()
+
+        assert stale_run.status == WorkflowRun.Status.FAILED
+        assert stale_run.error["message"] == "Worker processing the run has stopped."
+        assert stale_run.date_finished is not None
+        assert running_run.status == WorkflowRun.Status.RUNNING
+
+    def test_heartbeats_are_sent_while_run_is_processed(self, setUp):
+        WorkflowRun.objects.create(workflow=self.workflow)
+        worker = WorkflowWorker(poll_interval=0, heartbeat_interval=0.01)
+
+        with mock.patch(
+            "panderyx.workflows.workers.process_run",
+            side_effect=lambda run: time.sleep(0.1),
+        ), mock.patch.object(WorkflowRun, "heartbeat") as heartbeat:
+            worker.run_pending()
+
+        assert heartbeat.call_count > 1
+        calls = heartbeat.call_count
+        time.sleep(0.05)
+        assert heartbeat.call_count == calls
+
+    def test_heartbeat_updates_running_run(self, setUp):
+        WorkflowRun.objects.create(workflow=self.workflow)
+        run = WorkflowRun.claim_next()
+        WorkflowRun.objects.filter(id=run.id).update(date_heartbeat=None)
+
+        run.heartbeat()
+        run.refresh_from_db()
+
+        assert run.date_heartbeat is not None
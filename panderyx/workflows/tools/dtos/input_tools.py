@@ -2,6 +2,7 @@ from dataclasses import dataclass
 
 from panderyx.workflows.tools.dtos.tool import ToolConfig
 
+
 # TODO Make sure to use @dataclass(slots=True) after upgrading to Python 3.10
 @dataclass
 class InputUrlConfig(ToolConfig):
@@ -10,3 +11,17 @@ class InputUrlConfig(ToolConfig):
     url: str = ""
     extension: str = ""
     separator: str = ""
+    # dtypes of parsed DataFrames are compacted, see OptimizeDtypesService
+    optimize_dtypes: bool = False
+
+
+@dataclass
+class InputFileConfig(ToolConfig):
+    type: str = "input_file"
+    max_number_of_inputs: int = 0
+    upload: str = ""
+    # storage name of the uploaded file, set from the upload by the serializer
+    file: str = ""
+    extension: str = ""
+    separator: str = ""
+    optimize_dtypes: bool = False
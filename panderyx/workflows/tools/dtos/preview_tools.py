@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 from panderyx.workflows.tools.dtos.tool import ToolConfig
 
@@ -7,3 +8,6 @@ class DescribeDataConfig(ToolConfig):
     type: str = "describe_data"
     max_number_of_inputs: int = 1
     data_type: int = 1
+    # statistics are approximated on a sample of rows when either is set
+    sample_size: Optional[int] = None
+    relative_error: Optional[float] = None
@@ -0,0 +1,26 @@
+from dataclasses import dataclass, field
+from typing import List
+
+from panderyx.workflows.tools.dtos.tool import ToolConfig
+
+
+@dataclass
+class SelectColumnsConfig(ToolConfig):
+    type: str = "select_columns"
+    max_number_of_inputs: int = 1
+    columns: List[str] = field(default_factory=list)
+
+
+@dataclass
+class HeadConfig(ToolConfig):
+    type: str = "head"
+    max_number_of_inputs: int = 1
+    rows: int = 5
+
+
+@dataclass
+class OptimizeDtypesConfig(ToolConfig):
+    type: str = "optimize_dtypes"
+    max_number_of_inputs: int = 1
+    category_threshold: float = 0.5
+    arrow_strings: bool = False
@@ -0,0 +1,148 @@
+import logging
+import typing
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# strings with at most this ratio of unique values to rows are stored as categories
+DEFAULT_CATEGORY_THRESHOLD = 0.5
+
+
+def optimize_dtypes(
+    df: pd.DataFrame,
+    category_threshold: float = DEFAULT_CATEGORY_THRESHOLD,
+    arrow_strings: bool = False,
+    string_dtypes: typing.Optional[typing.Mapping[typing.Hashable, str]] = None,
+) -> pd.DataFrame:
+    """Returns DataFrame with the same values stored in more compact dtypes.
+
+    Integers are downcast to the smallest integer type holding their values and
+    floats are downcast to float32 only when no precision is lost. Low-cardinality
+    strings are stored as categories and remaining strings optionally as
+    Arrow-backed strings.
+
+    Args:
+        df (pd.DataFrame): DataFrame with default dtypes
+        category_threshold (float): maximum ratio of unique values to rows
+            of strings stored as categories
+        arrow_strings (bool): whether other strings are stored as string[pyarrow]
+        string_dtypes (Optional[Mapping[Hashable, str]]): dtypes of string columns
+            chosen earlier (e.g. for the previous chunks), used instead of
+            the cardinality of the column
+
+    Returns:
+        pd.DataFrame: DataFrame with compact dtypes
+    """
+    columns = {}
+    for column, series in df.items():
+        if pd.api.types.is_integer_dtype(series.dtype):
+            series = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series.dtype):
+            series = _downcast_float(series)
+        elif pd.api.types.is_object_dtype(series.dtype) and (
+            pd.api.types.infer_dtype(series, skipna=True) == "string"
+        ):
+            if string_dtypes is not None and column in string_dtypes:
+                series = series.astype(string_dtypes[column])
+            elif series.nunique() <= category_threshold * len(series):
+                series = series.astype("category")
+            elif arrow_strings:
+                series = series.astype("string[pyarrow]")
+        columns[column] = series
+
+    return pd.DataFrame(columns, index=df.index)
+
+
+def _downcast_float(series: pd.Series) -> pd.Series:
+    downcast_series = series.astype(np.float32)
+    if np.array_equal(downcast_series.to_numpy(), series.to_numpy(), equal_nan=True):
+        return downcast_series
+    return series
+
+
+def get_memory_report(df: pd.DataFrame, optimized_df: pd.DataFrame) -> pd.DataFrame:
+    """Returns dtypes and memory usage of every column before and after optimization."""
+    memory_usage = df.memory_usage(deep=True, index=False)
+    optimized_memory_usage = optimized_df.memory_usage(deep=True, index=False)
+    report = pd.DataFrame(
+        {
+            "dtype": df.dtypes.astype(str),
+            "optimized_dtype": optimized_df.dtypes.astype(str),
+            "bytes": memory_usage,
+            "optimized_bytes": optimized_memory_usage,
+        }
+    )
+    report["saved_bytes"] = report["bytes"] - report["optimized_bytes"]
+    return report
+
+
+class DtypeOptimizer:
+    """Optimizes dtypes of DataFrames (e.g. chunks of a result) and sums memory saved.
+
+    Dtypes of string columns are chosen for the first DataFrame and reused for
+    the following ones, so chunks of a result are concatenated without casting
+    categories back to objects.
+
+    Attributes:
+        bytes (int): memory usage of DataFrames before optimization
+        saved_bytes (int): memory saved by optimization
+        dtypes (Optional[Dict[str, Dict[str, str]]]): dtypes of columns of
+            the first DataFrame before and after optimization
+    """
+
+    def __init__(
+        self,
+        category_threshold: float = DEFAULT_CATEGORY_THRESHOLD,
+        arrow_strings: bool = False,
+    ) -> None:
+        self.category_threshold = category_threshold
+        self.arrow_strings = arrow_strings
+        self.bytes = 0
+        self.saved_bytes = 0
+        self.string_dtypes: typing.Optional[typing.Dict[typing.Hashable, str]] = None
+        self.dtypes: typing.Optional[typing.Dict[str, typing.Dict[str, str]]] = None
+
+    def optimize(self, df: pd.DataFrame) -> pd.DataFrame:
+        optimized_df = optimize_dtypes(
+            df,
+            category_threshold=self.category_threshold,
+            arrow_strings=self.arrow_strings,
+            string_dtypes=self.string_dtypes,
+        )
+        report = get_memory_report(df, optimized_df)
+        if self.string_dtypes is None:
+            self.string_dtypes = {
+                column: str(dtype)
+                for column, dtype in optimized_df.dtypes.items()
+                if pd.api.types.is_object_dtype(df[column].dtype)
+            }
+        if self.dtypes is None:
+            self.dtypes = {
+                str(column): {
+                    "dtype": row["dtype"],
+                    "optimized_dtype": row["optimized_dtype"],
+                }
+                for column, row in report.iterrows()
+            }
+        self.bytes += int(report["bytes"].sum())
+        self.saved_bytes += int(report["saved_bytes"].sum())
+        return optimized_df
+
+    def get_report(self) -> typing.Dict[str, typing.Any]:
+        """Returns JSON-serializable report of memory saved by optimization."""
+        return {
+            "bytes": self.bytes,
+            "saved_bytes": self.saved_bytes,
+            "dtypes": self.dtypes or {},
+        }
+
+    def log(self, tool_id: int) -> None:
+        logger.info(
+            "Optimized dtypes of tool %s result saved %d of %d bytes (%.0f%%).",
+            tool_id,
+            self.saved_bytes,
+            self.bytes,
+            100 * self.saved_bytes / self.bytes if self.bytes else 0,
+        )
@@ -1,11 +1,34 @@
 from enum import Enum
 
-from panderyx.workflows.tools.dtos.input_tools import InputUrlConfig
+from panderyx.workflows.tools.dtos.input_tools import InputFileConfig, InputUrlConfig
 from panderyx.workflows.tools.dtos.preview_tools import DescribeDataConfig
-from panderyx.workflows.tools.serializers.input_tools import InputUrlConfigSerializer
-from panderyx.workflows.tools.serializers.preview_tools import DescribeDataConfigSerializer
-from panderyx.workflows.tools.services.input_tools import InputUrlService
+from panderyx.workflows.tools.dtos.transform_tools import (
+    HeadConfig,
+    OptimizeDtypesConfig,
+    SelectColumnsConfig,
+)
+from panderyx.workflows.tools.serializers.input_tools import (
+    InputFileConfigSerializer,
+    InputUrlConfigSerializer,
+)
+from panderyx.workflows.tools.serializers.preview_tools import (
+    DescribeDataConfigSerializer,
+)
+from panderyx.workflows.tools.serializers.transform_tools import (
+    HeadConfigSerializer,
+    OptimizeDtypesConfigSerializer,
+    SelectColumnsConfigSerializer,
+)
+from panderyx.workflows.tools.services.input_tools import (
+    InputFileService,
+    InputUrlService,
+)
 from panderyx.workflows.tools.services.preview_tools import DescribeDataService
+from panderyx.workflows.tools.services.transform_tools import (
+    HeadService,
+    OptimizeDtypesService,
+    SelectColumnsService,
+)
 
 
 class ToolMapping(Enum):
@@ -15,9 +38,33 @@ class ToolMapping(Enum):
         "service": InputUrlService,
         "max_number_of_inputs": 0,
     }
+    input_file = {
+        "dto": InputFileConfig,
+        "serializer": InputFileConfigSerializer,
+        "service": InputFileService,
+        "max_number_of_inputs": 0,
+    }
     describe_data = {
         "dto": DescribeDataConfig,
         "serializer": DescribeDataConfigSerializer,
         "service": DescribeDataService,
         "max_number_of_inputs": 1,
     }
+    select_columns = {
+        "dto": SelectColumnsConfig,
+        "serializer": SelectColumnsConfigSerializer,
+        "service": SelectColumnsService,
+        "max_number_of_inputs": 1,
+    }
+    head = {
+        "dto": HeadConfig,
+        "serializer": HeadConfigSerializer,
+        "service": HeadService,
+        "max_number_of_inputs": 1,
+    }
+    optimize_dtypes = {
+        "dto": OptimizeDtypesConfig,
+        "serializer": OptimizeDtypesConfigSerializer,
+        "service": OptimizeDtypesService,
+        "max_number_of_inputs": 1,
+    }
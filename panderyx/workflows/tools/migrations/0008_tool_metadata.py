@@ -0,0 +1,18 @@
+# Generated by Django 4.0.1 on 2026-10-18 02:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tools', '0007_alter_tool_unique_together'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tool',
+            name='metadata',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
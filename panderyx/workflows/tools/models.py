@@ -22,6 +22,8 @@ class Tool(models.Model):
         "self", symmetrical=False, related_name="outputs", blank=True
     )
     config = models.JSONField()
+    # data recorded by tool services between runs, e.g. pinned schemas of inputs
+    metadata = models.JSONField(default=dict, blank=True)
 
     class Meta:
         ordering = ["workflow", "name"]
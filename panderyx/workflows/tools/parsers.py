@@ -0,0 +1,453 @@
+import os
+import typing
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pa_parquet
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from panderyx.workflows.tools.services.tool import concat_chunks
+
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".zip": "zip",
+    ".xz": "xz",
+    ".zst": "zstd",
+}
+FILE_FORMATS = {
+    "csv": "csv",
+    "txt": "csv",
+    "tsv": "csv",
+    "parquet": "parquet",
+    "pq": "parquet",
+    "feather": "feather",
+    "arrow": "feather",
+    "jsonl": "jsonl",
+    "ndjson": "jsonl",
+}
+# files with unknown extensions are parsed as CSV
+DEFAULT_FILE_FORMAT = "csv"
+
+
+def get_compression(url: str) -> typing.Optional[str]:
+    """Returns compression of the file inferred from the extension of URL's path."""
+    path = urlparse(url).path
+    for extension, compression in COMPRESSION_EXTENSIONS.items():
+        if path.endswith(extension):
+            return compression
+    return None
+
+
+def get_extension(url: str, extension: str = "") -> str:
+    """Returns configured extension or the one of URL's path without compression."""
+    if not extension:
+        path = urlparse(url).path
+        if get_compression(url) is not None:
+            path = os.path.splitext(path)[0]
+        extension = os.path.splitext(path)[1]
+
+    return extension.lstrip(".").lower()
+
+
+@dataclass
+class ReadOptions:
+    """Options of parsing a file shared by all of the parse engines.
+
+    Attributes:
+        file_format (str): one of FILE_FORMATS values
+        separator (str): separator of CSV fields
+        compression (Optional[str]): compression of CSV and JSON lines files
+        columns (Optional[List[str]]): columns to be parsed, None for all columns,
+            columns missing from the file are skipped
+        rows (Optional[int]): number of leading rows to be parsed, None for all rows
+        dtypes (Optional[Dict[str, str]]): pandas dtypes of CSV columns that are
+            not inferred, e.g. of a pinned schema
+    """
+
+    file_format: str = DEFAULT_FILE_FORMAT
+    separator: str = ","
+    compression: typing.Optional[str] = None
+    columns: typing.Optional[typing.List[str]] = None
+    rows: typing.Optional[int] = None
+    dtypes: typing.Optional[typing.Dict[str, str]] = None
+
+    @classmethod
+    def from_config(
+        cls, config: typing.Dict[str, typing.Any], **options: typing.Any
+    ) -> "ReadOptions":
+        """Builds options from extension and separator of the config and from
+        the URL (InputUrlConfig) or the storage name (InputFileConfig) of the file."""
+        url = config["url"] if "url" in config else config["file"]
+        extension = get_extension(url, config.get("extension", ""))
+        separator = config.get("separator") or ("\t" if extension == "tsv" else ",")
+        return cls(
+            file_format=FILE_FORMATS.get(extension, DEFAULT_FILE_FORMAT),
+            separator=separator,
+            # compression cannot be inferred from streamed responses
+            compression=get_compression(url),
+            **options,
+        )
+
+
+class ParseEngine(ABC):
+    """Parses files of all supported formats into DataFrames.
+
+    Sources are binary file objects or URLs readable by pandas. Parquet and
+    Feather sources have to be seekable. Arrow files (e.g. memory-mapped files)
+    are read by pyarrow without copying their uncompressed content.
+    """
+
+    def read(self, source: typing.Any, options: ReadOptions) -> pd.DataFrame:
+        if options.file_format == "csv":
+            return self.read_csv(source, options)
+        return concat_chunks(self.read_chunks(source, options, chunk_rows=None))
+
+    def read_chunks(
+        self,
+        source: typing.Any,
+        options: ReadOptions,
+        chunk_rows: typing.Optional[int],
+    ) -> typing.Iterator[pd.DataFrame]:
+        """Yields chunks of chunk_rows rows (or a single chunk if it is None)."""
+        if options.file_format == "csv":
+            if chunk_rows is None:
+                yield self.read_csv(source, options)
+            else:
+                yield from self.read_csv_chunks(source, options, chunk_rows)
+        elif options.file_format == "jsonl":
+            yield from self._read_jsonl_chunks(source, options, chunk_rows)
+        else:
+            yield from self._read_arrow_chunks(source, options, chunk_rows)
+
+    @abstractmethod
+    def read_csv(self, source: typing.Any, options: ReadOptions) -> pd.DataFrame:
+        """Returns DataFrame parsed from a CSV file."""
+
+    @abstractmethod
+    def read_csv_chunks(
+        self, source: typing.Any, options: ReadOptions, chunk_rows: int
+    ) -> typing.Iterator[pd.DataFrame]:
+        """Yields chunks of DataFrame parsed from a CSV file."""
+
+    @staticmethod
+    def _read_jsonl_chunks(
+        source: typing.Any, options: ReadOptions, chunk_rows: typing.Optional[int]
+    ) -> typing.Iterator[pd.DataFrame]:
+        with pd.read_json(
+            source,
+            lines=True,
+            chunksize=chunk_rows or options.rows or 100_000,
+            nrows=options.rows,
+            compression=options.compression,
+        ) as reader:
+            for chunk in reader:
+                if options.columns is not None:
+                    chunk = chunk[[c for c in chunk.columns if c in options.columns]]
+                yield chunk
+
+    @staticmethod
+    def _read_arrow_chunks(
+        source: typing.Any, options: ReadOptions, chunk_rows: typing.Optional[int]
+    ) -> typing.Iterator[pd.DataFrame]:
+        """Yields chunks of Parquet or Feather files read with pyarrow."""
+        if options.file_format == "parquet":
+            parquet_file = pa_parquet.ParquetFile(source)
+            columns = get_present_columns(
+                parquet_file.schema_arrow.names, options.columns
+            )
+            schema = pa.schema(
+                [parquet_file.schema_arrow.field(column) for column in columns]
+            )
+            if chunk_rows is None and options.rows is None:
+                batches = parquet_file.read(columns=columns).to_batches()
+            else:
+                batches = parquet_file.iter_batches(
+                    batch_size=chunk_rows or max(options.rows, 1), columns=columns
+                )
+        else:
+            table = pa.ipc.open_file(source).read_all()
+            table = table.select(
+                get_present_columns(table.schema.names, options.columns)
+            )
+            schema, batches = table.schema, table.to_batches()
+
+        yield from rechunk_batches(batches, schema, options.rows, chunk_rows)
+
+
+class PandasParseEngine(ParseEngine):
+    """Parses CSV files with the single-threaded pandas C parser."""
+
+    def read_csv(self, source: typing.Any, options: ReadOptions) -> pd.DataFrame:
+        return pd.read_csv(source, **self._get_csv_options(options))
+
+    def read_csv_chunks(
+        self, source: typing.Any, options: ReadOptions, chunk_rows: int
+    ) -> typing.Iterator[pd.DataFrame]:
+        with pd.read_csv(
+            source, chunksize=chunk_rows, **self._get_csv_options(options)
+        ) as reader:
+            yield from reader
+
+    @staticmethod
+    def _get_csv_options(options: ReadOptions) -> typing.Dict[str, typing.Any]:
+        csv_options = {
+            "sep": options.separator,
+            # only columns used by downstream tools are parsed, missing columns
+            # are reported by the tools that use them
+            "usecols": (
+                None if options.columns is None else set(options.columns).__contains__
+            ),
+            "nrows": options.rows,
+            "compression": options.compression,
+        }
+        if options.dtypes:
+            dtypes = get_selected_dtypes(options)
+            # pandas parses dates with parse_dates instead of dtype
+            csv_options["parse_dates"] = [
+                column for column, dtype in dtypes.items() if is_datetime(dtype)
+            ]
+            csv_options["dtype"] = {
+                column: dtype
+                for column, dtype in dtypes.items()
+                if not is_datetime(dtype)
+            }
+        return csv_options
+
+
+class ArrowParseEngine(ParseEngine):
+    """Parses CSV files with the multithreaded pyarrow CSV reader.
+
+    Unlike pandas, pyarrow parses ISO-8601 dates and timestamps into datetime
+    columns. URLs and compressions unsupported by pyarrow (zip, xz) are parsed
+    with pandas.
+    """
+
+    arrow_compressions = (None, "gzip", "bz2", "zstd")
+
+    def __init__(self) -> None:
+        self.pandas_engine = PandasParseEngine()
+
+    def read_csv(self, source: typing.Any, options: ReadOptions) -> pd.DataFrame:
+        if not self._is_supported(source, options):
+            return self.pandas_engine.read_csv(source, options)
+        # streaming reader is used to stop parsing after the leading rows
+        if options.rows is not None:
+            return concat_chunks(self.read_csv_chunks(source, options, options.rows))
+
+        csv_options = self._get_csv_options(source, options)
+        with self._open(source, options) as stream:
+            table = pa_csv.read_csv(stream, **csv_options)
+        return to_pandas(table.select(self._get_columns(table, options)))
+
+    def read_csv_chunks(
+        self, source: typing.Any, options: ReadOptions, chunk_rows: int
+    ) -> typing.Iterator[pd.DataFrame]:
+        if not self._is_supported(source, options):
+            yield from self.pandas_engine.read_csv_chunks(source, options, chunk_rows)
+            return
+
+        csv_options = self._get_csv_options(source, options)
+        with self._open(source, options) as stream:
+            reader = pa_csv.open_csv(stream, **csv_options)
+            columns = self._get_columns(reader, options)
+            for chunk in rechunk_batches(
+                reader, reader.schema, options.rows, chunk_rows
+            ):
+                yield chunk[columns]
+
+    def _get_csv_options(
+        self, source: typing.Any, options: ReadOptions
+    ) -> typing.Dict[str, typing.Any]:
+        # empty strings are missing values like in pandas
+        convert_options = {"strings_can_be_null": True}
+        if options.dtypes:
+            column_types = {
+                column: get_arrow_type(dtype)
+                for column, dtype in get_selected_dtypes(options).items()
+            }
+            convert_options["column_types"] = {
+                column: arrow_type
+                for column, arrow_type in column_types.items()
+                if arrow_type is not None
+            }
+        csv_options = {
+            "read_options": pa_csv.ReadOptions(use_threads=True),
+            "parse_options": pa_csv.ParseOptions(delimiter=options.separator),
+            "convert_options": pa_csv.ConvertOptions(**convert_options),
+        }
+        # header is read up front to parse only present columns of the file,
+        # columns of streamed responses are selected after being parsed
+        if options.columns is not None and source.seekable():
+            with self._open(source, options) as stream:
+                names = pa_csv.open_csv(stream, **csv_options).schema.names
+            csv_options["convert_options"] = pa_csv.ConvertOptions(
+                include_columns=get_present_columns(names, options.columns),
+                **convert_options,
+            )
+        return csv_options
+
+    @staticmethod
+    def _get_columns(table: typing.Any, options: ReadOptions) -> typing.List[str]:
+        return get_present_columns(table.schema.names, options.columns)
+
+    def _is_supported(self, source: typing.Any, options: ReadOptions) -> bool:
+        return (
+            not isinstance(source, str)
+            and options.compression in self.arrow_compressions
+        )
+
+    @staticmethod
+    @contextmanager
+    def _open(source: typing.Any, options: ReadOptions) -> typing.Iterator[typing.Any]:
+        if source.seekable():
+            source.seek(0)
+        if isinstance(source, pa.NativeFile) and options.compression is None:
+            yield source
+            return
+        # closing pyarrow streams closes the wrapped files, which are closed
+        # by their owners instead
+        with pa.input_stream(
+            BorrowedFile(source), compression=options.compression
+        ) as stream:
+            yield stream
+
+
+class BorrowedFile:
+    """Proxy of a file object that is closed by its owner and not by its readers."""
+
+    def __init__(self, file: typing.Any) -> None:
+        self.file = file
+
+    def __getattr__(self, name: str) -> typing.Any:
+        return getattr(self.file, name)
+
+    def close(self) -> None:
+        pass
+
+
+def to_pandas(table: pa.Table, start: int = 0) -> pd.DataFrame:
+    """Returns DataFrame of the table's rows indexed with row numbers from start."""
+    df = table.to_pandas(date_as_object=False)
+    df.index = pd.RangeIndex(start, start + len(df))
+    return df
+
+
+def get_present_columns(
+    names: typing.List[str], columns: typing.Optional[typing.List[str]]
+) -> typing.List[str]:
+    """Returns names of columns of the file that are to be parsed in file's order."""
+    if columns is None:
+        return list(names)
+    return [name for name in names if name in set(columns)]
+
+
+def get_selected_dtypes(options: ReadOptions) -> typing.Dict[str, str]:
+    """Returns pinned dtypes of columns that are to be parsed."""
+    if options.columns is None:
+        return dict(options.dtypes)
+    return {
+        column: dtype
+        for column, dtype in options.dtypes.items()
+        if column in set(options.columns)
+    }
+
+
+def is_datetime(dtype: str) -> bool:
+    return pd.api.types.is_datetime64_any_dtype(pd.api.types.pandas_dtype(dtype))
+
+
+def get_arrow_type(dtype: str) -> typing.Optional[pa.DataType]:
+    """Returns Arrow type that is converted into the pandas dtype by to_pandas,
+    None for dtypes that have no such type (e.g. categories)."""
+    pandas_dtype = pd.api.types.pandas_dtype(dtype)
+    if isinstance(pandas_dtype, pd.DatetimeTZDtype):
+        return pa.timestamp(pandas_dtype.unit, tz=str(pandas_dtype.tz))
+    if pandas_dtype == object:
+        return pa.string()
+    if not isinstance(pandas_dtype, np.dtype):
+        return None
+    try:
+        return pa.from_numpy_dtype(pandas_dtype)
+    except (NotImplementedError, pa.ArrowNotImplementedError, TypeError):
+        return None
+
+
+def read_csv_header(
+    source: typing.Any, options: ReadOptions
+) -> typing.Optional[typing.List[str]]:
+    """Returns names of all columns of a CSV file, None for sources that cannot
+    be read twice (URLs read by pandas and streamed responses)."""
+    if isinstance(source, str) or not source.seekable():
+        return None
+
+    if options.compression in ArrowParseEngine.arrow_compressions:
+        with ArrowParseEngine._open(source, options) as stream:
+            header = pa_csv.open_csv(
+                stream,
+                parse_options=pa_csv.ParseOptions(delimiter=options.separator),
+            ).schema.names
+    else:
+        source.seek(0)
+        header = list(
+            pd.read_csv(
+                source, sep=options.separator, nrows=0, compression=options.compression
+            ).columns
+        )
+    source.seek(0)
+
+    return header
+
+
+def rechunk_batches(
+    batches: typing.Iterable[typing.Any],
+    schema: typing.Any,
+    rows: typing.Optional[int],
+    chunk_rows: typing.Optional[int],
+) -> typing.Iterator[pd.DataFrame]:
+    """Yields DataFrames of chunk_rows rows (or a single DataFrame if it is None)
+    from Arrow record batches, stopping after the leading rows."""
+    pending_batches, pending_rows, total_rows, is_empty = [], 0, 0, True
+    # chunks are indexed with consecutive row numbers like chunks read by pandas
+    start = 0
+    for batch in batches:
+        if rows is not None:
+            batch = batch.slice(0, rows - total_rows)
+        pending_batches.append(batch)
+        pending_rows += batch.num_rows
+        total_rows += batch.num_rows
+
+        while chunk_rows is not None and pending_rows >= chunk_rows:
+            table = pa.Table.from_batches(pending_batches, schema=schema)
+            yield to_pandas(table.slice(0, chunk_rows), start)
+            start += chunk_rows
+            is_empty = False
+            pending_batches = table.slice(chunk_rows).to_batches()
+            pending_rows -= chunk_rows
+
+        if rows is not None and total_rows >= rows:
+            break
+
+    # empty files are returned as a DataFrame with columns and without rows
+    if pending_rows or is_empty:
+        table = pa.Table.from_batches(pending_batches, schema=schema)
+        yield to_pandas(table, start)
+
+
+def get_parse_engine() -> ParseEngine:
+    """Returns parse engine selected with WORKFLOW_PARSE_ENGINE setting."""
+    engine = settings.WORKFLOW_PARSE_ENGINE
+
+    if engine == "pyarrow":
+        return ArrowParseEngine()
+    if engine == "pandas":
+        return PandasParseEngine()
+
+    raise ImproperlyConfigured(f"Unknown input parse engine: {engine}.")
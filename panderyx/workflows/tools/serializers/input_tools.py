@@ -1,10 +1,51 @@
 from rest_framework import serializers
 
+from panderyx.workflows.models import Upload
+from panderyx.workflows.tools.parsers import FILE_FORMATS
 from panderyx.workflows.tools.serializers.tool_config import ToolConfigSerializer
 
 
-class InputUrlConfigSerializer(ToolConfigSerializer):
-    max_number_of_inputs = serializers.IntegerField(min_value=0, max_value=0, read_only=True)
-    url = serializers.URLField(allow_blank=True)
+class InputConfigSerializer(ToolConfigSerializer):
+    max_number_of_inputs = serializers.IntegerField(
+        min_value=0, max_value=0, read_only=True
+    )
     extension = serializers.CharField(allow_blank=True)
     separator = serializers.CharField(allow_blank=True)
+    optimize_dtypes = serializers.BooleanField(required=False, default=False)
+
+    def validate_extension(self, value):
+        if value and value.lstrip(".").lower() not in FILE_FORMATS:
+            raise serializers.ValidationError(
+                f"Supported extensions: {', '.join(FILE_FORMATS)}."
+            )
+        return value
+
+
+class InputUrlConfigSerializer(InputConfigSerializer):
+    url = serializers.URLField(allow_blank=True)
+
+
+class InputFileConfigSerializer(InputConfigSerializer):
+    upload = serializers.UUIDField()
+    # set from the upload when the tool is saved, so the file is read without
+    # DB queries by workers
+    file = serializers.CharField(read_only=True)
+
+    def validate_upload(self, value):
+        uploads = Upload.objects.filter(id=value, status=Upload.Status.COMPLETED)
+        # uploads of other users are hidden from tools of a workflow
+        workflow = self.context.get("workflow")
+        if workflow is not None:
+            uploads = uploads.filter(user=workflow.user_id)
+        upload = uploads.first()
+        if upload is None:
+            raise serializers.ValidationError(
+                "Provided upload does not exist or is not completed."
+            )
+        return upload
+
+    def validate(self, data):
+        upload = data["upload"]
+        data["upload"] = str(upload.id)
+        data["file"] = upload.file.name
+        return data
@@ -4,5 +4,26 @@ from panderyx.workflows.tools.serializers.tool_config import ToolConfigSerialize
 
 
 class DescribeDataConfigSerializer(ToolConfigSerializer):
-    max_number_of_inputs = serializers.IntegerField(min_value=1, max_value=1, read_only=True)
+    max_number_of_inputs = serializers.IntegerField(
+        min_value=1, max_value=1, read_only=True
+    )
     data_type = serializers.IntegerField(min_value=0, max_value=3)
+    sample_size = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+    relative_error = serializers.FloatField(
+        min_value=0, max_value=1, required=False, allow_null=True
+    )
+
+    def validate_relative_error(self, value):
+        if value == 0:
+            raise serializers.ValidationError("Relative error has to be positive.")
+        return value
+
+    def validate(self, data):
+        if (
+            data.get("sample_size") is not None
+            and data.get("relative_error") is not None
+        ):
+            raise serializers.ValidationError(
+                "Sample can be defined either by its size or by a relative error."
+            )
+        return data
@@ -2,8 +2,13 @@ from dataclasses import asdict
 
 import pytest
 
-from panderyx.workflows.tools.dtos.input_tools import InputUrlConfig
-from panderyx.workflows.tools.serializers.input_tools import InputUrlConfigSerializer
+from panderyx.workflows.models import Upload
+from panderyx.workflows.test.factories import UploadFactory, WorkflowFactory
+from panderyx.workflows.tools.dtos.input_tools import InputFileConfig, InputUrlConfig
+from panderyx.workflows.tools.serializers.input_tools import (
+    InputFileConfigSerializer,
+    InputUrlConfigSerializer,
+)
 
 
 class TestInputUrlConfigSerializer:
@@ -41,3 +46,65 @@ class TestInputUrlConfigSerializer:
         serializer = InputUrlConfigSerializer(data=data)
 
         assert serializer.is_valid() is False
+
+    @pytest.mark.parametrize("extension", ["", "csv", ".parquet", "JSONL"])
+    def test_serializer_with_supported_extension(self, extension):
+        data = self.valid_data.copy()
+        data["extension"] = extension
+        serializer = InputUrlConfigSerializer(data=data)
+
+        assert serializer.is_valid() is True
+
+    def test_serializer_with_unsupported_extension(self):
+        data = self.valid_data.copy()
+        data["extension"] = "xlsx"
+        serializer = InputUrlConfigSerializer(data=data)
+
+        assert serializer.is_valid() is False
+
+
+@pytest.mark.django_db()
+class TestInputFileConfigSerializer:
+    @pytest.fixture()
+    def setUp(self):
+        self.upload = UploadFactory()
+        self.valid_data = asdict(InputFileConfig(upload=str(self.upload.id)))
+
+    def test_serializer_with_valid_data(self, setUp):
+        serializer = InputFileConfigSerializer(data=self.valid_data)
+
+        assert serializer.is_valid() is True
+        # file is read from the storage without looking up the upload
+        assert serializer.validated_data["file"] == self.upload.file.name
+
+    def test_serializer_with_file_of_another_upload(self, setUp):
+        other_upload = UploadFactory()
+        data = {**self.valid_data, "file": other_upload.file.name}
+        serializer = InputFileConfigSerializer(data=data)
+
+        assert serializer.is_valid() is True
+        assert serializer.validated_data["file"] == self.upload.file.name
+
+    def test_serializer_with_upload_in_progress(self, setUp):
+        Upload.objects.filter(id=self.upload.id).update(
+            status=Upload.Status.IN_PROGRESS
+        )
+        serializer = InputFileConfigSerializer(data=self.valid_data)
+
+        assert serializer.is_valid() is False
+
+    def test_serializer_with_upload_of_another_user(self, setUp):
+        workflow = WorkflowFactory()
+        serializer = InputFileConfigSerializer(
+            data=self.valid_data, context={"workflow": workflow}
+        )
+
+        assert serializer.is_valid() is False
+
+    def test_serializer_with_upload_of_workflow_owner(self, setUp):
+        workflow = WorkflowFactory(user=self.upload.user)
+        serializer = InputFileConfigSerializer(
+            data=self.valid_data, context={"workflow": workflow}
+        )
+
+        assert serializer.is_valid() is True
@@ -46,3 +46,27 @@ class TestDescribeDataConfigSerializer:
             assert "Ensure this value is greater than or equal to 0." in str(
                 exc.value.detail.get("data_type")
             )
+
+    @pytest.mark.parametrize(
+        "sample_size,relative_error", [(1000, None), (None, 0.05), (None, None)]
+    )
+    def test_serializer_with_approximate_mode(self, sample_size, relative_error):
+        data = self.valid_data.copy()
+        data["sample_size"] = sample_size
+        data["relative_error"] = relative_error
+        serializer = DescribeDataConfigSerializer(data=data)
+
+        assert serializer.is_valid() is True
+
+    @pytest.mark.parametrize(
+        "sample_size,relative_error", [(0, None), (None, 0), (None, 2), (1000, 0.05)]
+    )
+    def test_serializer_with_invalid_approximate_mode(
+        self, sample_size, relative_error
+    ):
+        data = self.valid_data.copy()
+        data["sample_size"] = sample_size
+        data["relative_error"] = relative_error
+        serializer = DescribeDataConfigSerializer(data=data)
+
+        assert serializer.is_valid() is False
@@ -0,0 +1,54 @@
+from dataclasses import asdict
+
+from panderyx.workflows.tools.dtos.transform_tools import (
+    HeadConfig,
+    OptimizeDtypesConfig,
+    SelectColumnsConfig,
+)
+from panderyx.workflows.tools.serializers.transform_tools import (
+    HeadConfigSerializer,
+    OptimizeDtypesConfigSerializer,
+    SelectColumnsConfigSerializer,
+)
+
+
+class TestSelectColumnsConfigSerializer:
+    def test_serializer_with_valid_data(self):
+        data = asdict(SelectColumnsConfig(columns=["a", "b"]))
+        serializer = SelectColumnsConfigSerializer(data=data)
+
+        assert serializer.is_valid() is True
+
+    def test_serializer_without_columns(self):
+        serializer = SelectColumnsConfigSerializer(data=asdict(SelectColumnsConfig()))
+
+        assert serializer.is_valid() is False
+        assert "columns" in serializer.errors
+
+
+class TestHeadConfigSerializer:
+    def test_serializer_with_valid_data(self):
+        serializer = HeadConfigSerializer(data=asdict(HeadConfig(rows=10)))
+
+        assert serializer.is_valid() is True
+
+    def test_serializer_with_negative_rows(self):
+        serializer = HeadConfigSerializer(data=asdict(HeadConfig(rows=-1)))
+
+        assert serializer.is_valid() is False
+        assert "rows" in serializer.errors
+
+
+class TestOptimizeDtypesConfigSerializer:
+    def test_serializer_with_valid_data(self):
+        data = asdict(OptimizeDtypesConfig(arrow_strings=True))
+        serializer = OptimizeDtypesConfigSerializer(data=data)
+
+        assert serializer.is_valid() is True
+
+    def test_serializer_with_invalid_threshold(self):
+        data = asdict(OptimizeDtypesConfig(category_threshold=2))
+        serializer = OptimizeDtypesConfigSerializer(data=data)
+
+        assert serializer.is_valid() is False
+        assert "category_threshold" in serializer.errors
@@ -40,8 +40,12 @@ class ConfigField(serializers.Field):
 
         tool_type = data.get("type")
         serializer = ToolMapping[tool_type].value["serializer"]
-        config_serializer = serializer(data=data)
+        config_serializer = serializer(data=data, context=self.context)
         config_serializer.is_valid(raise_exception=True)
+        # fields set by config serializers (e.g. file of an upload) are stored
+        for name, field in config_serializer.fields.items():
+            if field.read_only and name in config_serializer.validated_data:
+                data[name] = config_serializer.validated_data[name]
 
         return data
 
@@ -55,6 +59,7 @@ class ToolSerializer(serializers.ModelSerializer):
         read_only_fields = [
             "workflow",
             "max_number_of_inputs",
+            "metadata",
         ]
 
     def validate_inputs(self, value):
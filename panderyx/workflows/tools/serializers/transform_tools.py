@@ -0,0 +1,25 @@
+from rest_framework import serializers
+
+from panderyx.workflows.tools.serializers.tool_config import ToolConfigSerializer
+
+
+class SelectColumnsConfigSerializer(ToolConfigSerializer):
+    max_number_of_inputs = serializers.IntegerField(
+        min_value=1, max_value=1, read_only=True
+    )
+    columns = serializers.ListField(child=serializers.CharField(), allow_empty=False)
+
+
+class HeadConfigSerializer(ToolConfigSerializer):
+    max_number_of_inputs = serializers.IntegerField(
+        min_value=1, max_value=1, read_only=True
+    )
+    rows = serializers.IntegerField(min_value=0)
+
+
+class OptimizeDtypesConfigSerializer(ToolConfigSerializer):
+    max_number_of_inputs = serializers.IntegerField(
+        min_value=1, max_value=1, read_only=True
+    )
+    category_threshold = serializers.FloatField(min_value=0, max_value=1)
+    arrow_strings = serializers.BooleanField()
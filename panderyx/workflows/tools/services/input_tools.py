@@ -1,13 +1,272 @@
-from typing import Dict
+import itertools
+import os
+import shutil
+import tempfile
+import typing
+from abc import abstractmethod
+from contextlib import contextmanager
+from urllib.parse import urlparse
 
 import pandas as pd
+import pyarrow as pa
+from django.core.files.storage import default_storage
 
+from panderyx.workflows.caching import get_download_cache
+from panderyx.workflows.exceptions import ToolServiceException
+from panderyx.workflows.fetching import (
+    FETCH_BUFFER_BYTES,
+    FetchBudget,
+    FetchBudgetExceeded,
+    fetch,
+)
+from panderyx.workflows.tools.dtypes import DtypeOptimizer
+from panderyx.workflows.tools.parsers import (
+    ReadOptions,
+    get_parse_engine,
+    read_csv_header,
+)
 from panderyx.workflows.tools.services.tool import ToolService
 
 
-class InputUrlService(ToolService):
-    def run_tool(self, inputs: Dict[int, pd.DataFrame]) -> pd.DataFrame:
-        config = self.tool.config
-        df = pd.read_csv(config["url"])
+class FileInputService(ToolService):
+    """Parses a file opened by a subclass into the tool's result.
+
+    Schema (header and dtypes) of a CSV file parsed as a whole is pinned in
+    the tool's metadata and later reads of the file parse columns into pinned
+    dtypes instead of inferring them. Schema is inferred again when the source
+    or the header of the file changes, or when values no longer fit pinned
+    dtypes. Schemas are pinned only for sources that can be read twice
+    (files and cached downloads), since the header is read before parsing.
+    """
+
+    chunked = True
+
+    def run_tool(self, inputs: typing.Dict[int, pd.DataFrame]) -> pd.DataFrame:
+        read_options = self.get_read_options()
+        with self.open_source() as source:
+            header = self.pin_schema(source, read_options)
+            try:
+                df = get_parse_engine().read(source, read_options)
+            except ValueError:
+                if read_options.dtypes is None:
+                    raise
+                # values of the file do not fit its pinned schema anymore
+                read_options.dtypes = None
+                source.seek(0)
+                df = get_parse_engine().read(source, read_options)
+
+        # dtypes of leading rows may differ from the dtypes of the whole file
+        if header is not None and self.rows is None:
+            self.record_schema(header, df, is_pinned=read_options.dtypes is not None)
+
+        if self.tool.config.get("optimize_dtypes"):
+            optimizer = DtypeOptimizer()
+            df = optimizer.optimize(df)
+            optimizer.log(self.tool.id)
+            self.set_metadata("dtype_report", optimizer.get_report())
 
         return df
+
+    def run_tool_chunked(
+        self, inputs: typing.Dict[int, typing.Iterator[pd.DataFrame]], chunk_rows: int
+    ) -> typing.Iterator[pd.DataFrame]:
+        read_options = self.get_read_options()
+        optimizer = (
+            DtypeOptimizer() if self.tool.config.get("optimize_dtypes") else None
+        )
+        with self.open_source() as source:
+            self.pin_schema(source, read_options)
+            chunks = get_parse_engine().read_chunks(source, read_options, chunk_rows)
+            try:
+                first_chunks = [next(chunks)]
+            except StopIteration:
+                first_chunks = []
+            except ValueError:
+                if read_options.dtypes is None:
+                    raise
+                chunks.close()
+                read_options.dtypes = None
+                source.seek(0)
+                chunks = get_parse_engine().read_chunks(
+                    source, read_options, chunk_rows
+                )
+                first_chunks = []
+
+            for chunk in itertools.chain(first_chunks, chunks):
+                yield chunk if optimizer is None else optimizer.optimize(chunk)
+
+        if optimizer is not None:
+            optimizer.log(self.tool.id)
+            self.set_metadata("dtype_report", optimizer.get_report())
+
+    @abstractmethod
+    def open_source(self) -> typing.ContextManager[typing.Any]:
+        """Returns context manager of the source of the file read by parse engines."""
+
+    @abstractmethod
+    def get_source_name(self) -> str:
+        """Returns URL or path of the file, which identifies its pinned schema."""
+
+    def pin_schema(
+        self, source: typing.Any, read_options: ReadOptions
+    ) -> typing.Optional[typing.List[str]]:
+        """Sets dtypes of read options to the pinned schema if it matches the file.
+
+        Returns:
+            Optional[List[str]]: header of the CSV file, None if it cannot be read
+        """
+        if read_options.file_format != "csv":
+            return None
+        header = read_csv_header(source, read_options)
+        schema = self.tool.metadata.get("schema")
+        if (
+            header is not None
+            and schema is not None
+            and schema.get("source") == self.get_source_name()
+            and schema["header"] == header
+        ):
+            read_options.dtypes = schema["dtypes"]
+        return header
+
+    def record_schema(
+        self, header: typing.List[str], df: pd.DataFrame, is_pinned: bool
+    ) -> None:
+        """Pins dtypes of parsed columns, merged with pinned dtypes of other columns
+        if the pinned schema still matches the file."""
+        dtypes = {column: str(dtype) for column, dtype in df.dtypes.items()}
+        schema = self.tool.metadata.get("schema")
+        if is_pinned:
+            dtypes = {**schema["dtypes"], **dtypes}
+        dtypes = {column: dtypes[column] for column in header if column in dtypes}
+
+        new_schema = {
+            "source": self.get_source_name(),
+            "header": header,
+            "dtypes": dtypes,
+        }
+        if new_schema != schema:
+            self.set_metadata("schema", new_schema)
+
+    def get_read_options(self) -> ReadOptions:
+        return ReadOptions.from_config(
+            self.tool.config, columns=self.columns, rows=self.rows
+        )
+
+
+class InputUrlService(FileInputService):
+    """Parses a file from the tool's URL.
+
+    Downloads are limited by the fetch budget of the tool and its user.
+    """
+
+    @contextmanager
+    def open_source(self) -> typing.Iterator[typing.Any]:
+        """Yields the opened file, its cached copy, its HTTP response or its URL.
+
+        Files downloaded over HTTP(S) are read from the download cache, except
+        for files that are not cached yet and of which only leading rows are
+        parsed. Without the cache, responses of CSV files are fed to the parser
+        as they are downloaded. Other formats require seekable files, so their
+        responses are spooled to a temporary file. URLs with other schemes are
+        read by pandas.
+        """
+        url = self.tool.config["url"]
+        scheme = urlparse(url).scheme
+        if not scheme:
+            with open(url, "rb") as file:
+                yield file
+            return
+        if scheme not in ("http", "https"):
+            yield url
+            return
+
+        download_cache = get_download_cache()
+        budget = self.get_fetch_budget()
+        # downloads can be aborted while the file is parsed
+        with self.raise_fetch_errors():
+            if download_cache is not None and (
+                self.rows is None or url in download_cache
+            ):
+                with download_cache.open(
+                    url, budget, revalidate=url not in self.fresh_urls
+                ) as file:
+                    yield file
+            elif self.get_read_options().file_format == "csv":
+                with fetch(url, budget) as response:
+                    yield response
+            else:
+                with fetch(url, budget) as response, tempfile.TemporaryFile() as file:
+                    shutil.copyfileobj(response, file, FETCH_BUFFER_BYTES)
+                    file.seek(0)
+                    yield file
+
+    def get_source_name(self) -> str:
+        return self.tool.config["url"]
+
+    def get_source_version(self) -> typing.Optional[str]:
+        # changes of local files are detected by their modification time and size,
+        # remote files are revalidated only once their result expires
+        url = self.tool.config.get("url", "")
+        if urlparse(url).scheme:
+            return None
+        try:
+            stat = os.stat(url)
+        except OSError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def get_fetch_budget(self) -> FetchBudget:
+        # workflow of a tool from the plan is loaded together with the tool
+        return FetchBudget.from_settings(user_id=self.tool.workflow.user_id)
+
+    @contextmanager
+    def raise_fetch_errors(self) -> typing.Iterator[None]:
+        try:
+            yield
+        except FetchBudgetExceeded as exc:
+            raise ToolServiceException(
+                tool_id=self.tool.id, message=str(exc), code="fetch_limit_exceeded"
+            ) from exc
+
+    def get_prefetch_urls(self) -> typing.List[str]:
+        # files whose leading rows are streamed are not downloaded as a whole
+        url = self.tool.config.get("url", "")
+        if urlparse(url).scheme in ("http", "https") and self.rows is None:
+            return [url]
+        return []
+
+
+class InputFileService(FileInputService):
+    """Parses a file uploaded to the default storage.
+
+    Files of storages with local paths (MEDIA_ROOT) are memory-mapped, so pages
+    of the file are read on demand and CSV, Parquet and Feather files are parsed
+    by pyarrow without copying them into Python buffers. Files of other storages
+    (e.g. S3) are read from the storage's file objects.
+    """
+
+    @contextmanager
+    def open_source(self) -> typing.Iterator[typing.Any]:
+        name = self.tool.config["file"]
+        try:
+            path = default_storage.path(name)
+        except NotImplementedError:
+            path = None
+
+        try:
+            file = (
+                default_storage.open(name, "rb")
+                if path is None
+                else pa.memory_map(path)
+            )
+        except FileNotFoundError as exc:
+            raise ToolServiceException(
+                tool_id=self.tool.id,
+                message="Uploaded file does not exist.",
+                code="missing_file",
+            ) from exc
+        with file:
+            yield file
+
+    def get_source_name(self) -> str:
+        return self.tool.config["file"]
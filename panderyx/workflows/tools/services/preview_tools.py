@@ -1,14 +1,21 @@
-from typing import Dict
+from typing import Dict, Iterator, Optional
 
 import numpy as np
 import pandas as pd
 
 from panderyx.workflows.exceptions import MissingToolInput, ToolServiceException
 from panderyx.workflows.tools.helpers import DataTypes
+from panderyx.workflows.tools.statistics import (
+    describe_chunks,
+    describe_sample,
+    get_sample_size,
+)
 from panderyx.workflows.tools.services.tool import ToolService
 
 
 class DescribeDataService(ToolService):
+    chunked = True
+
     data_type_mapping = {
         DataTypes.ALL.value: "all",
         DataTypes.NUMERIC.value: [np.number],
@@ -25,14 +32,56 @@ class DescribeDataService(ToolService):
         except IndexError:
             raise MissingToolInput(tool_id=self.tool.id)
 
+        if self.sample_size is not None:
+            return next(self.run_tool_chunked({0: iter([df])}, len(df)))
+
         try:
             return df.describe(include=data_type)
         except ValueError:
-            raise ToolServiceException(
-                tool_id=self.tool.id,
-                message=(
-                    "Describe Tool could not process provided data. "
-                    "Please make sure that 'describe type' is suitable for your type of data."
-                ),
-                code="describe_error",
-            )
+            raise self.get_describe_error()
+
+    def run_tool_chunked(
+        self, inputs: Dict[int, Iterator[pd.DataFrame]], chunk_rows: int
+    ) -> Iterator[pd.DataFrame]:
+        data_type = self.tool.config["data_type"]
+        # statistics of other data types (e.g. most frequent values) are not
+        # mergeable, so their inputs are materialized unless they are sampled
+        if self.sample_size is None and data_type != DataTypes.NUMERIC.value:
+            yield from super().run_tool_chunked(inputs, chunk_rows)
+            return
+
+        try:
+            chunks = list(inputs.values())[0]
+        except IndexError:
+            raise MissingToolInput(tool_id=self.tool.id)
+
+        try:
+            if self.sample_size is not None:
+                yield describe_sample(
+                    chunks,
+                    sample_size=self.sample_size,
+                    include=self.data_type_mapping[data_type],
+                )
+            else:
+                # percentiles are estimated with a quantile sketch, see KLLSketch
+                yield describe_chunks(chunks)
+        except ValueError:
+            raise self.get_describe_error()
+
+    @property
+    def sample_size(self) -> Optional[int]:
+        """Number of sampled rows in approximate mode, None for exact statistics."""
+        config = self.tool.config
+        if config.get("relative_error") is not None:
+            return get_sample_size(config["relative_error"])
+        return config.get("sample_size")
+
+    def get_describe_error(self) -> ToolServiceException:
+        return ToolServiceException(
+            tool_id=self.tool.id,
+            message=(
+                "Describe Tool could not process provided data. "
+                "Please make sure that 'describe type' is suitable for your type of data."
+            ),
+            code="describe_error",
+        )
@@ -1,14 +1,23 @@
+import functools
+import gzip
+import threading
 from dataclasses import asdict
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 import pandas as pd
+import pyarrow as pa
 
 import pytest
 from django.test import TestCase
 from pyfakefs.fake_filesystem_unittest import Patcher
 
-from panderyx.workflows.test.factories import WorkflowFactory
+from panderyx.workflows.exceptions import ToolServiceException
+from panderyx.workflows.test.factories import UploadFactory, WorkflowFactory
 from panderyx.workflows.tools.test.factories import ToolFactory
-from panderyx.workflows.tools.dtos.input_tools import InputUrlConfig
-from panderyx.workflows.tools.services.input_tools import InputUrlService
+from panderyx.workflows.tools.dtos.input_tools import InputFileConfig, InputUrlConfig
+from panderyx.workflows.tools.services.input_tools import (
+    InputFileService,
+    InputUrlService,
+)
 from panderyx.test_helpers.data_sets import test_dataset
 
 
@@ -29,3 +38,252 @@ class TestInputUrlService:
 
             df = pd.read_csv(self.path)
             assert df.equals(service.run_tool({}))
+
+    def test_input_url_with_columns(self, setUp):
+        with Patcher() as patcher:
+            patcher.fs.create_file(self.path, contents=self.contents)
+            config = asdict(InputUrlConfig(type="input_url", url=self.path))
+            tool = ToolFactory.build(config=config, workflow=self.workflow)
+            service = InputUrlService(tool, columns=["Country Code", "2020", "missing"])
+
+            df = pd.read_csv(self.path, usecols=["Country Code", "2020"])
+            assert df.equals(service.run_tool({}))
+
+    def test_input_url_with_rows(self, setUp):
+        with Patcher() as patcher:
+            patcher.fs.create_file(self.path, contents=self.contents)
+            config = asdict(InputUrlConfig(type="input_url", url=self.path))
+            tool = ToolFactory.build(config=config, workflow=self.workflow)
+            service = InputUrlService(tool, rows=2)
+
+            df = pd.read_csv(self.path, nrows=2)
+            assert df.equals(service.run_tool({}))
+
+    def test_input_url_with_optimized_dtypes(self, setUp):
+        header, *rows = self.contents.strip().splitlines()
+        # repeated rows make values of string columns low-cardinality
+        contents = "\n".join([header, *rows * 4])
+        with Patcher() as patcher:
+            patcher.fs.create_file(self.path, contents=contents)
+            config = asdict(InputUrlConfig(url=self.path, optimize_dtypes=True))
+            tool = ToolFactory.build(config=config, workflow=self.workflow)
+            service = InputUrlService(tool)
+
+            df = service.run_tool({})
+
+            assert df["Continent"].dtype == "category"
+            assert df.astype(pd.read_csv(self.path).dtypes.to_dict()).equals(
+                pd.read_csv(self.path)
+            )
+            report = tool.metadata["dtype_report"]
+            assert report["dtypes"]["Continent"]["optimized_dtype"] == "category"
+
+    def test_input_url_chunked(self, setUp):
+        with Patcher() as patcher:
+            patcher.fs.create_file(self.path, contents=self.contents)
+            config = asdict(InputUrlConfig(type="input_url", url=self.path))
+            tool = ToolFactory.build(config=config, workflow=self.workflow)
+            service = InputUrlService(tool)
+
+            chunks = list(service.run_tool_chunked({}, chunk_rows=2))
+
+            assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+            assert pd.concat(chunks).equals(pd.read_csv(self.path))
+
+
+@pytest.mark.django_db()
+class TestInputUrlSchemaPinning:
+    @pytest.fixture()
+    def setUp(self, tmp_path):
+        self.workflow = WorkflowFactory.build()
+        self.path = str(tmp_path / "data.csv")
+        self.df = pd.DataFrame({"a": [1, 2, 3, None], "b": ["w", "x", "y", "z"]})
+        self.df.to_csv(self.path, index=False)
+        self.tool = ToolFactory.build(
+            config=asdict(InputUrlConfig(url=self.path)), workflow=self.workflow
+        )
+
+    def pin_schema(self, header, dtypes):
+        self.tool.metadata = {
+            "schema": {"source": self.path, "header": header, "dtypes": dtypes}
+        }
+
+    def test_schema_is_pinned(self, setUp):
+        InputUrlService(self.tool).run_tool({})
+
+        assert self.tool.metadata["schema"] == {
+            "source": self.path,
+            "header": ["a", "b"],
+            "dtypes": {"a": "float64", "b": "object"},
+        }
+
+    def test_schema_of_leading_rows_is_not_pinned(self, setUp):
+        InputUrlService(self.tool, rows=2).run_tool({})
+
+        assert self.tool.metadata == {}
+
+    def test_pinned_dtypes_of_other_columns_are_kept(self, setUp):
+        self.pin_schema(["a", "b"], {"a": "float64", "b": "object"})
+
+        df = InputUrlService(self.tool, columns=["b"]).run_tool({})
+
+        assert list(df.columns) == ["b"]
+        assert self.tool.metadata["schema"]["dtypes"] == {
+            "a": "float64",
+            "b": "object",
+        }
+
+    def test_pinned_dtypes_are_parsed(self, setUp):
+        self.pin_schema(["a", "b"], {"a": "float32", "b": "object"})
+
+        df = InputUrlService(self.tool).run_tool({})
+
+        assert df["a"].dtype == "float32"
+
+    def test_chunks_have_pinned_dtypes(self, setUp):
+        self.pin_schema(["a", "b"], {"a": "float64", "b": "object"})
+
+        chunks = list(InputUrlService(self.tool).run_tool_chunked({}, chunk_rows=2))
+
+        # missing values of the last chunk would make only its column float64
+        assert [chunk["a"].dtype for chunk in chunks] == ["float64", "float64"]
+
+    def test_schema_is_inferred_when_header_changes(self, setUp):
+        self.pin_schema(["a"], {"a": "object"})
+
+        df = InputUrlService(self.tool).run_tool({})
+
+        assert df.equals(self.df)
+        assert self.tool.metadata["schema"]["header"] == ["a", "b"]
+
+    def test_schema_is_inferred_when_values_do_not_fit(self, setUp):
+        self.pin_schema(["a", "b"], {"a": "float64", "b": "int64"})
+
+        df = InputUrlService(self.tool).run_tool({})
+
+        assert df.equals(self.df)
+        assert self.tool.metadata["schema"]["dtypes"]["b"] == "object"
+
+    def test_chunks_are_inferred_when_values_do_not_fit(self, setUp):
+        self.pin_schema(["a", "b"], {"a": "float64", "b": "int64"})
+
+        chunks = InputUrlService(self.tool).run_tool_chunked({}, chunk_rows=2)
+
+        assert pd.concat(chunks).equals(self.df)
+
+
+@pytest.mark.django_db()
+class TestInputUrlServiceOverHttp:
+    @pytest.fixture()
+    def setUp(self, tmp_path):
+        self.workflow = WorkflowFactory.build()
+        self.df = pd.DataFrame({"a": range(100_000), "b": range(100_000)})
+        self.df.to_csv(tmp_path / "data.csv", index=False)
+        self.df.to_csv(tmp_path / "data.csv.gz", index=False)
+
+        handler = functools.partial(SimpleHTTPRequestHandler, directory=str(tmp_path))
+        handler.log_message = lambda *args: None
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{server.server_port}"
+        yield
+        server.shutdown()
+        server.server_close()
+
+    @pytest.mark.parametrize("filename", ["data.csv", "data.csv.gz"])
+    def test_input_url_with_rows(self, setUp, filename):
+        config = asdict(InputUrlConfig(url=f"{self.url}/{filename}"))
+        tool = ToolFactory.build(config=config, workflow=self.workflow)
+        service = InputUrlService(tool, rows=10)
+
+        assert service.run_tool({}).equals(self.df.head(10))
+
+    @pytest.mark.parametrize("filename", ["data.csv", "data.csv.gz"])
+    def test_input_url_chunked(self, setUp, filename):
+        config = asdict(InputUrlConfig(url=f"{self.url}/{filename}"))
+        tool = ToolFactory.build(config=config, workflow=self.workflow)
+        service = InputUrlService(tool)
+
+        chunks = list(service.run_tool_chunked({}, chunk_rows=30_000))
+
+        assert len(chunks) == 4
+        assert pd.concat(chunks).equals(self.df)
+
+
+@pytest.mark.django_db()
+class TestInputFileService:
+    @pytest.fixture()
+    def setUp(self):
+        self.workflow = WorkflowFactory.build()
+        self.df = pd.DataFrame({"a": range(1000), "b": ["x", "y"] * 500})
+
+    def build_tool(self, filename, data, **config):
+        upload = UploadFactory(filename=filename, data=data)
+        config = asdict(
+            InputFileConfig(upload=str(upload.id), file=upload.file.name, **config)
+        )
+        return ToolFactory.build(config=config, workflow=self.workflow)
+
+    def test_uploaded_file_is_memory_mapped(self, setUp):
+        tool = self.build_tool("data.csv", self.df.to_csv(index=False).encode())
+
+        with InputFileService(tool).open_source() as source:
+            assert isinstance(source, pa.MemoryMappedFile)
+
+    @pytest.mark.parametrize("engine", ["pandas", "pyarrow"])
+    @pytest.mark.parametrize(
+        "filename,to_bytes",
+        [
+            ("data.csv", lambda df: df.to_csv(index=False).encode()),
+            ("data.csv.gz", lambda df: gzip.compress(df.to_csv(index=False).encode())),
+            ("data.parquet", lambda df: df.to_parquet()),
+            ("data.jsonl", lambda df: df.to_json(orient="records", lines=True)),
+        ],
+    )
+    def test_input_file(self, setUp, settings, engine, filename, to_bytes):
+        settings.WORKFLOW_PARSE_ENGINE = engine
+        data = to_bytes(self.df)
+        tool = self.build_tool(
+            filename, data.encode() if isinstance(data, str) else data
+        )
+
+        assert InputFileService(tool).run_tool({}).equals(self.df)
+        assert (
+            InputFileService(tool, columns=["b"], rows=10)
+            .run_tool({})
+            .equals(self.df[["b"]].head(10))
+        )
+
+    def test_input_file_feather(self, setUp, tmp_path):
+        self.df.to_feather(tmp_path / "data.feather")
+        tool = self.build_tool("data.feather", (tmp_path / "data.feather").read_bytes())
+
+        assert InputFileService(tool).run_tool({}).equals(self.df)
+
+    def test_input_file_chunked(self, setUp):
+        tool = self.build_tool("data.csv", self.df.to_csv(index=False).encode())
+
+        chunks = list(InputFileService(tool).run_tool_chunked({}, chunk_rows=300))
+
+        assert len(chunks) == 4
+        assert pd.concat(chunks).equals(self.df)
+
+    def test_schema_of_uploaded_file_is_pinned(self, setUp):
+        tool = self.build_tool("data.csv", self.df.to_csv(index=False).encode())
+
+        InputFileService(tool).run_tool({})
+
+        assert tool.metadata["schema"] == {
+            "source": tool.config["file"],
+            "header": ["a", "b"],
+            "dtypes": {"a": "int64", "b": "object"},
+        }
+
+    def test_missing_uploaded_file(self, setUp):
+        tool = self.build_tool("data.csv", b"a\n1\n")
+        UploadFactory._meta.model.objects.get().file.delete(save=False)
+
+        with pytest.raises(ToolServiceException) as exc:
+            InputFileService(tool).run_tool({})
+
+        assert exc.value.code == "missing_file"
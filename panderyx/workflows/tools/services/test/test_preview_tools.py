@@ -48,3 +48,49 @@ class TestInputUrlService(TestCase):
             else:
                 with pytest.raises(ToolServiceException):
                     service.run_tool({0: df})
+
+    def test_preview_tool_with_chunks(self):
+        with Patcher() as patcher:
+            patcher.fs.create_file(self.path, contents=self.contents)
+            config = asdict(DescribeDataConfig(type="describe_data"))
+            tool = ToolFactory.build(config=config, workflow=self.workflow)
+            service = DescribeDataService(tool)
+
+            df = pd.read_csv(self.path)
+            chunks = [df.iloc[:2], df.iloc[2:]]
+            result_chunks = list(service.run_tool_chunked({0: iter(chunks)}, 2))
+
+            assert len(result_chunks) == 1
+            pd.testing.assert_frame_equal(result_chunks[0], df.describe())
+
+    def test_preview_tool_with_sample(self):
+        config = asdict(
+            DescribeDataConfig(data_type=DataTypes.ALL.value, sample_size=1000)
+        )
+        tool = ToolFactory.build(config=config, workflow=self.workflow)
+        service = DescribeDataService(tool)
+        df = pd.DataFrame({"a": range(10_000), "b": ["x", "y"] * 5000})
+        chunks = [df.iloc[start : start + 3000] for start in range(0, 10_000, 3000)]
+
+        result = list(service.run_tool_chunked({0: iter(chunks)}, 3000))[0]
+
+        assert list(result.index[-3:]) == [
+            "sample_size",
+            "mean_ci_lower",
+            "mean_ci_upper",
+        ]
+        assert result.loc["sample_size", "a"] == 1000
+        assert result.loc["count", "b"] == 1000
+        lower, upper = result.loc[["mean_ci_lower", "mean_ci_upper"], "a"]
+        assert lower < df["a"].mean() < upper
+
+    def test_preview_tool_with_relative_error(self):
+        config = asdict(DescribeDataConfig(relative_error=0.1))
+        tool = ToolFactory.build(config=config, workflow=self.workflow)
+        service = DescribeDataService(tool)
+        df = pd.DataFrame({"a": range(10_000)})
+
+        result = service.run_tool({0: df})
+
+        # (1.96 / 0.1) ** 2 rows are sampled
+        assert result.loc["sample_size", "a"] == 385
@@ -0,0 +1,182 @@
+from dataclasses import asdict
+
+import pandas as pd
+import pytest
+
+from panderyx.workflows.exceptions import MissingToolInput, ToolServiceException
+from panderyx.workflows.test.factories import WorkflowFactory
+from panderyx.workflows.tools.dtos.transform_tools import (
+    HeadConfig,
+    OptimizeDtypesConfig,
+    SelectColumnsConfig,
+)
+from panderyx.workflows.tools.services.transform_tools import (
+    HeadService,
+    OptimizeDtypesService,
+    SelectColumnsService,
+)
+from panderyx.workflows.tools.services.tool import concat_chunks
+from panderyx.workflows.tools.test.factories import ToolFactory
+
+
+@pytest.mark.django_db()
+class TestSelectColumnsService:
+    @pytest.fixture()
+    def setUp(self):
+        self.workflow = WorkflowFactory.build()
+        self.df = pd.DataFrame({"a": [1, 2], "b": [3, 4], "c": [5, 6]})
+
+    def get_service(self, columns):
+        config = asdict(SelectColumnsConfig(columns=columns))
+        return SelectColumnsService(
+            ToolFactory.build(config=config, workflow=self.workflow)
+        )
+
+    def test_select_columns(self, setUp):
+        service = self.get_service(["c", "a"])
+
+        assert service.run_tool({0: self.df}).equals(self.df[["c", "a"]])
+
+    def test_select_missing_columns(self, setUp):
+        service = self.get_service(["a", "d"])
+
+        with pytest.raises(ToolServiceException) as exc:
+            service.run_tool({0: self.df})
+
+        assert exc.value.code == "missing_columns"
+
+    def test_select_columns_without_input(self, setUp):
+        with pytest.raises(MissingToolInput):
+            self.get_service(["a"]).run_tool({})
+
+    def test_input_columns(self, setUp):
+        service = self.get_service(["c", "a"])
+
+        assert service.get_input_columns(None) == {"a", "c"}
+
+    def test_select_columns_chunked(self, setUp):
+        service = self.get_service(["c", "a"])
+        chunks = [self.df.iloc[:500], self.df.iloc[500:]]
+
+        result_chunks = list(service.run_tool_chunked({0: iter(chunks)}, 1))
+
+        assert pd.concat(result_chunks).equals(self.df[["c", "a"]])
+
+
+@pytest.mark.django_db()
+class TestHeadService:
+    @pytest.fixture()
+    def setUp(self):
+        self.workflow = WorkflowFactory.build()
+        self.df = pd.DataFrame({"a": range(10)})
+        config = asdict(HeadConfig(rows=3))
+        self.service = HeadService(
+            ToolFactory.build(config=config, workflow=self.workflow)
+        )
+
+    def test_head(self, setUp):
+        assert self.service.run_tool({0: self.df}).equals(self.df.head(3))
+
+    def test_head_without_input(self, setUp):
+        with pytest.raises(MissingToolInput):
+            self.service.run_tool({})
+
+    @pytest.mark.parametrize("output_rows,input_rows", [(None, 3), (2, 2), (5, 3)])
+    def test_input_rows(self, setUp, output_rows, input_rows):
+        assert self.service.get_input_rows(output_rows) == input_rows
+
+    def test_input_columns(self, setUp):
+        assert self.service.get_input_columns({"a"}) == {"a"}
+        assert self.service.get_input_columns(None) is None
+
+    def test_head_chunked(self, setUp):
+        consumed_chunks = []
+
+        def read_chunks():
+            for start in range(0, 10, 2):
+                consumed_chunks.append(start)
+                yield self.df.iloc[start : start + 2]
+
+        result_chunks = list(self.service.run_tool_chunked({0: read_chunks()}, 2))
+
+        assert pd.concat(result_chunks).equals(self.df.head(3))
+        # remaining chunks are not read once all of the rows are taken
+        assert consumed_chunks == [0, 2]
+
+    def test_head_chunked_closes_input(self, setUp):
+        closed = []
+
+        def read_chunks():
+            try:
+                for start in range(0, 10, 2):
+                    yield self.df.iloc[start : start + 2]
+            finally:
+                closed.append(True)
+
+        list(self.service.run_tool_chunked({0: read_chunks()}, 2))
+
+        assert closed == [True]
+
+
+@pytest.mark.django_db()
+class TestOptimizeDtypesService:
+    @pytest.fixture()
+    def setUp(self):
+        self.workflow = WorkflowFactory.build()
+        self.df = pd.DataFrame(
+            {
+                "continent": ["Europe", "Asia", "Europe", "Europe"] * 125
+                + ["Africa", "Europe", "Africa", "Africa"] * 125,
+                "country": [f"Country {i}" for i in range(1000)],
+                "rows": range(1000),
+            }
+        )
+
+    def get_service(self, **config):
+        config = asdict(OptimizeDtypesConfig(**config))
+        return OptimizeDtypesService(
+            ToolFactory.build(config=config, workflow=self.workflow)
+        )
+
+    def test_optimize_dtypes(self, setUp, caplog):
+        service = self.get_service()
+
+        with caplog.at_level("INFO"):
+            df = service.run_tool({0: self.df})
+
+        assert df.dtypes.astype(str).to_dict() == {
+            "continent": "category",
+            "country": "object",
+            "rows": "int16",
+        }
+        assert df.astype(self.df.dtypes.to_dict()).equals(self.df)
+        assert "saved" in caplog.text
+        report = service.tool.metadata["dtype_report"]
+        assert report["dtypes"]["rows"] == {
+            "dtype": "int64",
+            "optimized_dtype": "int16",
+        }
+        assert 0 < report["saved_bytes"] < report["bytes"]
+
+    def test_optimize_dtypes_with_arrow_strings(self, setUp):
+        df = self.get_service(arrow_strings=True).run_tool({0: self.df})
+
+        assert df["country"].dtype == "string[pyarrow]"
+
+    def test_optimize_dtypes_chunked(self, setUp):
+        service = self.get_service()
+        # chunks have different categories of continent column
+        chunks = [self.df.iloc[:500], self.df.iloc[500:]]
+
+        result_chunks = list(service.run_tool_chunked({0: iter(chunks)}, 1))
+        df = concat_chunks(result_chunks)
+
+        assert df["continent"].dtype == "category"
+        assert df.astype(self.df.dtypes.to_dict()).equals(self.df)
+        report = service.tool.metadata["dtype_report"]
+        assert report["dtypes"]["continent"]["optimized_dtype"] == "category"
+        assert report["bytes"] == self.df.memory_usage(deep=True, index=False).sum()
+
+    def test_optimize_dtypes_without_input(self, setUp):
+        with pytest.raises(MissingToolInput):
+            self.get_service().run_tool({})
@@ -7,10 +7,134 @@ import pandas as pd
 from panderyx.workflows.tools.models import Tool
 
 
+def concat_chunks(chunks: typing.Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Materializes chunks of a DataFrame into a single DataFrame."""
+    chunks = list(chunks)
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0]
+
+    # categories of chunks are unified, otherwise categorical columns would be
+    # concatenated into object columns
+    categorical_columns = [
+        column
+        for column in chunks[0].columns
+        if all(
+            column in chunk and isinstance(chunk[column].dtype, pd.CategoricalDtype)
+            for chunk in chunks
+        )
+    ]
+    if categorical_columns:
+        chunks = [chunk.copy(deep=False) for chunk in chunks]
+    for column in categorical_columns:
+        categories = pd.api.types.union_categoricals(
+            [chunk[column] for chunk in chunks], ignore_order=True
+        ).categories
+        for chunk in chunks:
+            chunk[column] = chunk[column].cat.set_categories(categories)
+
+    return pd.concat(chunks)
+
+
 class ToolService(ABC):
-    def __init__(self, tool: Tool) -> None:
+    # tools that process chunks of their inputs one at a time override
+    # run_tool_chunked and set chunked to True
+    chunked: bool = False
+
+    def __init__(
+        self,
+        tool: Tool,
+        columns: typing.Optional[typing.Collection[str]] = None,
+        rows: typing.Optional[int] = None,
+        fresh_urls: typing.Optional[typing.Collection[str]] = None,
+    ) -> None:
+        """
+        Args:
+            tool (Tool): tool to be run
+            columns (Optional[Collection[str]]): columns of the result used by
+                downstream tools, other columns can be left out of the result.
+                All columns are used when not provided.
+            rows (Optional[int]): number of leading rows of the result used by
+                downstream tools, other rows can be left out of the result.
+                All rows are used when not provided.
+            fresh_urls (Optional[Collection[str]]): URLs downloaded into the
+                download cache during the current run, which are read from
+                the cache without revalidation
+        """
         self.tool = tool
+        self.columns = columns
+        self.rows = rows
+        self.fresh_urls = fresh_urls or ()
+
+    def get_source_version(self) -> typing.Optional[str]:
+        """Returns version of the data read by the tool (e.g. modification time of
+        its file), which is a part of the fingerprint of its result. Results of tools
+        without a version are refreshed only once they expire from the result cache."""
+        return None
+
+    def set_metadata(self, key: str, value: typing.Any) -> None:
+        """Records JSON-serializable data of the tool, which is saved after its run."""
+        self.tool.metadata = {**self.tool.metadata, key: value}
 
     @abstractmethod
     def run_tool(self, inputs: typing.Dict[int, pd.DataFrame]) -> pd.DataFrame:
         """Returns a DataFrame after data manipulation specific for this tool has finished."""
+
+    def run_tool_chunked(
+        self,
+        inputs: typing.Dict[int, typing.Iterator[pd.DataFrame]],
+        chunk_rows: int,
+    ) -> typing.Iterator[pd.DataFrame]:
+        """Yields chunks of the tool's result from chunks of its input DataFrames.
+
+        Tools that do not support chunks materialize their inputs and yield
+        the whole result as a single chunk.
+
+        Args:
+            inputs (Dict[int, Iterator[pd.DataFrame]]): chunks of input DataFrames
+            chunk_rows (int): number of rows of chunks created by the tool
+
+        Yields:
+            pd.DataFrame: chunks of the result
+        """
+        yield self.run_tool(
+            inputs={
+                input_id: concat_chunks(chunks) for input_id, chunks in inputs.items()
+            }
+        )
+
+    def get_prefetch_urls(self) -> typing.List[str]:
+        """Returns URLs of files read by the tool that can be downloaded ahead
+        of its run into the download cache."""
+        return []
+
+    def get_input_columns(
+        self, output_columns: typing.Optional[typing.Set[str]]
+    ) -> typing.Optional[typing.Set[str]]:
+        """Returns columns of input DataFrames that are used by the tool to produce
+        provided columns of its result.
+
+        Args:
+            output_columns (Optional[Set[str]]): columns of the result used by
+                downstream tools or None if all of them are used
+
+        Returns:
+            Optional[Set[str]]: used input columns or None if all of them are used
+        """
+        return None
+
+    def get_input_rows(self, output_rows: typing.Optional[int]) -> typing.Optional[int]:
+        """Returns number of leading rows of input DataFrames that are used by
+        the tool to produce provided number of leading rows of its result.
+
+        Only tools that preserve the order of rows can limit their inputs.
+
+        Args:
+            output_rows (Optional[int]): rows of the result used by downstream
+                tools or None if all of them are used
+
+        Returns:
+            Optional[int]: used input rows or None if all of them are used
+        """
+        return None
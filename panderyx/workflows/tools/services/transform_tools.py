@@ -0,0 +1,140 @@
+from typing import Dict, Iterator, Optional, Set
+
+import pandas as pd
+
+from panderyx.workflows.exceptions import MissingToolInput, ToolServiceException
+from panderyx.workflows.tools.dtypes import DtypeOptimizer
+from panderyx.workflows.tools.services.tool import ToolService
+
+
+class SelectColumnsService(ToolService):
+    chunked = True
+
+    def run_tool(self, inputs: Dict[int, pd.DataFrame]) -> pd.DataFrame:
+        # getting the only input DataFrame
+        try:
+            df = list(inputs.values())[0]
+        except IndexError:
+            raise MissingToolInput(tool_id=self.tool.id)
+
+        return self._select_columns(df)
+
+    def run_tool_chunked(
+        self, inputs: Dict[int, Iterator[pd.DataFrame]], chunk_rows: int
+    ) -> Iterator[pd.DataFrame]:
+        try:
+            chunks = list(inputs.values())[0]
+        except IndexError:
+            raise MissingToolInput(tool_id=self.tool.id)
+
+        for chunk in chunks:
+            yield self._select_columns(chunk)
+
+    def _select_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        columns = self.tool.config["columns"]
+        missing_columns = [column for column in columns if column not in df.columns]
+        if missing_columns:
+            raise ToolServiceException(
+                tool_id=self.tool.id,
+                message=f"Input is missing columns: {', '.join(missing_columns)}.",
+                code="missing_columns",
+            )
+
+        return df[columns]
+
+    def get_input_columns(
+        self, output_columns: Optional[Set[str]]
+    ) -> Optional[Set[str]]:
+        return set(self.tool.config["columns"])
+
+    def get_input_rows(self, output_rows: Optional[int]) -> Optional[int]:
+        return output_rows
+
+
+class HeadService(ToolService):
+    chunked = True
+
+    def run_tool(self, inputs: Dict[int, pd.DataFrame]) -> pd.DataFrame:
+        # getting the only input DataFrame
+        try:
+            df = list(inputs.values())[0]
+        except IndexError:
+            raise MissingToolInput(tool_id=self.tool.id)
+
+        return df.head(self.tool.config["rows"])
+
+    def run_tool_chunked(
+        self, inputs: Dict[int, Iterator[pd.DataFrame]], chunk_rows: int
+    ) -> Iterator[pd.DataFrame]:
+        try:
+            chunks = list(inputs.values())[0]
+        except IndexError:
+            raise MissingToolInput(tool_id=self.tool.id)
+
+        # remaining input chunks are not read once all of the rows are taken
+        remaining_rows = self.tool.config["rows"]
+        try:
+            for chunk in chunks:
+                yield chunk.head(remaining_rows)
+                remaining_rows -= min(len(chunk), remaining_rows)
+                if remaining_rows == 0:
+                    break
+        finally:
+            # closing the input releases its source, e.g. a file of an input tool
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+
+    def get_input_columns(
+        self, output_columns: Optional[Set[str]]
+    ) -> Optional[Set[str]]:
+        return output_columns
+
+    def get_input_rows(self, output_rows: Optional[int]) -> Optional[int]:
+        rows = self.tool.config["rows"]
+        return rows if output_rows is None else min(rows, output_rows)
+
+
+class OptimizeDtypesService(ToolService):
+    chunked = True
+
+    def run_tool(self, inputs: Dict[int, pd.DataFrame]) -> pd.DataFrame:
+        # getting the only input DataFrame
+        try:
+            df = list(inputs.values())[0]
+        except IndexError:
+            raise MissingToolInput(tool_id=self.tool.id)
+
+        optimizer = self.get_optimizer()
+        optimized_df = optimizer.optimize(df)
+        optimizer.log(self.tool.id)
+        self.set_metadata("dtype_report", optimizer.get_report())
+        return optimized_df
+
+    def run_tool_chunked(
+        self, inputs: Dict[int, Iterator[pd.DataFrame]], chunk_rows: int
+    ) -> Iterator[pd.DataFrame]:
+        try:
+            chunks = list(inputs.values())[0]
+        except IndexError:
+            raise MissingToolInput(tool_id=self.tool.id)
+
+        optimizer = self.get_optimizer()
+        for chunk in chunks:
+            yield optimizer.optimize(chunk)
+        optimizer.log(self.tool.id)
+        self.set_metadata("dtype_report", optimizer.get_report())
+
+    def get_optimizer(self) -> DtypeOptimizer:
+        return DtypeOptimizer(
+            category_threshold=self.tool.config["category_threshold"],
+            arrow_strings=self.tool.config["arrow_strings"],
+        )
+
+    def get_input_columns(
+        self, output_columns: Optional[Set[str]]
+    ) -> Optional[Set[str]]:
+        return output_columns
+
+    def get_input_rows(self, output_rows: Optional[int]) -> Optional[int]:
+        return output_rows
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import math
+import typing
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+DESCRIBE_PERCENTILES = (0.25, 0.5, 0.75)
+# z-score of 95% confidence intervals reported by approximate describe
+CONFIDENCE_Z = 1.96
+
+
+class Moments:
+    """Count, mean, variance, min and max of values computed in a single pass.
+
+    Accumulators of separate chunks are merged with Chan's parallel algorithm,
+    so statistics match describe() up to floating point rounding.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        # sum of squared differences from the mean
+        self.m2 = 0.0
+        self.min = math.nan
+        self.max = math.nan
+
+    def update(self, values: np.ndarray) -> None:
+        """Adds values without missing values to the accumulators."""
+        if not len(values):
+            return
+
+        other = Moments()
+        other.count = len(values)
+        other.mean = values.sum() / other.count
+        other.m2 = ((values - other.mean) ** 2).sum()
+        other.min = values.min()
+        other.max = values.max()
+        self.merge(other)
+
+    def merge(self, other: Moments) -> None:
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta**2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation, like the one returned by describe()."""
+        if self.count < 2:
+            return math.nan
+        return math.sqrt(self.m2 / (self.count - 1))
+
+
+class KLLSketch:
+    """Quantile sketch that keeps O(k log(n / k)) of n values (Karnin, Lang, Liberty).
+
+    Values are kept in compactors of increasing weight. A full compactor sorts
+    its values and promotes every other one to the next compactor with twice
+    the weight. With the default k=200 estimated quantiles have a normalized rank
+    error of about 1.65%, i.e. the returned value is between the exact
+    (q - 0.0165) and (q + 0.0165) quantiles with high probability. Quantiles
+    are exact until more than k values are added.
+
+    Sketches are mergeable, so sketches of separate chunks can be combined.
+    """
+
+    capacity_ratio = 2 / 3
+
+    def __init__(self, k: int = 200, seed: int = 0) -> None:
+        self.k = k
+        self.count = 0
+        self.compactors: typing.List[np.ndarray] = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray) -> None:
+        """Adds values without missing values to the sketch."""
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self.count += len(values)
+        self._compress()
+
+    def merge(self, other: KLLSketch) -> None:
+        for level, values in enumerate(other.compactors):
+            if level == len(self.compactors):
+                self.compactors.append(np.empty(0))
+            self.compactors[level] = np.concatenate([self.compactors[level], values])
+        self.count += other.count
+        self._compress()
+
+    def quantiles(self, qs: typing.Sequence[float]) -> typing.List[float]:
+        """Returns estimated quantiles with linear interpolation like describe()."""
+        if not self.count:
+            return [math.nan for _ in qs]
+        if len(self.compactors) == 1:
+            return [float(value) for value in np.quantile(self.compactors[0], qs)]
+
+        values = np.concatenate(self.compactors)
+        weights = np.concatenate(
+            [
+                np.full(len(level_values), 2**level)
+                for level, level_values in enumerate(self.compactors)
+            ]
+        )
+        order = np.argsort(values, kind="stable")
+        values, weights = values[order], weights[order]
+        # each kept value stands for the middle of the ranks it represents
+        ranks = (np.cumsum(weights) - weights / 2) / weights.sum()
+        return [float(value) for value in np.interp(qs, ranks, values)]
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(math.ceil(self.k * self.capacity_ratio**depth), 2)
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.compactors):
+            values = self.compactors[level]
+            if len(values) > self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+                values = np.sort(values)
+                # odd value stays in the compactor, so the total weight is kept
+                kept, values = values[: len(values) % 2], values[len(values) % 2 :]
+                promoted = values[self.rng.integers(2) :: 2]
+                self.compactors[level] = kept
+                self.compactors[level + 1] = np.concatenate(
+                    [self.compactors[level + 1], promoted]
+                )
+            level += 1
+
+
+class ColumnStatistics:
+    """Mergeable statistics of a numeric column returned by describe()."""
+
+    def __init__(self) -> None:
+        self.moments = Moments()
+        self.sketch = KLLSketch()
+
+    def update(self, series: pd.Series) -> None:
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        self.moments.update(values)
+        self.sketch.update(values)
+
+    def merge(self, other: ColumnStatistics) -> None:
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+
+    def describe(self) -> typing.List[float]:
+        moments = self.moments
+        return [
+            float(moments.count),
+            moments.mean if moments.count else math.nan,
+            moments.std,
+            moments.min,
+            *self.sketch.quantiles(DESCRIBE_PERCENTILES),
+            moments.max,
+        ]
+
+
+def describe_chunks(chunks: typing.Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Returns describe() of numeric columns of chunks computed in a single pass.
+
+    Only statistics of each column are kept in memory, so inputs larger than
+    memory can be described. Statistics of every column (and every chunk)
+    are independent, so groups of columns can be described separately and
+    their ColumnStatistics merged. Numeric columns are selected in the first
+    chunk, so a column is described in all of the chunks or in none of them.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): chunks of the described DataFrame
+
+    Raises:
+        ValueError: catches case in which there are no numeric columns or
+            a numeric column is missing or not numeric in a later chunk
+
+    Returns:
+        pd.DataFrame: count, mean, std, min, percentiles and max of columns
+    """
+    statistics: typing.Optional[typing.Dict[typing.Hashable, ColumnStatistics]] = None
+    for chunk in chunks:
+        if statistics is None:
+            statistics = {
+                column: ColumnStatistics()
+                for column in chunk.select_dtypes(include=[np.number]).columns
+            }
+        for column, column_statistics in statistics.items():
+            if column not in chunk or not is_numeric_dtype(chunk[column].dtype):
+                raise ValueError(f"Column {column} is not numeric in every chunk.")
+            column_statistics.update(chunk[column])
+
+    if not statistics:
+        raise ValueError("Cannot describe a DataFrame without numeric columns.")
+
+    index = ["count", "mean", "std", "min"]
+    index += [f"{percentile:.0%}" for percentile in DESCRIBE_PERCENTILES] + ["max"]
+    return pd.DataFrame(
+        {
+            column: column_statistics.describe()
+            for column, column_statistics in statistics.items()
+        },
+        index=index,
+    )
+
+
+class ReservoirSample:
+    """Uniform sample of a fixed number of rows drawn in one pass over chunks.
+
+    Rows are sampled with reservoir sampling (Algorithm R), so memory used by the
+    sample does not depend on the number of rows of the input.
+    """
+
+    def __init__(self, size: int, seed: int = 0) -> None:
+        self.size = size
+        self.rows = 0
+        self.sample: typing.Optional[pd.DataFrame] = None
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        missing_rows = self.size - (0 if self.sample is None else len(self.sample))
+        if missing_rows > 0:
+            head = chunk.iloc[:missing_rows]
+            if self.sample is None:
+                self.sample = head.reset_index(drop=True)
+            else:
+                self.sample = pd.concat([self.sample, head], ignore_index=True)
+            self.rows += len(head)
+            chunk = chunk.iloc[missing_rows:]
+
+        if not len(chunk):
+            return
+
+        # n-th row of the input replaces a random row of the sample
+        # with probability size / n
+        positions = self.rng.integers(
+            0, np.arange(self.rows, self.rows + len(chunk)) + 1
+        )
+        self.rows += len(chunk)
+        replaced = np.flatnonzero(positions < self.size)
+        if not len(replaced):
+            return
+
+        # later rows replacing the same sampled row take precedence
+        sample_positions, last_replaced = np.unique(
+            positions[replaced][::-1], return_index=True
+        )
+        chunk_positions = replaced[::-1][last_replaced]
+        kept_positions = np.setdiff1d(
+            np.arange(self.size), sample_positions, assume_unique=True
+        )
+        # rows are replaced with concat, since setting rows of a DataFrame
+        # with mixed types would cast its columns to object
+        self.sample = pd.concat(
+            [self.sample.iloc[kept_positions], chunk.iloc[chunk_positions]],
+            ignore_index=True,
+        )
+
+
+def get_sample_size(relative_error: float) -> int:
+    """Returns sample size for which 95% confidence intervals of means are narrower
+    than relative_error times the column's standard deviation."""
+    return math.ceil((CONFIDENCE_Z / relative_error) ** 2)
+
+
+def describe_sample(
+    chunks: typing.Iterable[pd.DataFrame],
+    sample_size: int,
+    include: typing.Any = None,
+) -> pd.DataFrame:
+    """Returns describe() of a uniform sample of chunks' rows.
+
+    Sample size and 95% confidence intervals of means of numeric columns
+    (with finite population correction) are added below the usual statistics.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): chunks of the described DataFrame
+        sample_size (int): maximum number of sampled rows
+        include (Any): data types of described columns passed to describe()
+
+    Raises:
+        ValueError: catches case in which there are no columns of provided types
+
+    Returns:
+        pd.DataFrame: describe() of the sample with sample size and confidence
+            intervals of means
+    """
+    reservoir = ReservoirSample(size=sample_size)
+    for chunk in chunks:
+        reservoir.update(chunk)
+    if reservoir.sample is None:
+        raise ValueError("Cannot describe a DataFrame without rows.")
+
+    df = reservoir.sample.describe(include=include)
+
+    # margins shrink to zero as the sample grows to the whole input
+    n, population = len(reservoir.sample), reservoir.rows
+    correction = math.sqrt((population - n) / (population - 1)) if n > 1 else 0.0
+    df.loc["sample_size"] = n
+    if "mean" in df.index:
+        counts = df.loc["count"].astype(float)
+        margin = CONFIDENCE_Z * df.loc["std"].astype(float) / np.sqrt(counts)
+        margin *= correction
+        df.loc["mean_ci_lower"] = df.loc["mean"] - margin
+        df.loc["mean_ci_upper"] = df.loc["mean"] + margin
+
+    return df
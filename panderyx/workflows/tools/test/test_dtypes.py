@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from panderyx.workflows.tools.dtypes import (
+    DtypeOptimizer,
+    get_memory_report,
+    optimize_dtypes,
+)
+
+
+class TestOptimizeDtypes:
+    def test_numeric_columns_are_downcast(self):
+        df = pd.DataFrame(
+            {
+                "small": [1, 2, 3],
+                "large": [1, 2, 2**40],
+                "halves": [0.5, np.nan, 1.5],
+                "precise": [0.1, 0.2, 0.3],
+            }
+        )
+
+        optimized_df = optimize_dtypes(df)
+
+        assert optimized_df.dtypes.astype(str).to_dict() == {
+            "small": "int8",
+            "large": "int64",
+            "halves": "float32",
+            # float32 would change values of the column
+            "precise": "float64",
+        }
+        assert optimized_df.astype(df.dtypes.to_dict()).equals(df)
+
+    def test_low_cardinality_strings_are_categories(self):
+        df = pd.DataFrame(
+            {
+                "code": ["POL", "GBR", "POL", "POL"],
+                "name": ["a", "b", "c", None],
+                "mixed": ["a", 1, "a", 1],
+            }
+        )
+
+        optimized_df = optimize_dtypes(df, category_threshold=0.5)
+
+        assert optimized_df.dtypes.astype(str).to_dict() == {
+            "code": "category",
+            "name": "object",
+            "mixed": "object",
+        }
+
+    def test_memory_report(self):
+        df = pd.DataFrame({"code": ["POL", "GBR"] * 500, "rows": range(1000)})
+
+        report = get_memory_report(df, optimize_dtypes(df))
+
+        assert list(report["optimized_dtype"]) == ["category", "int16"]
+        assert (report["saved_bytes"] > 0).all()
+        assert (report["bytes"] - report["optimized_bytes"]).equals(
+            report["saved_bytes"]
+        )
+
+
+class TestDtypeOptimizer:
+    def test_string_dtypes_of_first_chunk_are_reused(self):
+        optimizer = DtypeOptimizer()
+        first_chunk = pd.DataFrame({"code": ["POL", "GBR"] * 50})
+        second_chunk = pd.DataFrame({"code": [f"C{i}" for i in range(100)]})
+
+        optimized_chunks = [optimizer.optimize(first_chunk)]
+        optimized_chunks.append(optimizer.optimize(second_chunk))
+
+        assert [chunk["code"].dtype for chunk in optimized_chunks] == [
+            "category",
+            "category",
+        ]
+        assert optimizer.bytes > optimizer.saved_bytes > 0
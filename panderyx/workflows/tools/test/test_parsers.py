@@ -0,0 +1,181 @@
+import importlib.util
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from panderyx.workflows.tools.parsers import (
+    ArrowParseEngine,
+    PandasParseEngine,
+    ReadOptions,
+    get_extension,
+    read_csv_header,
+)
+
+ENGINES = [PandasParseEngine(), ArrowParseEngine()]
+
+
+def write_file(df, path, file_format, separator=","):
+    if file_format == "csv":
+        # pandas requires optional zstandard package for zstd compression
+        with pa.output_stream(path, compression="detect") as stream:
+            stream.write(df.to_csv(sep=separator, index=False).encode())
+    elif file_format == "parquet":
+        df.to_parquet(path, index=False)
+    elif file_format == "feather":
+        df.to_feather(path)
+    else:
+        df.to_json(path, orient="records", lines=True)
+
+
+class TestParseEngines:
+    @pytest.fixture()
+    def setUp(self, tmp_path):
+        self.tmp_path = tmp_path
+        self.df = pd.DataFrame(
+            {
+                "integers": np.arange(1000),
+                "floats": np.arange(1000) / 4,
+                "strings": [f"value {i}" for i in range(1000)],
+            }
+        )
+
+    def get_file(self, filename, file_format, separator=","):
+        path = self.tmp_path / filename
+        write_file(self.df, path, file_format, separator)
+        return open(path, "rb")
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize(
+        "filename,file_format,separator,compression",
+        [
+            ("data.csv", "csv", ",", None),
+            ("data.tsv", "csv", "\t", None),
+            ("data.csv", "csv", ";", None),
+            ("data.csv.gz", "csv", ",", "gzip"),
+            ("data.csv.zst", "csv", ",", "zstd"),
+            ("data.parquet", "parquet", ",", None),
+            ("data.feather", "feather", ",", None),
+            ("data.jsonl", "jsonl", ",", None),
+            ("data.jsonl.gz", "jsonl", ",", "gzip"),
+        ],
+    )
+    def test_read(self, setUp, engine, filename, file_format, separator, compression):
+        if (
+            compression == "zstd"
+            and isinstance(engine, PandasParseEngine)
+            and importlib.util.find_spec("zstandard") is None
+        ):
+            pytest.skip("pandas requires zstandard package for zstd compression")
+        options = ReadOptions(
+            file_format=file_format, separator=separator, compression=compression
+        )
+
+        with self.get_file(filename, file_format, separator) as file:
+            df = engine.read(file, options)
+
+        assert df.equals(self.df)
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("file_format", ["csv", "parquet", "feather", "jsonl"])
+    def test_read_columns_and_rows(self, setUp, engine, file_format):
+        options = ReadOptions(
+            file_format=file_format, columns=["strings", "integers", "missing"], rows=10
+        )
+
+        with self.get_file("data", file_format) as file:
+            df = engine.read(file, options)
+
+        assert df.equals(self.df[["integers", "strings"]].head(10))
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("file_format", ["csv", "parquet", "feather", "jsonl"])
+    def test_read_chunks(self, setUp, engine, file_format):
+        options = ReadOptions(file_format=file_format)
+
+        with self.get_file("data", file_format) as file:
+            chunks = list(engine.read_chunks(file, options, chunk_rows=300))
+
+        assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+        assert pd.concat(chunks).equals(self.df)
+
+    def test_arrow_engine_reads_columns_of_stream(self, setUp):
+        options = ReadOptions(columns=["floats"])
+
+        with self.get_file("data.csv", "csv") as file:
+            # responses of HTTP requests cannot be read twice
+            file.seekable = lambda: False
+            df = ArrowParseEngine().read(file, options)
+
+        assert df.equals(self.df[["floats"]])
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_read_csv_with_dtypes(self, setUp, engine):
+        self.df["dates"] = pd.date_range("2022-01-01", periods=1000, freq="H")
+        options = ReadOptions(
+            columns=["integers", "strings", "dates"],
+            dtypes={
+                "integers": "float64",
+                "floats": "float32",
+                "strings": "object",
+                "dates": "datetime64[ns]",
+            },
+        )
+
+        with self.get_file("data.csv", "csv") as file:
+            df = engine.read(file, options)
+
+        assert df.dtypes.astype(str).to_dict() == {
+            "integers": "float64",
+            "strings": "object",
+            "dates": "datetime64[ns]",
+        }
+        assert df.equals(
+            self.df[["integers", "strings", "dates"]].astype({"integers": "float64"})
+        )
+
+    @pytest.mark.parametrize("filename", ["data.csv", "data.csv.gz"])
+    def test_read_csv_header(self, setUp, filename):
+        options = ReadOptions.from_config({"url": filename})
+
+        with self.get_file(filename, "csv") as file:
+            assert read_csv_header(file, options) == ["integers", "floats", "strings"]
+            # file is rewound for the parser
+            assert file.tell() == 0
+
+    def test_header_of_stream_is_not_read(self, setUp):
+        with self.get_file("data.csv", "csv") as file:
+            file.seekable = lambda: False
+            assert read_csv_header(file, ReadOptions()) is None
+
+
+class TestReadOptions:
+    @pytest.mark.parametrize(
+        "url,extension,expected_extension",
+        [
+            ("http://example.com/data.csv", "", "csv"),
+            ("http://example.com/data.CSV.gz?version=2", "", "csv"),
+            ("http://example.com/data.parquet", "", "parquet"),
+            ("http://example.com/download", ".jsonl", "jsonl"),
+            ("http://example.com/data.txt", "TSV", "tsv"),
+        ],
+    )
+    def test_extension(self, url, extension, expected_extension):
+        assert get_extension(url, extension) == expected_extension
+
+    def test_options_from_config(self):
+        options = ReadOptions.from_config(
+            {"url": "http://example.com/data.tsv.zst", "separator": ""}, rows=5
+        )
+
+        assert options == ReadOptions(
+            file_format="csv", separator="\t", compression="zstd", rows=5
+        )
+
+    def test_unknown_extension_is_parsed_as_csv(self):
+        options = ReadOptions.from_config(
+            {"url": "http://example.com/data.dat", "separator": "|"}
+        )
+
+        assert (options.file_format, options.separator) == ("csv", "|")
@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from panderyx.workflows.tools.statistics import (
+    DESCRIBE_PERCENTILES,
+    KLLSketch,
+    Moments,
+    ReservoirSample,
+    describe_chunks,
+    describe_sample,
+)
+
+
+def split(df, chunk_rows):
+    return [
+        df.iloc[start : start + chunk_rows] for start in range(0, len(df), chunk_rows)
+    ]
+
+
+class TestMoments:
+    def test_merged_chunks(self):
+        values = np.random.default_rng(0).normal(loc=10, size=10_000)
+        moments = Moments()
+        for start in range(0, len(values), 999):
+            moments.update(values[start : start + 999])
+
+        assert moments.count == len(values)
+        assert moments.mean == pytest.approx(values.mean())
+        assert moments.std == pytest.approx(values.std(ddof=1))
+        assert (moments.min, moments.max) == (values.min(), values.max())
+
+    def test_single_value(self):
+        moments = Moments()
+        moments.update(np.array([1.0]))
+
+        assert np.isnan(moments.std)
+
+
+class TestKLLSketch:
+    @pytest.fixture()
+    def setUp(self):
+        self.values = np.random.default_rng(0).exponential(size=100_000)
+
+    def assert_rank_error(self, sketch, max_error):
+        sorted_values = np.sort(self.values)
+        for q, value in zip(
+            DESCRIBE_PERCENTILES, sketch.quantiles(DESCRIBE_PERCENTILES)
+        ):
+            rank = np.searchsorted(sorted_values, value) / len(sorted_values)
+            assert abs(rank - q) < max_error
+
+    def test_exact_below_k(self, setUp):
+        sketch = KLLSketch(k=200)
+        sketch.update(self.values[:200])
+
+        assert sketch.quantiles(DESCRIBE_PERCENTILES) == list(
+            np.quantile(self.values[:200], DESCRIBE_PERCENTILES)
+        )
+
+    def test_rank_error(self, setUp):
+        sketch = KLLSketch(k=200)
+        for start in range(0, len(self.values), 1000):
+            sketch.update(self.values[start : start + 1000])
+
+        assert sketch.count == len(self.values)
+        assert sum(len(values) for values in sketch.compactors) < 1000
+        self.assert_rank_error(sketch, max_error=0.0165)
+
+    def test_merged_sketches(self, setUp):
+        sketch = KLLSketch(k=200)
+        for start in range(0, len(self.values), 10_000):
+            other_sketch = KLLSketch(k=200, seed=start)
+            other_sketch.update(self.values[start : start + 10_000])
+            sketch.merge(other_sketch)
+
+        assert sketch.count == len(self.values)
+        self.assert_rank_error(sketch, max_error=0.0165)
+
+
+class TestDescribeChunks:
+    def test_matches_describe(self):
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(
+            {
+                "floats": rng.normal(size=50_000),
+                "integers": rng.integers(0, 1000, size=50_000),
+                "strings": "a",
+            }
+        )
+        df.loc[::5, "floats"] = np.nan
+
+        result = describe_chunks(split(df, 7000))
+        expected = df.describe()
+
+        assert list(result.index) == list(expected.index)
+        assert list(result.columns) == list(expected.columns)
+        exact_rows = ["count", "mean", "std", "min", "max"]
+        pd.testing.assert_frame_equal(result.loc[exact_rows], expected.loc[exact_rows])
+        # percentiles of integers from 0 to 1000 are off by at most 1.65% of ranks
+        percentiles = ["25%", "50%", "75%"]
+        assert (
+            result.loc[percentiles, "integers"] - expected.loc[percentiles, "integers"]
+        ).abs().max() < 20
+
+    def test_without_numeric_columns(self):
+        with pytest.raises(ValueError):
+            describe_chunks([pd.DataFrame({"strings": ["a", "b"]})])
+
+    def test_columns_are_selected_in_first_chunk(self):
+        chunks = [
+            pd.DataFrame({"values": [1.0, 2.0], "labels": ["a", "b"]}),
+            pd.DataFrame({"values": [3.0, 4.0], "labels": [5.0, 6.0]}),
+        ]
+
+        result = describe_chunks(chunks)
+
+        assert list(result.columns) == ["values"]
+        assert result.loc["count", "values"] == 4
+
+    def test_column_changing_type_between_chunks(self):
+        chunks = [
+            pd.DataFrame({"values": [1.0, 2.0]}),
+            pd.DataFrame({"values": ["3", "n/a"]}),
+        ]
+
+        with pytest.raises(ValueError):
+            describe_chunks(chunks)
+
+
+class TestReservoirSample:
+    def test_sample_is_uniform(self):
+        df = pd.DataFrame({"row": range(10), "label": [str(i) for i in range(10)]})
+        counts = np.zeros(10)
+        for seed in range(2000):
+            reservoir = ReservoirSample(size=3, seed=seed)
+            for chunk in split(df, 4):
+                reservoir.update(chunk)
+            counts[reservoir.sample["row"].to_numpy()] += 1
+
+        assert reservoir.rows == 10
+        assert reservoir.sample.dtypes.equals(df.dtypes)
+        # every row is sampled with probability 3 / 10
+        assert np.allclose(counts / 2000, 0.3, atol=0.05)
+
+    def test_sample_of_small_input(self):
+        df = pd.DataFrame({"row": range(5)})
+        reservoir = ReservoirSample(size=10)
+        for chunk in split(df, 2):
+            reservoir.update(chunk)
+
+        assert reservoir.sample.equals(df)
+
+
+class TestDescribeSample:
+    def test_whole_input_is_described_exactly(self):
+        df = pd.DataFrame({"a": [1.0, 2.0, 4.0, 8.0]})
+
+        result = describe_sample(split(df, 3), sample_size=10)
+
+        assert result.iloc[:-3].equals(df.describe())
+        assert result.loc["sample_size", "a"] == 4
+        # whole input is sampled, so there is no uncertainty of the mean
+        assert result.loc["mean_ci_lower", "a"] == result.loc["mean_ci_upper", "a"]
+
+    def test_without_rows(self):
+        with pytest.raises(ValueError):
+            describe_sample([], sample_size=10)
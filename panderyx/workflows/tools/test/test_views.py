@@ -1,13 +1,21 @@
 import unittest
+from dataclasses import asdict
 from django.forms import model_to_dict
 
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 from django.urls import reverse
 from rest_framework import status
 
+from panderyx.test_helpers.data_sets import test_dataset
 from panderyx.users.test.factories import UserFactory
 from panderyx.workflows.models import Workflow
 from panderyx.workflows.test.factories import WorkflowFactory
+from panderyx.workflows.tools.dtos.input_tools import InputUrlConfig
+from panderyx.workflows.tools.dtos.preview_tools import DescribeDataConfig
+from panderyx.workflows.tools.helpers import DataTypes
 from panderyx.workflows.tools.models import Tool
 from panderyx.workflows.tools.test.factories import ToolFactory
 
@@ -267,3 +275,93 @@ class TestToolDetailTestCase:
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
         assert "test_tool" != self.tool_user_1.name
+
+
+@pytest.mark.django_db()
+class TestToolResultTestCase:
+    """
+    Tests /tools/{id}/result endpoint.
+    """
+
+    @pytest.fixture()
+    def setUp(self, tmp_path) -> None:
+        self.user_1 = UserFactory()
+        self.user_2 = UserFactory()
+        self.workflow = WorkflowFactory(user=self.user_1)
+        self.path = tmp_path / "dataset.csv"
+        self.path.write_text(test_dataset)
+        self.input_tool = ToolFactory(
+            config=asdict(InputUrlConfig(url=str(self.path))), workflow=self.workflow
+        )
+        self.describe_tool = ToolFactory(
+            config=asdict(DescribeDataConfig()), workflow=self.workflow
+        )
+        self.describe_tool.inputs.add(self.input_tool)
+        self.url = reverse(
+            "workflow-tools-result",
+            kwargs={"workflow_pk": self.workflow.id, "pk": self.input_tool.id},
+        )
+
+    def test_get_result_as_arrow_stream(self, setUp, apiclient):
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.get(
+            self.url, HTTP_ACCEPT="application/vnd.apache.arrow.stream"
+        )
+        df = pa.ipc.open_stream(response.content).read_pandas()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/vnd.apache.arrow.stream"
+        assert df.equals(pd.read_csv(self.path))
+
+    def test_get_result_as_parquet(self, setUp, apiclient):
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.get(self.url, {"format": "parquet"})
+        df = pq.read_table(pa.BufferReader(response.content)).to_pandas()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/vnd.apache.parquet"
+        assert df.equals(pd.read_csv(self.path))
+
+    @pytest.mark.parametrize("data_type", [DataTypes.OBJECT, DataTypes.ALL])
+    def test_get_describe_result_as_arrow_stream(self, setUp, apiclient, data_type):
+        self.describe_tool.config = asdict(
+            DescribeDataConfig(data_type=data_type.value)
+        )
+        self.describe_tool.save()
+        url = reverse(
+            "workflow-tools-result",
+            kwargs={"workflow_pk": self.workflow.id, "pk": self.describe_tool.id},
+        )
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.get(url, {"format": "arrow"})
+        df = pa.ipc.open_stream(response.content).read_pandas()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert df.loc["count", "Country Code"] == "5"
+        assert df.loc["top", "Country Code"] == "ARE"
+
+    def test_get_result_with_unsupported_format(self, setUp, apiclient):
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.get(self.url, HTTP_ACCEPT="text/csv")
+
+        assert response.status_code == status.HTTP_406_NOT_ACCEPTABLE
+
+    def test_get_result_of_failing_tool(self, setUp, apiclient):
+        failing_tool = ToolFactory(
+            config=asdict(DescribeDataConfig()), workflow=self.workflow
+        )
+        url = reverse(
+            "workflow-tools-result",
+            kwargs={"workflow_pk": self.workflow.id, "pk": failing_tool.id},
+        )
+        apiclient.force_authenticate(self.user_1)
+        response = apiclient.get(url)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["message"] == "Tool is missing input to process."
+
+    def test_get_result_as_other_user(self, setUp, apiclient):
+        apiclient.force_authenticate(self.user_2)
+        response = apiclient.get(self.url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -2,11 +2,20 @@ from django.db import IntegrityError
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
 
 from panderyx.common.permissions import IsWorkflowOwnerOrAdmin
 from panderyx.workflows.models import Workflow
+from panderyx.workflows.renderers import (
+    ArrowStreamRenderer,
+    DataFrameRenderer,
+    ORJSONRenderer,
+    ParquetRenderer,
+)
+from panderyx.workflows.services import WorkflowService
 from panderyx.workflows.tools.models import Tool
 from panderyx.workflows.tools.serializers.tool import ToolSerializer
 
@@ -43,3 +52,35 @@ class ToolViewSet(viewsets.ModelViewSet):
             Workflow, id=self.kwargs["workflow_pk"], user=self.request.user
         )
         serializer.save(workflow=workflow)
+
+    @action(
+        detail=True,
+        methods=["get"],
+        renderer_classes=[ArrowStreamRenderer, ParquetRenderer],
+    )
+    def result(self, request, pk=None, workflow_pk=None):
+        """Runs the tool with its ancestors and returns its result in a binary
+        columnar format chosen with Accept header or format query parameter."""
+        tool = self.get_object()
+        workflow_service = WorkflowService(tool.workflow)
+        try:
+            workflow_service.run_workflow(target_ids=[tool.id])
+            df = workflow_service.tool_result_dfs[tool.id]
+        finally:
+            workflow_service.close()
+
+        filename = f"tool-{tool.id}.{request.accepted_renderer.format}"
+        return Response(
+            df, headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # errors cannot be rendered in the binary formats of tool results, renderer
+        # is not set yet when none of the renderers matches Accept header
+        renderer = getattr(request, "accepted_renderer", None)
+        if getattr(response, "exception", False) and (
+            renderer is None or isinstance(renderer, DataFrameRenderer)
+        ):
+            request.accepted_renderer = ORJSONRenderer()
+            request.accepted_media_type = ORJSONRenderer.media_type
+        return super().finalize_response(request, response, *args, **kwargs)
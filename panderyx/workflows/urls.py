@@ -2,13 +2,15 @@ from django.urls import include, path
 from rest_framework_nested import routers
 
 from panderyx.workflows.tools.views import ToolViewSet
-from panderyx.workflows.views import WorkflowViewSet
+from panderyx.workflows.views import UploadViewSet, WorkflowRunViewSet, WorkflowViewSet
 
 router = routers.SimpleRouter()
 router.register(r"workflows", WorkflowViewSet)
+router.register(r"uploads", UploadViewSet)
 
 tools_router = routers.NestedSimpleRouter(router, r"workflows", lookup="workflow")
 tools_router.register(r"tools", ToolViewSet, basename="workflow-tools")
+tools_router.register(r"runs", WorkflowRunViewSet, basename="workflow-runs")
 
 urlpatterns = [
     path(r"", include(router.urls)),
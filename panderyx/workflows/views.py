@@ -1,12 +1,28 @@
-from rest_framework import viewsets
+from django.conf import settings
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 
 from panderyx.common.permissions import IsWorkflowOwnerOrAdmin
-from panderyx.workflows.models import Workflow
-from panderyx.workflows.serializers import WorkflowSerializer
-from panderyx.workflows.services import WorkflowService
+from panderyx.workflows.exceptions import (
+    ToolServiceException,
+    WorkflowServiceException,
+)
+from panderyx.workflows.models import Upload, Workflow, WorkflowRun
+from panderyx.workflows.renderers import ORJSONRenderer, dumps
+from panderyx.workflows.serializers import (
+    RunWorkflowSerializer,
+    UploadSerializer,
+    WorkflowRunSerializer,
+    WorkflowSerializer,
+)
+from panderyx.workflows.services import OutputOptions, WorkflowService
 
 
 class WorkflowViewSet(viewsets.ModelViewSet):
@@ -29,11 +45,179 @@ class WorkflowViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
-    @action(detail=True, methods=["get"])
+    @action(
+        detail=True,
+        methods=["get"],
+        renderer_classes=[ORJSONRenderer, BrowsableAPIRenderer],
+    )
     def run_workflow(self, request, pk=None):
         workflow = self.get_object()
-        workflow_service = WorkflowService(workflow)
-        workflow_service.run_workflow()
-        data = workflow_service.get_outputs()
+        params_serializer = RunWorkflowSerializer(data=request.query_params)
+        params_serializer.is_valid(raise_exception=True)
+        params = params_serializer.validated_data
+
+        output_rows = None
+        if params["preview"]:
+            output_rows = params["offset"] + params["limit"]
+        workflow_service = WorkflowService(workflow, output_rows=output_rows)
+        options = OutputOptions(
+            orient=params.get("orient"),
+            limit=params.get("limit"),
+            offset=params["offset"],
+            sample=params.get("sample"),
+        )
+        if params["stream"]:
+            return self.stream_outputs(workflow_service, params.get("target"), options)
+
+        try:
+            workflow_service.run_workflow(target_ids=params.get("target"))
+            data = workflow_service.get_outputs(options)
+        finally:
+            workflow_service.close()
 
         return Response(data)
+
+    def stream_outputs(self, workflow_service, target_ids=None, options=None):
+        """Returns NDJSON response with an output record per tool sent as soon as
+        the tool is finished.
+
+        Errors raised before the first record are returned as a regular error
+        response, errors raised later are sent as the last record of the stream.
+        """
+        try:
+            plan = workflow_service.get_plan(target_ids)
+        except Exception:
+            workflow_service.close()
+            raise
+
+        def generate_records():
+            try:
+                for output in workflow_service.iter_outputs(plan, options):
+                    yield dumps(output) + b"\n"
+            except (WorkflowServiceException, ToolServiceException) as exc:
+                yield dumps({"error": exc.detail}) + b"\n"
+            finally:
+                workflow_service.close()
+
+        return StreamingHttpResponse(
+            generate_records(), content_type="application/x-ndjson"
+        )
+
+
+class WorkflowRunViewSet(mixins.CreateModelMixin, viewsets.ReadOnlyModelViewSet):
+    """ViewSet class for queueing Workflow runs and checking their results.
+
+    Runs are processed in the background with run_workflow_worker command.
+    """
+
+    queryset = WorkflowRun.objects.all()
+    serializer_class = WorkflowRunSerializer
+    permission_classes = (
+        IsAuthenticated,
+        IsWorkflowOwnerOrAdmin,
+    )
+    pagination_class = None
+
+    def get_workflow(self):
+        admin_permission = IsAdminUser()
+        if admin_permission.has_permission(self.request, self):
+            return get_object_or_404(Workflow, id=self.kwargs["workflow_pk"])
+        return get_object_or_404(
+            Workflow, id=self.kwargs["workflow_pk"], user=self.request.user
+        )
+
+    def get_queryset(self):
+        admin_permission = IsAdminUser()
+        if admin_permission.has_permission(self.request, self):
+            return WorkflowRun.objects.filter(workflow=self.kwargs["workflow_pk"])
+        return WorkflowRun.objects.filter(
+            Q(workflow=self.kwargs["workflow_pk"]) & Q(workflow__user=self.request.user)
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action == "create":
+            context["workflow"] = self.get_workflow()
+
+        return context
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        # run is only queued at this point
+        response.status_code = status.HTTP_202_ACCEPTED
+        return response
+
+    def perform_create(self, serializer):
+        serializer.save(workflow=serializer.context["workflow"])
+
+    @action(detail=True, methods=["get"])
+    def result(self, request, pk=None, workflow_pk=None):
+        run = self.get_object()
+        if run.status == WorkflowRun.Status.SUCCEEDED:
+            return Response(run.result)
+        if run.status == WorkflowRun.Status.FAILED:
+            return Response(run.error, status=status.HTTP_400_BAD_REQUEST)
+
+        # run is still queued or running
+        serializer = self.get_serializer(run)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+
+class UploadViewSet(
+    mixins.CreateModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
+    """ViewSet class for resumable uploads of files parsed by input_file tools.
+
+    Upload is created with the file's name and size, then its content is sent
+    in chunks to the chunk endpoint. Interrupted uploads are resumed from the
+    offset returned by the upload's details.
+    """
+
+    queryset = Upload.objects.all()
+    serializer_class = UploadSerializer
+    permission_classes = (
+        IsAuthenticated,
+        IsWorkflowOwnerOrAdmin,
+    )
+    pagination_class = None
+
+    def get_queryset(self):
+        admin_permission = IsAdminUser()
+        if admin_permission.has_permission(self.request, self):
+            return super().get_queryset()
+        return super().get_queryset().filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    def perform_destroy(self, instance):
+        instance.delete_files()
+        instance.delete()
+
+    @action(detail=True, methods=["patch"])
+    def chunk(self, request, pk=None):
+        """Appends raw body of the request to the upload at the offset given
+        with Upload-Offset header."""
+        upload = self.get_object()
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            length = int(request.headers.get("Content-Length") or 0)
+        except (KeyError, ValueError):
+            raise ValidationError("Upload-Offset header must be an integer.")
+        if length < 1:
+            raise ValidationError("Chunk must not be empty.")
+        if length > settings.WORKFLOW_UPLOAD_CHUNK_MAX_BYTES:
+            raise ValidationError(
+                f"Chunk cannot be larger than "
+                f"{settings.WORKFLOW_UPLOAD_CHUNK_MAX_BYTES} bytes."
+            )
+        if offset + length > upload.size:
+            raise ValidationError("Chunk exceeds the size of the upload.")
+
+        # body is copied from the request stream without being loaded into memory
+        upload.append_chunk(offset, request.stream, length)
+
+        serializer = self.get_serializer(upload)
+        return Response(serializer.data)
@@ -0,0 +1,114 @@
+import logging
+import threading
+import time
+import typing
+from contextlib import contextmanager
+
+from django.db import close_old_connections, connection
+
+from panderyx.workflows.exceptions import (
+    ToolServiceException,
+    WorkflowServiceException,
+)
+from panderyx.workflows.models import WorkflowRun
+from panderyx.workflows.services import WorkflowService
+
+logger = logging.getLogger(__name__)
+
+
+def process_run(run: WorkflowRun) -> None:
+    """Runs the workflow of a claimed run and stores its outputs or error."""
+    service = WorkflowService(run.workflow)
+    try:
+        service.run_workflow(target_ids=run.target_ids)
+        outputs = service.get_outputs()
+    except (WorkflowServiceException, ToolServiceException) as exc:
+        run.finish(WorkflowRun.Status.FAILED, error=exc.detail)
+    except Exception:
+        # worker keeps processing the queue after unexpected errors
+        logger.exception("Workflow run %s failed.", run.id)
+        run.finish(
+            WorkflowRun.Status.FAILED,
+            error={
+                "workflow_id": str(run.workflow_id),
+                "message": "Workflow run failed unexpectedly.",
+            },
+        )
+    else:
+        run.finish(WorkflowRun.Status.SUCCEEDED, result=outputs)
+    finally:
+        service.close()
+
+
+class WorkflowWorker:
+    """Processes queued workflow runs one at a time in the current process.
+
+    Any number of workers can poll the same database, since every run is
+    claimed by a single worker. Runs of workers that stopped without finishing
+    them are failed once their heartbeats are older than stale_timeout.
+    """
+
+    def __init__(
+        self,
+        poll_interval: float,
+        heartbeat_interval: float = 30,
+        stale_timeout: float = 300,
+    ) -> None:
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_timeout = stale_timeout
+        self.stopped = False
+
+    def run_pending(self) -> int:
+        """Processes queued runs until the queue is empty.
+
+        Returns:
+            int: number of processed runs
+        """
+        processed = 0
+        # long-running worker must not reuse connections closed by the database
+        close_old_connections()
+        failed = WorkflowRun.fail_stale(self.stale_timeout)
+        if failed:
+            logger.warning("Failed %d workflow run(s) of stopped workers.", failed)
+
+        while not self.stopped:
+            close_old_connections()
+            run = WorkflowRun.claim_next()
+            if run is None:
+                break
+
+            logger.info("Processing workflow run %s.", run.id)
+            with self.send_heartbeats(run):
+                process_run(run)
+            processed += 1
+
+        return processed
+
+    @contextmanager
+    def send_heartbeats(self, run: WorkflowRun) -> typing.Iterator[None]:
+        """Sends heartbeats of the run from a thread while it is processed."""
+        finished = threading.Event()
+
+        def send():
+            while not finished.wait(self.heartbeat_interval):
+                run.heartbeat()
+            # connection of the thread is not closed by Django
+            connection.close()
+
+        thread = threading.Thread(target=send, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            finished.set()
+            thread.join()
+
+    def run_forever(self) -> None:
+        while not self.stopped:
+            if not self.run_pending():
+                time.sleep(self.poll_interval)
+
+    def stop(self, *args: typing.Any) -> None:
+        """Stops the worker once the current run is finished."""
+        self.stopped = True